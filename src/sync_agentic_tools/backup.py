@@ -2,11 +2,162 @@
 
 import gzip
 import json
+import os
+import re
 import shutil
-from dataclasses import asdict, dataclass, field
+import sqlite3
+import tarfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 
+from .files import copy_and_hash
+from .utils import dump_json_file, load_json_file
+
+# Format of the timestamp prefix on backup IDs (see create_backup)
+_BACKUP_ID_TIMESTAMP_FORMAT = "%Y-%m-%d_%H%M%S"
+_BACKUP_ID_TIMESTAMP_LEN = len("YYYY-MM-DD_HHMMSS")
+_BACKUP_ID_TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}_\d{6}")
+
+# Archive that replaces a backup's files/ directory once it is compressed
+_FILES_ARCHIVE_NAME = "files.tar.gz"
+
+
+def _parse_backup_dir_timestamp(name: str) -> datetime | None:
+    """
+    Parse the creation timestamp from a backup directory name.
+
+    Args:
+        name: Backup directory name (e.g. "2024-01-01_120000_push_claude")
+
+    Returns:
+        Parsed datetime, or None if the name doesn't start with a timestamp
+    """
+    try:
+        return datetime.strptime(name[:_BACKUP_ID_TIMESTAMP_LEN], _BACKUP_ID_TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def _reserve_backup_path(files_dir: Path, stem: str, suffix: str) -> Path:
+    """
+    Atomically reserve a unique file name in a backup's files directory.
+
+    Tries "<stem><suffix>", then "<stem>_1<suffix>", "<stem>_2<suffix>", ...
+    using O_CREAT | O_EXCL so each attempt is a single syscall and the
+    kernel guarantees the name was free.
+
+    Args:
+        files_dir: Backup files directory
+        stem: File name stem
+        suffix: File name suffix (including the dot)
+
+    Returns:
+        Path to the reserved (empty) file
+    """
+    candidate = files_dir / f"{stem}{suffix}"
+    counter = 1
+    while True:
+        try:
+            fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            candidate = files_dir / f"{stem}_{counter}{suffix}"
+            counter += 1
+            continue
+        os.close(fd)
+        return candidate
+
+
+def _archive_backup_files(backup_dir: Path, compresslevel: int = 6) -> None:
+    """
+    Pack a backup's files/ directory into a single compressed tar archive.
+
+    Compressing the files together lets gzip exploit redundancy between
+    them (rules and commands often share boilerplate) and leaves one file
+    per backup instead of one per backed-up file.
+
+    Args:
+        backup_dir: Backup directory containing files/
+        compresslevel: gzip compression level (1 = fastest, 9 = smallest)
+    """
+    files_dir = backup_dir / "files"
+    archive_file = backup_dir / _FILES_ARCHIVE_NAME
+    temp_file = archive_file.with_name(f"{_FILES_ARCHIVE_NAME}.tmp")
+
+    with os.scandir(files_dir) as it:
+        names = sorted(entry.name for entry in it)
+
+    with tarfile.open(temp_file, "w:gz", compresslevel=compresslevel) as tar:
+        for name in names:
+            tar.add(files_dir / name, arcname=name)
+
+    temp_file.replace(archive_file)
+    shutil.rmtree(files_dir)
+
+
+def _remove_tree(path: str) -> None:
+    """
+    Delete a backup directory tree.
+
+    A bottom-up os.walk with direct unlink/rmdir calls avoids the per-entry
+    error-handling machinery of shutil.rmtree; backups only ever contain
+    regular files and directories we created.
+
+    Args:
+        path: Directory to delete
+    """
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            os.unlink(os.path.join(root, name))
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            try:
+                os.rmdir(dir_path)
+            except NotADirectoryError:
+                # Symlink to a directory - os.walk lists these under dirs
+                os.unlink(dir_path)
+    os.rmdir(path)
+
+
+def _restore_from_archive(archive: tarfile.TarFile, name: str, original_path: Path) -> None:
+    """
+    Restore a single file from a compressed backup archive.
+
+    Files individually gzipped by older versions of compress_old_backups are
+    archived as "{name}.gz" members, and are decompressed on restore.
+
+    Args:
+        archive: Open backup archive
+        name: Member name within the archive
+        original_path: Path to restore the file to
+    """
+    gzipped = False
+    try:
+        member = archive.getmember(name)
+    except KeyError:
+        try:
+            member = archive.getmember(f"{name}.gz")
+        except KeyError:
+            return
+        gzipped = True
+    src = archive.extractfile(member)
+    if src is None:
+        return
+
+    original_path.parent.mkdir(parents=True, exist_ok=True)
+    with src, open(original_path, "wb") as dst:
+        if gzipped:
+            with gzip.open(src, "rb") as f_in:
+                shutil.copyfileobj(f_in, dst, length=1 << 20)
+        else:
+            shutil.copyfileobj(src, dst, length=1 << 20)
+    os.chmod(original_path, member.mode)
+    os.utime(original_path, (member.mtime, member.mtime))
+
 
 @dataclass
 class BackupChange:
@@ -18,6 +169,60 @@ class BackupChange:
     size_after: int | None = None
     checksum_before: str | None = None
     checksum_after: str | None = None
+    backup_name: str | None = None  # File name within the backup's files/ dir
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialisation."""
+        return {
+            "file": self.file,
+            "action": self.action,
+            "size_before": self.size_before,
+            "size_after": self.size_after,
+            "checksum_before": self.checksum_before,
+            "checksum_after": self.checksum_after,
+            "backup_name": self.backup_name,
+        }
+
+
+def _backup_file(source: Path, dest: Path | None, backup_file: Path) -> BackupChange:
+    """
+    Copy a file into a backup and describe the change.
+
+    Args:
+        source: File being backed up
+        dest: File that will replace it (None if it will be deleted)
+        backup_file: Reserved path to copy into
+
+    Returns:
+        BackupChange record for the file
+    """
+    dst_st = None
+    if dest is not None:
+        try:
+            dst_st = dest.stat()
+        except FileNotFoundError:
+            pass
+
+    # Determine action
+    if dest is None:
+        action = "deleted"
+    elif dst_st is None:
+        action = "created"
+    else:
+        action = "modified"
+
+    # Hash while copying so the checksum costs no extra read pass
+    size, checksum = copy_and_hash(source, backup_file)
+    shutil.copystat(source, backup_file)
+
+    return BackupChange(
+        file=str(source),
+        action=action,
+        size_before=size,
+        checksum_before=checksum,
+        size_after=dst_st.st_size if dst_st else None,
+        backup_name=backup_file.name,
+    )
 
 
 @dataclass
@@ -33,7 +238,15 @@ class BackupManifest:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialisation."""
-        return asdict(self)
+        # Built by hand - asdict() recursively deep-copies every change
+        return {
+            "timestamp": self.timestamp,
+            "operation": self.operation,
+            "direction": self.direction,
+            "tool": self.tool,
+            "machine_id": self.machine_id,
+            "changes": [change.to_dict() for change in self.changes],
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "BackupManifest":
@@ -49,6 +262,252 @@ class BackupManifest:
         )
 
 
+def _index_meta(manifest: BackupManifest, compressed: bool = False) -> dict:
+    """Build the backup index entry for a manifest."""
+    return {
+        "timestamp": manifest.timestamp,
+        "tool": manifest.tool,
+        "operation": manifest.operation,
+        "changes": len(manifest.changes),
+        "compressed": compressed,
+    }
+
+
+def _index_meta_from_manifest_data(data: object) -> dict | None:
+    """
+    Build a backup index entry from raw manifest JSON.
+
+    Only reads the top-level fields the index needs, so change records
+    are counted without being turned into BackupChange objects.
+
+    Args:
+        data: Parsed manifest JSON
+
+    Returns:
+        Index entry, or None if the manifest is malformed
+    """
+    if not isinstance(data, dict):
+        return None
+
+    changes = data.get("changes", [])
+    timestamp = data.get("timestamp")
+    tool = data.get("tool")
+    operation = data.get("operation")
+    if not isinstance(changes, list) or not all(
+        isinstance(v, str) for v in (timestamp, tool, operation)
+    ):
+        return None
+
+    return {
+        "timestamp": timestamp,
+        "tool": tool,
+        "operation": operation,
+        "changes": len(changes),
+        "compressed": False,
+    }
+
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    changes_count INTEGER NOT NULL,
+    compressed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_tool_ts ON backups (tool, timestamp DESC);
+"""
+
+_INDEX_COLUMNS = "id, timestamp, tool, operation, changes_count, compressed"
+
+# Seconds to wait for another process's lock on the index before giving up
+_INDEX_TIMEOUT = 30.0
+
+
+def _index_row_meta(row: tuple) -> dict:
+    """Convert a backups table row to index metadata."""
+    return {
+        "timestamp": row[1],
+        "tool": row[2],
+        "operation": row[3],
+        "changes": row[4],
+        "compressed": bool(row[5]),
+    }
+
+
+def _backup_info(backup_id: str, meta: dict) -> dict[str, str]:
+    """Build the info dictionary listed for a backup from its index metadata."""
+    return {
+        "id": backup_id,
+        "timestamp": meta["timestamp"],
+        "tool": meta["tool"],
+        "operation": meta["operation"],
+        "changes": meta["changes"],
+    }
+
+
+class _BackupIndex:
+    """
+    Summary metadata for all backups, keyed by backup ID.
+
+    Stored in SQLite so listing by tool is an indexed query and concurrent
+    syncs can update it safely. Lets listing, cleanup and compression skip
+    opening each backup's manifest. The index only caches manifest data,
+    so missing entries are back-filled and a corrupt database is rebuilt.
+    If the database is locked or can't be opened, reads return nothing and
+    writes are skipped, so callers fall back to the manifests.
+    """
+
+    def __init__(self, db_file: Path):
+        """
+        Initialise backup index.
+
+        Args:
+            db_file: Path to index database
+        """
+        self.db_file = db_file
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the index database, creating the schema if needed."""
+        conn = sqlite3.connect(self.db_file, timeout=_INDEX_TIMEOUT)
+        try:
+            conn.executescript(_INDEX_SCHEMA)
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """
+        Connect to the index database.
+
+        Returns:
+            Connection, or None if the backup root doesn't exist yet or the
+            index is locked or can't be opened
+        """
+        if not self.db_file.parent.is_dir():
+            return None
+        try:
+            return self._open()
+        except sqlite3.OperationalError:
+            # Locked by another process, or unreadable - leave it alone
+            return None
+        except sqlite3.DatabaseError:
+            # Corrupt index - rebuild it from manifests
+            pass
+        try:
+            self.db_file.unlink(missing_ok=True)
+            return self._open()
+        except (OSError, sqlite3.Error):
+            return None
+
+    def _write(self, sql: str, params: list[tuple]) -> None:
+        """Run a statement for each parameter tuple in one transaction."""
+        if not params:
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        with closing(conn):
+            try:
+                with conn:
+                    conn.executemany(sql, params)
+            except sqlite3.OperationalError:
+                # Still locked after the timeout - entries are back-filled later
+                pass
+
+    def load(self) -> dict[str, dict]:
+        """
+        Load all index entries.
+
+        Returns:
+            Dictionary mapping backup ID to metadata
+        """
+        conn = self._connect()
+        if conn is None:
+            return {}
+        with closing(conn):
+            rows = conn.execute(f"SELECT {_INDEX_COLUMNS} FROM backups")
+            return {row[0]: _index_row_meta(row) for row in rows}
+
+    def ids(self) -> set[str] | None:
+        """
+        Get IDs of all indexed backups.
+
+        Returns:
+            Set of backup IDs, or None if the index can't be opened
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        with closing(conn):
+            return {row[0] for row in conn.execute("SELECT id FROM backups")}
+
+    def query(self, tool_name: str | None = None) -> Iterator[tuple[str, dict]]:
+        """
+        Iterate over index entries, newest first.
+
+        Args:
+            tool_name: Filter by tool name (None = all tools)
+
+        Yields:
+            Tuples of (backup ID, metadata)
+        """
+        conn = self._connect()
+        if conn is None:
+            return
+        sql = f"SELECT {_INDEX_COLUMNS} FROM backups"
+        params: tuple = ()
+        if tool_name:
+            sql += " WHERE tool = ?"
+            params = (tool_name,)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        with closing(conn):
+            for row in conn.execute(sql, params):
+                yield row[0], _index_row_meta(row)
+
+    def add(self, entries: dict[str, dict]) -> None:
+        """
+        Add or replace entries.
+
+        Args:
+            entries: Dictionary mapping backup ID to metadata
+        """
+        self._write(
+            f"INSERT OR REPLACE INTO backups ({_INDEX_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    backup_id,
+                    meta["timestamp"],
+                    meta["tool"],
+                    meta["operation"],
+                    meta["changes"],
+                    int(meta.get("compressed", False)),
+                )
+                for backup_id, meta in entries.items()
+            ],
+        )
+
+    def remove(self, backup_ids: Iterable[str]) -> None:
+        """
+        Remove entries.
+
+        Args:
+            backup_ids: Backup identifiers to remove
+        """
+        self._write("DELETE FROM backups WHERE id = ?", [(i,) for i in backup_ids])
+
+    def mark_compressed(self, backup_ids: Iterable[str]) -> None:
+        """
+        Mark backups as compressed.
+
+        Args:
+            backup_ids: Backup identifiers to mark
+        """
+        self._write("UPDATE backups SET compressed = 1 WHERE id = ?", [(i,) for i in backup_ids])
+
+
 class BackupManager:
     """Manages backup operations."""
 
@@ -62,8 +521,72 @@ class BackupManager:
         if backup_root is None:
             backup_root = Path.home() / ".agentic-sync" / "backups"
 
+        # Created lazily by create_backup so read-only commands don't touch disk
         self.backup_root = backup_root
-        self.backup_root.mkdir(parents=True, exist_ok=True)
+        self._index = _BackupIndex(self.backup_root / "index.db")
+
+    def _iter_backup_dirs(self) -> Iterator[os.DirEntry]:
+        """
+        Iterate over backup directories in the backup root.
+
+        Uses os.scandir so the directory check comes from cached entry
+        metadata rather than a separate stat() per backup.
+
+        Yields:
+            DirEntry for each backup directory
+        """
+        try:
+            it = os.scandir(self.backup_root)
+        except FileNotFoundError:
+            # No backups have been created yet
+            return
+
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry
+
+    def _get_index_meta(
+        self, entry: os.DirEntry, index: dict[str, dict], backfilled: dict[str, dict]
+    ) -> dict | None:
+        """
+        Get index metadata for a backup, reading its manifest on a miss.
+
+        Args:
+            entry: Backup directory entry
+            index: Loaded index entries
+            backfilled: Collects entries read from manifests, to add to the index
+
+        Returns:
+            Backup metadata, or None if the backup has no valid manifest
+        """
+        meta = index.get(entry.name)
+        if meta is not None:
+            return meta
+
+        meta = self._read_manifest_meta(entry.path)
+        if meta is not None:
+            backfilled[entry.name] = meta
+        return meta
+
+    def _read_manifest_meta(self, backup_path: str) -> dict | None:
+        """
+        Read index metadata from a backup's manifest.
+
+        Args:
+            backup_path: Path to backup directory
+
+        Returns:
+            Backup metadata, or None if the backup has no valid manifest
+        """
+        manifest_file = os.path.join(backup_path, "manifest.json")
+        if not os.path.isfile(manifest_file):
+            return None
+
+        try:
+            return _index_meta_from_manifest_data(load_json_file(Path(manifest_file)))
+        except json.JSONDecodeError:
+            return None
 
     def create_backup(
         self,
@@ -88,103 +611,110 @@ class BackupManager:
             Path to backup directory
         """
         # Generate backup ID
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime(_BACKUP_ID_TIMESTAMP_FORMAT)
         backup_id = f"{timestamp}_{operation}_{tool_name}"
         backup_dir = self.backup_root / backup_id
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_dir.mkdir(parents=True, exist_ok=True)  # Also creates backup_root
 
         files_dir = backup_dir / "files"
         files_dir.mkdir(exist_ok=True)
 
         # Create manifest
         manifest = BackupManifest(
-            timestamp=datetime.now().isoformat(),
+            timestamp=now.isoformat(),
             operation=operation,
             direction=direction,
             tool=tool_name,
             machine_id=machine_id,
         )
 
-        # Backup each file
+        # Reserve backup names up front, in input order, so same-named files
+        # get deterministic suffixes before copies run concurrently
+        tasks = []
         for source, dest in files_to_backup.items():
             if not source.exists():
                 continue
+            backup_file = _reserve_backup_path(files_dir, source.stem, source.suffix)
+            tasks.append((source, dest, backup_file))
 
-            # Determine action
-            if dest is None:
-                action = "deleted"
-            elif not dest.exists():
-                action = "created"
-            else:
-                action = "modified"
-
-            # Create backup copy
-            relative_path = source.name
-            backup_file = files_dir / relative_path
-            counter = 1
-            while backup_file.exists():
-                backup_file = files_dir / f"{source.stem}_{counter}{source.suffix}"
-                counter += 1
-
-            shutil.copy2(source, backup_file)
-
-            # Record change
-            change = BackupChange(
-                file=str(source),
-                action=action,
-                size_before=source.stat().st_size if source.exists() else None,
-                size_after=dest.stat().st_size if dest and dest.exists() else None,
-            )
-            manifest.changes.append(change)
+        # Copies are I/O-bound and release the GIL, so run them in parallel
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(32, len(tasks))) as executor:
+                manifest.changes.extend(executor.map(lambda task: _backup_file(*task), tasks))
 
         # Save manifest
         manifest_file = backup_dir / "manifest.json"
-        with open(manifest_file, "w") as f:
-            json.dump(manifest.to_dict(), f, indent=2)
+        dump_json_file(manifest_file, manifest.to_dict())
+        self._index.add({backup_id: _index_meta(manifest)})
 
         return backup_dir
 
-    def list_backups(self, tool_name: str | None = None) -> list[dict[str, str]]:
+    def iter_backups(self, tool_name: str | None = None) -> Iterator[dict[str, str]]:
         """
-        List available backups.
+        Iterate over available backups, newest first.
 
         Args:
             tool_name: Filter by tool name (None = all tools)
 
-        Returns:
-            List of backup info dictionaries
+        Yields:
+            Backup info dictionaries
+        """
+        entries = {entry.name: entry.path for entry in self._iter_backup_dirs()}
+        indexed_ids = self._index.ids()
+
+        if indexed_ids is None:
+            # Index unavailable - read every manifest without touching it
+            yield from self._iter_backups_from_manifests(entries, tool_name)
+            return
+
+        # Back-fill backups missing from the index and drop entries for
+        # backups that have been removed
+        backfilled = {}
+        for backup_id in entries.keys() - indexed_ids:
+            meta = self._read_manifest_meta(entries[backup_id])
+            if meta is not None:
+                backfilled[backup_id] = meta
+        self._index.add(backfilled)
+        self._index.remove(indexed_ids - entries.keys())
+
+        for backup_id, meta in self._index.query(tool_name):
+            yield _backup_info(backup_id, meta)
+
+    def _iter_backups_from_manifests(
+        self, entries: dict[str, str], tool_name: str | None
+    ) -> Iterator[dict[str, str]]:
         """
-        backups = []
+        Iterate over backups by reading their manifests, newest first.
 
-        for backup_dir in sorted(self.backup_root.iterdir(), reverse=True):
-            if not backup_dir.is_dir():
-                continue
+        Args:
+            entries: Mapping of backup ID to backup directory path
+            tool_name: Filter by tool name (None = all tools)
 
-            manifest_file = backup_dir / "manifest.json"
-            if not manifest_file.exists():
-                continue
+        Yields:
+            Backup info dictionaries
+        """
+        metas = []
+        for backup_id, backup_path in entries.items():
+            meta = self._read_manifest_meta(backup_path)
+            if meta is not None and (not tool_name or meta["tool"] == tool_name):
+                metas.append((backup_id, meta))
 
-            try:
-                with open(manifest_file) as f:
-                    manifest_data = json.load(f)
-                    manifest = BackupManifest.from_dict(manifest_data)
+        metas.sort(key=lambda item: (item[1]["timestamp"], item[0]), reverse=True)
+        for backup_id, meta in metas:
+            yield _backup_info(backup_id, meta)
 
-                if tool_name and manifest.tool != tool_name:
-                    continue
+    def list_backups(self, tool_name: str | None = None) -> list[dict[str, str]]:
+        """
+        List available backups.
 
-                backups.append(
-                    {
-                        "id": backup_dir.name,
-                        "timestamp": manifest.timestamp,
-                        "tool": manifest.tool,
-                        "operation": manifest.operation,
-                        "changes": len(manifest.changes),
-                    }
-                )
-            except (json.JSONDecodeError, KeyError):
-                continue
+        Args:
+            tool_name: Filter by tool name (None = all tools)
 
-        return backups
+        Returns:
+            List of backup info dictionaries
+        """
+        return list(self.iter_backups(tool_name))
 
     def restore_backup(self, backup_id: str) -> BackupManifest:
         """
@@ -204,22 +734,55 @@ class BackupManager:
             raise FileNotFoundError(f"Backup not found: {backup_id}")
 
         manifest_file = backup_dir / "manifest.json"
-        with open(manifest_file) as f:
-            manifest = BackupManifest.from_dict(json.load(f))
+        manifest = BackupManifest.from_dict(load_json_file(manifest_file))
 
         files_dir = backup_dir / "files"
+        archive_file = backup_dir / _FILES_ARCHIVE_NAME
+        archive = tarfile.open(archive_file, "r:gz") if archive_file.exists() else None
+        legacy_names: set[str] | None = None
+
+        try:
+            # Restore each file
+            for change in manifest.changes:
+                original_path = Path(change.file)
+                backup_name = change.backup_name
+
+                if backup_name is None:
+                    # Older manifests don't record the backup file name, so
+                    # fall back to an exact match on the original name
+                    if legacy_names is None:
+                        if archive is not None:
+                            legacy_names = set(archive.getnames())
+                        else:
+                            with os.scandir(files_dir) as it:
+                                legacy_names = {entry.name for entry in it}
+                    if (
+                        original_path.name not in legacy_names
+                        and f"{original_path.name}.gz" not in legacy_names
+                    ):
+                        continue
+                    backup_name = original_path.name
+
+                if archive is not None:
+                    _restore_from_archive(archive, backup_name, original_path)
+                    continue
 
-        # Restore each file
-        for change in manifest.changes:
-            original_path = Path(change.file)
-            # Find backup file (may have counter suffix)
-            backup_files = list(files_dir.glob(f"{original_path.stem}*{original_path.suffix}"))
-
-            if backup_files:
-                backup_file = backup_files[0]
-                # Restore file
-                original_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(backup_file, original_path)
+                backup_file = files_dir / backup_name
+                compressed_file = files_dir / f"{backup_name}.gz"
+
+                if backup_file.exists():
+                    original_path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(backup_file, original_path)
+                elif compressed_file.exists():
+                    # Individually gzipped by older versions of compress_old_backups
+                    original_path.parent.mkdir(parents=True, exist_ok=True)
+                    with gzip.open(compressed_file, "rb") as f_in:
+                        with open(original_path, "wb") as f_out:
+                            shutil.copyfileobj(f_in, f_out, length=1 << 20)
+                    shutil.copystat(compressed_file, original_path)
+        finally:
+            if archive is not None:
+                archive.close()
 
         return manifest
 
@@ -234,84 +797,102 @@ class BackupManager:
         Returns:
             Number of backups deleted
         """
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
+        # Compare fixed-width "YYYY-MM-DD_HHMMSS" strings, which order the
+        # same as the times they encode, so standard backup IDs never need
+        # parsing into datetimes
+        cutoff_key = (datetime.now() - timedelta(days=retention_days)).strftime(
+            _BACKUP_ID_TIMESTAMP_FORMAT
+        )
         all_backups = []
-
-        # Collect all backups with timestamps
-        for backup_dir in self.backup_root.iterdir():
-            if not backup_dir.is_dir():
+        index: dict[str, dict] | None = None
+        backfilled: dict[str, dict] = {}
+
+        # Collect all backups with sortable timestamp keys
+        for entry in self._iter_backup_dirs():
+            # Backup IDs carry their creation time, so metadata only needs
+            # looking up for directories that don't follow that format
+            if _BACKUP_ID_TIMESTAMP_RE.match(entry.name):
+                all_backups.append((entry.name[:_BACKUP_ID_TIMESTAMP_LEN], entry.path))
                 continue
 
-            manifest_file = backup_dir / "manifest.json"
-            if not manifest_file.exists():
+            if index is None:
+                index = self._index.load()
+            meta = self._get_index_meta(entry, index, backfilled)
+            if meta is None:
                 continue
 
             try:
-                with open(manifest_file) as f:
-                    manifest_data = json.load(f)
-                    timestamp = datetime.fromisoformat(manifest_data["timestamp"])
-                    all_backups.append((backup_dir, timestamp))
-            except (json.JSONDecodeError, KeyError):
+                timestamp = datetime.fromisoformat(meta["timestamp"])
+            except ValueError:
                 continue
+            all_backups.append((timestamp.strftime(_BACKUP_ID_TIMESTAMP_FORMAT), entry.path))
 
         # Sort by timestamp (newest first)
-        all_backups.sort(key=lambda x: x[1], reverse=True)
+        all_backups.sort(reverse=True)
 
-        deleted_count = 0
+        # Keep at least retention_count backups; everything after them that
+        # is older than the cutoff is deleted
+        to_delete = [
+            backup_path
+            for timestamp_key, backup_path in all_backups[max(retention_count, 0) :]
+            if timestamp_key < cutoff_key
+        ]
 
-        # Keep at least retention_count backups
-        for i, (backup_dir, timestamp) in enumerate(all_backups):
-            if i < retention_count:
-                continue  # Keep recent backups
+        # Deletion is dominated by unlink syscalls, which release the GIL
+        if to_delete:
+            with ThreadPoolExecutor(max_workers=min(32, len(to_delete))) as executor:
+                list(executor.map(_remove_tree, to_delete))
+        deleted = [os.path.basename(backup_path) for backup_path in to_delete]
 
-            if timestamp < cutoff_date:
-                # Delete old backup
-                shutil.rmtree(backup_dir)
-                deleted_count += 1
+        self._index.add(backfilled)
+        self._index.remove(deleted)
 
-        return deleted_count
+        return len(deleted)
 
-    def compress_old_backups(self, age_days: int = 7) -> int:
+    def compress_old_backups(self, age_days: int = 7, compresslevel: int = 6) -> int:
         """
         Compress backups older than specified age.
 
+        Each backup's files/ directory is packed into a single files.tar.gz.
+        Backups are compressed in parallel; zlib releases the GIL while
+        compressing, so threads scale across cores.
+
         Args:
             age_days: Compress backups older than this many days
+            compresslevel: gzip compression level (1 = fastest, 9 = smallest)
 
         Returns:
             Number of backups compressed
         """
         cutoff_date = datetime.now() - timedelta(days=age_days)
-        compressed_count = 0
+        index = self._index.load()
+        backfilled: dict[str, dict] = {}
+        to_compress = []
 
-        for backup_dir in self.backup_root.iterdir():
-            if not backup_dir.is_dir():
+        for entry in self._iter_backup_dirs():
+            meta = self._get_index_meta(entry, index, backfilled)
+            if meta is None or meta.get("compressed"):
                 continue
 
-            files_dir = backup_dir / "files"
-            if not files_dir.exists():
+            backup_dir = Path(entry.path)
+            if not (backup_dir / "files").is_dir():
                 continue
 
-            manifest_file = backup_dir / "manifest.json"
-            if not manifest_file.exists():
-                continue
+            timestamp = _parse_backup_dir_timestamp(entry.name)
+            if timestamp is None:
+                try:
+                    timestamp = datetime.fromisoformat(meta["timestamp"])
+                except ValueError:
+                    continue
 
-            try:
-                with open(manifest_file) as f:
-                    manifest_data = json.load(f)
-                    timestamp = datetime.fromisoformat(manifest_data["timestamp"])
-
-                if timestamp < cutoff_date:
-                    # Compress files in this backup
-                    for file_path in files_dir.iterdir():
-                        if file_path.suffix != ".gz":
-                            # Compress file
-                            with open(file_path, "rb") as f_in:
-                                with gzip.open(f"{file_path}.gz", "wb") as f_out:
-                                    shutil.copyfileobj(f_in, f_out)
-                            file_path.unlink()
-                    compressed_count += 1
-            except (json.JSONDecodeError, KeyError):
-                continue
+            if timestamp < cutoff_date:
+                to_compress.append(backup_dir)
+
+        self._index.add(backfilled)
+        if to_compress:
+            compress = partial(_archive_backup_files, compresslevel=compresslevel)
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(executor.map(compress, to_compress))
+            self._index.mark_compressed(backup_dir.name for backup_dir in to_compress)
 
-        return compressed_count
+        return len(to_compress)
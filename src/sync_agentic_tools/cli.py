@@ -1,15 +1,30 @@
 """Command-line interface for agentic-sync."""
 
+from __future__ import annotations
+
+from contextlib import nullcontext
+from itertools import chain
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
 from . import __version__
-from .backup import BackupManager
-from .config import Config
-from .propagate import run_propagation
-from .sync import SyncDirection, SyncEngine
-from .ui import console, show_error, show_info, show_success, show_warning
+
+# Commands import what they need when they run, so --help, --version and
+# shell completion don't pay for loading rich and the sync machinery
+if TYPE_CHECKING:
+    from .backup import BackupManager
+
+
+def _get_backup_manager(ctx: click.Context) -> BackupManager:
+    """Get the backup manager shared by commands in this invocation."""
+    from .backup import BackupManager
+
+    ctx.ensure_object(dict)
+    if "backup_manager" not in ctx.obj:
+        ctx.obj["backup_manager"] = BackupManager()
+    return ctx.obj["backup_manager"]
 
 
 @click.group(invoke_without_command=True)
@@ -32,7 +47,7 @@ def cli(ctx, version, tool, direction, dry_run, auto, config):
     Use 'sync-agentic-tools sync --help' for detailed sync options.
     """
     if version:
-        console.print(f"agentic-sync version {__version__}")
+        click.echo(f"agentic-sync version {__version__}")
         ctx.exit(0)
 
     # If no subcommand, run sync (default behaviour)
@@ -52,6 +67,11 @@ def cli(ctx, version, tool, direction, dry_run, auto, config):
 @click.option("--config", "-c", type=click.Path(exists=True), default=None, help="Config file path")
 def sync_cmd(tool: str | None, direction: str, dry_run: bool, auto: bool, config: str | None):
     """Synchronise tool configurations."""
+    from .config import Config
+    from .propagate import run_propagation
+    from .sync import SyncDirection, SyncEngine
+    from .ui import console, show_error, show_warning
+
     try:
         # Load config
         config_path = Path(config) if config is not None else None
@@ -109,6 +129,10 @@ def sync_cmd(tool: str | None, direction: str, dry_run: bool, auto: bool, config
 @click.option("--config", "-c", type=click.Path(exists=True), default=None, help="Config file path")
 def status_cmd(tool: str | None, config: str | None):
     """Show sync status without making changes."""
+    from .config import Config
+    from .sync import SyncDirection, SyncEngine
+    from .ui import console, show_error, show_warning
+
     try:
         config_path = Path(config) if config is not None else None
         cfg = Config.load(config_path)
@@ -152,6 +176,9 @@ def status_cmd(tool: str | None, config: str | None):
 @click.option("--force", "-f", is_flag=True, help="Overwrite existing config")
 def init_config_cmd(output: str | None, force: bool):
     """Create a template configuration file."""
+    from .config import Config
+    from .ui import show_error, show_info, show_success
+
     try:
         if output:
             config_path = Path(output)
@@ -181,16 +208,21 @@ def init_config_cmd(output: str | None, force: bool):
 
 @cli.command("list-backups")
 @click.option("--tool", "-t", default=None, help="Filter by tool name")
-def list_backups_cmd(tool: str | None):
+@click.pass_context
+def list_backups_cmd(ctx, tool: str | None):
     """List available backups."""
+    from .ui import console, show_error, show_info
+
     try:
-        backup_manager = BackupManager()
-        backups = backup_manager.list_backups(tool)
+        backup_manager = _get_backup_manager(ctx)
+        backups = backup_manager.iter_backups(tool)
 
-        if not backups:
+        first = next(backups, None)
+        if first is None:
             show_info("No backups found")
             return
 
+        from rich.live import Live
         from rich.table import Table
 
         table = Table(title="Available Backups")
@@ -200,16 +232,21 @@ def list_backups_cmd(tool: str | None):
         table.add_column("Changes", style="green", justify="right")
         table.add_column("Timestamp", style="blue")
 
-        for backup in backups:
-            table.add_row(
-                backup["id"],
-                backup["tool"],
-                backup["operation"],
-                str(backup["changes"]),
-                backup["timestamp"],
-            )
-
-        console.print(table)
+        # On a terminal, render rows as they are read rather than after
+        # scanning every backup
+        live = Live(table, console=console) if console.is_terminal else nullcontext()
+        with live:
+            for backup in chain([first], backups):
+                table.add_row(
+                    backup["id"],
+                    backup["tool"],
+                    backup["operation"],
+                    str(backup["changes"]),
+                    backup["timestamp"],
+                )
+
+        if not console.is_terminal:
+            console.print(table)
 
     except Exception as e:
         show_error(f"Error listing backups: {e}")
@@ -219,10 +256,13 @@ def list_backups_cmd(tool: str | None):
 @cli.command("restore")
 @click.argument("backup_id")
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation")
-def restore_cmd(backup_id: str, yes: bool):
+@click.pass_context
+def restore_cmd(ctx, backup_id: str, yes: bool):
     """Restore from a backup."""
+    from .ui import show_error, show_info, show_success
+
     try:
-        backup_manager = BackupManager()
+        backup_manager = _get_backup_manager(ctx)
 
         if not yes:
             from .ui import confirm_action
@@ -248,8 +288,11 @@ def restore_cmd(backup_id: str, yes: bool):
 @click.option("--days", "-d", default=30, help="Keep backups newer than N days")
 @click.option("--count", "-c", default=30, help="Keep at least N recent backups")
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation")
-def clean_backups_cmd(days: int, count: int, yes: bool):
+@click.pass_context
+def clean_backups_cmd(ctx, days: int, count: int, yes: bool):
     """Clean up old backups."""
+    from .ui import show_error, show_info, show_success
+
     try:
         if not yes:
             from .ui import confirm_action
@@ -260,7 +303,7 @@ def clean_backups_cmd(days: int, count: int, yes: bool):
                 show_info("Cleanup cancelled")
                 return
 
-        backup_manager = BackupManager()
+        backup_manager = _get_backup_manager(ctx)
         deleted_count = backup_manager.cleanup_old_backups(days, count)
 
         show_success(f"Deleted {deleted_count} old backup(s)")
@@ -1,19 +1,33 @@
 """Configuration management for agentic-sync."""
 
-from dataclasses import dataclass, field
+import os
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    # libyaml-backed loader is much faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 try:
     from importlib.resources import files
 except ImportError:
     # Python < 3.9 fallback
     from importlib_resources import files
 
+from .files import is_settled
+from .utils import dump_json_file, load_json_file
 
-@dataclass
+
+@dataclass(slots=True)
 class Settings:
     """Global settings for sync operations."""
 
@@ -28,9 +42,11 @@ class Settings:
     show_diff_threshold: int = 20
     detect_renames: bool = True
     rename_similarity_threshold: float = 1.0
+    parallel_propagation: bool = True
+    parallel_sync: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecialHandling:
     """Special file handling configuration."""
 
@@ -39,7 +55,7 @@ class SpecialHandling:
     exclude_patterns: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolConfig:
     """Configuration for a single tool."""
 
@@ -47,13 +63,13 @@ class ToolConfig:
     enabled: bool
     source: Path
     target: Path
-    include: list[str] = field(default_factory=list)
-    exclude: list[str] = field(default_factory=list)
+    include: tuple[str, ...] = field(default_factory=tuple)
+    exclude: tuple[str, ...] = field(default_factory=tuple)
     exclude_rulesets: list[str] = field(default_factory=list)
     special_handling: dict[str, SpecialHandling] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class PropagationTarget:
     """Target for cross-tool propagation."""
 
@@ -64,7 +80,7 @@ class PropagationTarget:
     transforms: list[dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PropagationRule:
     """Rule for cross-tool propagation."""
 
@@ -75,7 +91,159 @@ class PropagationRule:
     exclude: list[str] = field(default_factory=list)
 
 
-@dataclass
+# Accepted keyword arguments for each dataclass built from config data
+_SETTINGS_FIELDS = frozenset(f.name for f in fields(Settings))
+_SPECIAL_HANDLING_FIELDS = frozenset(f.name for f in fields(SpecialHandling))
+_PROPAGATION_TARGET_FIELDS = frozenset(f.name for f in fields(PropagationTarget))
+
+
+def _known_fields(data: dict[str, Any], field_names: frozenset[str]) -> dict[str, Any]:
+    """
+    Select the entries of a config mapping that are dataclass fields.
+
+    Args:
+        data: Config mapping
+        field_names: Accepted field names
+
+    Returns:
+        Keyword arguments for the dataclass
+    """
+    return {key: value for key, value in data.items() if key in field_names}
+
+
+def _existing_paths(paths: Iterable[Path]) -> set[Path]:
+    """
+    Find which of the given paths exist.
+
+    Paths sharing a parent directory are checked with one os.scandir() of
+    that parent instead of a stat() each. A name missing from the listing
+    is confirmed with exists(), so case-insensitive filesystems still
+    match, and symlinks are resolved with exists() so dangling links count
+    as missing.
+
+    Args:
+        paths: Paths to check
+
+    Returns:
+        Set of the paths that exist
+    """
+    by_parent: defaultdict[Path, set[Path]] = defaultdict(set)
+    for path in paths:
+        by_parent[path.parent].add(path)
+
+    existing = set()
+    for parent, children in by_parent.items():
+        if len(children) == 1:
+            existing.update(path for path in children if path.exists())
+            continue
+
+        try:
+            with os.scandir(parent) as entries:
+                listing = {entry.name: entry for entry in entries}
+        except OSError:
+            listing = {}
+
+        for path in children:
+            entry = listing.get(path.name)
+            if entry is not None and not entry.is_symlink():
+                existing.add(path)
+            elif path.exists():
+                existing.add(path)
+
+    return existing
+
+
+@cache
+def _read_template() -> str:
+    """
+    Read the bundled default-config.yaml template, once per process.
+
+    Returns:
+        Template file content
+
+    Raises:
+        FileNotFoundError: If the template file can't be found
+    """
+    try:
+        # Try to read from package resources
+        template_file = files("sync_agentic_tools.templates").joinpath("default-config.yaml")
+        return template_file.read_text()
+    except Exception:
+        # Fallback: try relative to this file
+        template_path = Path(__file__).parent / "templates" / "default-config.yaml"
+        if template_path.exists():
+            return template_path.read_text()
+        else:
+            raise FileNotFoundError(
+                "Could not find default-config.yaml template file. "
+                "Please reinstall the package."
+            )
+
+
+def _read_config_cache(cache_path: Path, cache_key: dict[str, Any]) -> Any:
+    """
+    Read parsed config data from the cache.
+
+    Args:
+        cache_path: Path to cache file
+        cache_key: Identifies the config file contents the cache must match
+
+    Returns:
+        Cached config data, or None if the cache is missing or stale
+    """
+    try:
+        cache = load_json_file(cache_path)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get("meta") != cache_key:
+        return None
+    return cache.get("data")
+
+
+def _is_json_native(data: Any) -> bool:
+    """
+    Check whether parsed YAML data survives a JSON round trip unchanged.
+
+    YAML also produces dates, timestamps and bytes, which JSON would only
+    store as strings, so a cached load would differ from a fresh one.
+
+    Args:
+        data: Parsed config data
+
+    Returns:
+        True if every value is a JSON type
+    """
+    if isinstance(data, dict):
+        return all(
+            isinstance(key, str) and _is_json_native(value) for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(_is_json_native(item) for item in data)
+    return data is None or isinstance(data, (str, int, float, bool))
+
+
+def _write_config_cache(cache_path: Path, cache_key: dict[str, Any], data: Any) -> None:
+    """
+    Write parsed config data to the cache.
+
+    The cache is only an optimisation, so failures are ignored.
+
+    Args:
+        cache_path: Path to cache file
+        cache_key: Identifies the config file contents being cached
+        data: Parsed config data
+    """
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        dump_json_file(temp_path, {"meta": cache_key, "data": data})
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Unwritable directory, or YAML values JSON can't represent
+        temp_path.unlink(missing_ok=True)
+
+
+@dataclass(slots=True)
 class Config:
     """Main configuration object."""
 
@@ -108,8 +276,24 @@ class Config:
                 f"Create one using: sync-agentic-tools init-config"
             )
 
-        with open(config_path) as f:
-            data = yaml.safe_load(f)
+        # Reuse the parsed config from the cache while the file is unchanged
+        stat = config_path.stat()
+        cache_key = {
+            "path": str(config_path.resolve()),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        cache_path = cls.cache_path(config_path)
+        data = _read_config_cache(cache_path, cache_key)
+
+        if data is None:
+            # libyaml detects the encoding and decodes bytes itself
+            with open(config_path, "rb") as f:
+                data = yaml.load(f, Loader=_YamlLoader)
+            # A file written within the mtime granularity could change again
+            # without its key changing, so only cache settled files
+            if is_settled(stat) and _is_json_native(data):
+                _write_config_cache(cache_path, cache_key, data)
 
         return cls.from_dict(data)
 
@@ -125,8 +309,7 @@ class Config:
             Config object
         """
         # Parse settings
-        settings_data = data.get("settings", {})
-        settings = Settings(**settings_data)
+        settings = Settings(**_known_fields(data.get("settings", {}), _SETTINGS_FIELDS))
 
         # Parse exclude rulesets
         exclude_rulesets = data.get("exclude_rulesets", {})
@@ -141,7 +324,9 @@ class Config:
             # Parse special handling
             special_handling = {}
             for file_name, handling_data in tool_data.get("special_handling", {}).items():
-                special_handling[file_name] = SpecialHandling(**handling_data)
+                special_handling[file_name] = SpecialHandling(
+                    **_known_fields(handling_data, _SPECIAL_HANDLING_FIELDS)
+                )
 
             # Merge exclude patterns from rulesets
             tool_exclude = tool_data.get("exclude", [])
@@ -161,8 +346,10 @@ class Config:
                 enabled=tool_data.get("enabled", True),
                 source=source,
                 target=target,
-                include=tool_data.get("include", []),
-                exclude=merged_exclude,
+                # Patterns are read for every file during sync; store them
+                # as compact tuples of interned strings
+                include=tuple(sys.intern(p) for p in tool_data.get("include", [])),
+                exclude=tuple(sys.intern(p) for p in merged_exclude),
                 exclude_rulesets=tool_rulesets,
                 special_handling=special_handling,
             )
@@ -172,9 +359,10 @@ class Config:
         for rule_data in data.get("propagate", []):
             targets = []
             for target_data in rule_data.get("targets", []):
-                # Filter out exclude from target_data as it belongs to the rule level
-                filtered_target_data = {k: v for k, v in target_data.items() if k != "exclude"}
-                targets.append(PropagationTarget(**filtered_target_data))
+                # Drops exclude, which belongs to the rule level
+                targets.append(
+                    PropagationTarget(**_known_fields(target_data, _PROPAGATION_TARGET_FIELDS))
+                )
 
             propagate.append(
                 PropagationRule(
@@ -198,6 +386,11 @@ class Config:
         """Get default configuration file path."""
         return Path.home() / ".sync-agentic-tools.yaml"
 
+    @staticmethod
+    def cache_path(config_path: Path) -> Path:
+        """Get path of the parsed-config cache for a config file."""
+        return config_path.with_name(f"{config_path.name}.cache.json")
+
     def validate(self) -> list[str]:
         """
         Validate configuration.
@@ -211,12 +404,20 @@ class Config:
         if not any(tool.enabled for tool in self.tools.values()):
             errors.append("No tools are enabled in configuration")
 
+        # Check all enabled tool paths up front, batched by parent directory
+        existing = _existing_paths(
+            path
+            for tool in self.tools.values()
+            if tool.enabled
+            for path in (tool.source, tool.target)
+        )
+
         # Check that paths exist and rulesets are valid
         for tool_name, tool in self.tools.items():
             if tool.enabled:
-                if not tool.source.exists():
+                if tool.source not in existing:
                     errors.append(f"Tool '{tool_name}': source path does not exist: {tool.source}")
-                if not tool.target.exists():
+                if tool.target not in existing:
                     errors.append(f"Tool '{tool_name}': target path does not exist: {tool.target}")
 
             # Validate referenced exclude rulesets exist
@@ -317,17 +518,4 @@ class Config:
 
         Reads from the bundled default-config.yaml template file.
         """
-        try:
-            # Try to read from package resources
-            template_file = files("sync_agentic_tools.templates").joinpath("default-config.yaml")
-            return template_file.read_text()
-        except Exception:
-            # Fallback: try relative to this file
-            template_path = Path(__file__).parent / "templates" / "default-config.yaml"
-            if template_path.exists():
-                return template_path.read_text()
-            else:
-                raise FileNotFoundError(
-                    "Could not find default-config.yaml template file. "
-                    "Please reinstall the package."
-                )
+        return _read_template()
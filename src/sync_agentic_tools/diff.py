@@ -2,12 +2,19 @@
 
 import difflib
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 
 from .files import read_file_lines
 
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:
+    # cdifflib is optional - fall back to the pure-Python matcher
+    _SequenceMatcher = difflib.SequenceMatcher
 
-@dataclass
+
+@dataclass(slots=True)
 class DiffStats:
     """Statistics about a diff."""
 
@@ -23,6 +30,52 @@ class DiffStats:
         return f"+{self.additions} -{self.deletions}"
 
 
+def _diff_stats(diff: list[str]) -> DiffStats:
+    """
+    Count added and removed lines in a unified diff in a single pass.
+
+    Args:
+        diff: Unified diff lines
+
+    Returns:
+        DiffStats object
+    """
+    additions = deletions = 0
+    # Skip the "---"/"+++" file headers, which are always the first two lines
+    for line in islice(diff, 2, None):
+        marker = line[:1]
+        if marker == "+":
+            additions += 1
+        elif marker == "-":
+            deletions += 1
+
+    return DiffStats(additions=additions, deletions=deletions, total_changes=additions + deletions)
+
+
+def _count_changes(lines1: list[str], lines2: list[str]) -> DiffStats:
+    """
+    Count added and removed lines without formatting a diff.
+
+    Uses the same matching algorithm as difflib.unified_diff, so counts match
+    the stats of a generated diff. The C implementation from cdifflib is used
+    when it is installed.
+
+    Args:
+        lines1: Original lines
+        lines2: Modified lines
+
+    Returns:
+        DiffStats object
+    """
+    additions = deletions = 0
+    for tag, i1, i2, j1, j2 in _SequenceMatcher(None, lines1, lines2).get_opcodes():
+        if tag != "equal":
+            deletions += i2 - i1
+            additions += j2 - j1
+
+    return DiffStats(additions=additions, deletions=deletions, total_changes=additions + deletions)
+
+
 def generate_unified_diff(
     file1: Path, file2: Path, context_lines: int = 3
 ) -> tuple[list[str], DiffStats]:
@@ -55,13 +108,7 @@ def generate_unified_diff(
     # Strip trailing newlines left over from input lines
     diff = [line.rstrip("\n") for line in raw]
 
-    # Calculate stats
-    additions = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
-    deletions = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
-
-    stats = DiffStats(additions=additions, deletions=deletions, total_changes=additions + deletions)
-
-    return diff, stats
+    return diff, _diff_stats(diff)
 
 
 def generate_diff_between_strings(
@@ -84,12 +131,7 @@ def generate_diff_between_strings(
 
     diff = list(difflib.unified_diff(lines1, lines2, fromfile=name1, tofile=name2, lineterm=""))
 
-    additions = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
-    deletions = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
-
-    stats = DiffStats(additions=additions, deletions=deletions, total_changes=additions + deletions)
-
-    return diff, stats
+    return diff, _diff_stats(diff)
 
 
 def count_diff_lines(file1: Path, file2: Path) -> DiffStats:
@@ -103,13 +145,11 @@ def count_diff_lines(file1: Path, file2: Path) -> DiffStats:
     Returns:
         DiffStats object
     """
-    _, stats = generate_unified_diff(file1, file2)
-    return stats
+    return _count_changes(read_file_lines(file1), read_file_lines(file2))
 
 
 def count_diff_lines_from_strings(
     text1: str, text2: str, name1: str = "original", name2: str = "modified"
 ) -> DiffStats:
     """Count additions/deletions between two strings without generating full diff."""
-    _, stats = generate_diff_between_strings(text1, text2, name1, name2)
-    return stats
+    return _count_changes(text1.splitlines(), text2.splitlines())
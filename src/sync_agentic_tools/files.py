@@ -1,13 +1,44 @@
 """File operations for agentic-sync."""
 
 import hashlib
+import mmap
+import os
 import shutil
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO
 
+try:
+    import blake3
+except ImportError:
+    # blake3 is optional - checksums then use SHA-256, which hashlib runs on
+    # the CPU's SHA extensions where present
+    blake3 = None
 
-@dataclass
+# Algorithm for new checksums. Stored checksums are prefixed with the
+# algorithm that produced them, so checksums made without blake3 (or on
+# another machine) are still compared correctly.
+CHECKSUM_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+
+# Read size for hashing and comparing files - large reads amortise per-call overhead
+_READ_BUFFER_SIZE = 1 << 20
+
+# Linux-only flag to skip access time updates when reading files for hashing
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+# Checksums of files already hashed this run, keyed by path and algorithm,
+# stored with the (mtime_ns, size) they were computed for
+_CHECKSUM_CACHE: dict[tuple[Path, str], tuple[int, int, str]] = {}
+
+# Files modified this recently can't be recognised by (mtime_ns, size): a
+# same-size rewrite within the filesystem's timestamp granularity would leave
+# mtime_ns unchanged
+_SETTLED_MIN_AGE_NS = 2_000_000_000
+
+
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata for a file."""
 
@@ -29,40 +60,181 @@ class FileMetadata:
         Returns:
             FileMetadata object
         """
-        stat = file_path.stat()
         relative_path = str(file_path.relative_to(base_path))
 
+        # Stat the open file rather than the path, so the file is only
+        # looked up once
+        with _open_for_read(file_path) as f:
+            stat = os.fstat(f.fileno())
+            checksum = _checksum_open_file(f, file_path, stat)
+
         return cls(
             path=file_path,
-            checksum=compute_checksum(file_path),
+            checksum=checksum,
             size=stat.st_size,
             mtime=datetime.fromtimestamp(stat.st_mtime),
             relative_path=relative_path,
         )
 
 
-def compute_checksum(file_path: Path, algorithm: str = "sha256") -> str:
+def is_settled(stat: os.stat_result) -> bool:
+    """
+    Check whether a file's (mtime_ns, size) can stand in for its content.
+
+    Results derived from a file may be cached against its mtime and size
+    only once it hasn't been modified for a moment.
+
+    Args:
+        stat: Result of stat on the file
+
+    Returns:
+        True if the file was last modified long enough ago
+    """
+    return time.time_ns() - stat.st_mtime_ns >= _SETTLED_MIN_AGE_NS
+
+
+def _open_for_read(file_path: Path) -> BinaryIO:
+    """
+    Open a file for unbuffered binary reading.
+
+    Uses O_NOATIME where available, so hashing files during a scan doesn't
+    write access time updates back to disk.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Open file object
+    """
+    if _O_NOATIME:
+        try:
+            fd = os.open(file_path, os.O_RDONLY | _O_NOATIME)
+        except PermissionError:
+            # O_NOATIME is only permitted on files we own
+            fd = os.open(file_path, os.O_RDONLY)
+        return os.fdopen(fd, "rb", buffering=0)
+    return open(file_path, "rb", buffering=0)
+
+
+def _new_hash(algorithm: str, data: bytes | mmap.mmap = b""):
+    """
+    Create a hash object, including for blake3, which hashlib doesn't provide.
+
+    Args:
+        algorithm: Hash algorithm name
+        data: Initial data to hash
+
+    Returns:
+        Hash object with update() and hexdigest()
+
+    Raises:
+        ValueError: If the algorithm isn't available
+    """
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ValueError("blake3 checksums need the blake3 package")
+        return blake3.blake3(data)
+    return hashlib.new(algorithm, data)
+
+
+def _hash_open_file(f: BinaryIO, size: int, algorithm: str = CHECKSUM_ALGORITHM) -> str:
+    """
+    Compute checksum of an open file from its current position.
+
+    Args:
+        f: File opened for unbuffered binary reading
+        size: File size from a prior stat
+        algorithm: Hash algorithm (default: CHECKSUM_ALGORITHM)
+
+    Returns:
+        Checksum string in format "algorithm:hexdigest"
+    """
+    # Most synced files are small configs: read them in one call rather
+    # than allocating a chunk buffer larger than the file
+    if size <= _READ_BUFFER_SIZE:
+        return f"{algorithm}:{_new_hash(algorithm, f.read()).hexdigest()}"
+
+    # Hash large files straight from the page cache via mmap, skipping the
+    # copy into Python buffers. Large mappings are costly on Windows.
+    if os.name != "nt":
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return f"{algorithm}:{_new_hash(algorithm, mm).hexdigest()}"
+        except (OSError, ValueError):
+            # Filesystem doesn't support mmap - fall back to reading
+            pass
+
+    # Read in chunks, reusing one buffer, to handle large files
+    digest = hashlib.file_digest(f, lambda: _new_hash(algorithm))
+    return f"{algorithm}:{digest.hexdigest()}"
+
+
+def _checksum_open_file(
+    f: BinaryIO, file_path: Path, stat: os.stat_result, algorithm: str = CHECKSUM_ALGORITHM
+) -> str:
+    """
+    Checksum an open file, reusing the last result if it is unchanged.
+
+    Args:
+        f: File opened for unbuffered binary reading
+        file_path: Path the file was opened from
+        stat: Result of fstat on the open file
+        algorithm: Hash algorithm (default: CHECKSUM_ALGORITHM)
+
+    Returns:
+        Checksum string in format "algorithm:hexdigest"
+    """
+    key = (file_path, algorithm)
+    cached = _CHECKSUM_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    checksum = _hash_open_file(f, stat.st_size, algorithm)
+    if is_settled(stat):
+        _CHECKSUM_CACHE[key] = (stat.st_mtime_ns, stat.st_size, checksum)
+    return checksum
+
+
+def compute_checksum(file_path: Path, algorithm: str = CHECKSUM_ALGORITHM) -> str:
     """
     Compute checksum of a file.
 
     Args:
         file_path: Path to file
-        algorithm: Hash algorithm (default: sha256)
+        algorithm: Hash algorithm (default: CHECKSUM_ALGORITHM)
 
     Returns:
         Checksum string in format "algorithm:hexdigest"
     """
-    hasher = hashlib.new(algorithm)
-    with open(file_path, "rb") as f:
-        # Read in chunks to handle large files
-        while chunk := f.read(8192):
-            hasher.update(chunk)
-    return f"{algorithm}:{hasher.hexdigest()}"
+    with _open_for_read(file_path) as f:
+        return _checksum_open_file(f, file_path, os.fstat(f.fileno()), algorithm)
+
+
+def file_matches_checksum(file_path: Path, checksum: str) -> bool:
+    """
+    Check a file against a stored checksum, hashing with the stored algorithm.
+
+    Args:
+        file_path: Path to file
+        checksum: Checksum string in format "algorithm:hexdigest"
+
+    Returns:
+        True if the file's content has that checksum. False if it differs,
+        or if the algorithm isn't available here to check it.
+    """
+    algorithm = checksum.partition(":")[0]
+    try:
+        return compute_checksum(file_path, algorithm) == checksum
+    except ValueError:
+        # Unknown algorithm, e.g. blake3 recorded by a machine that has it
+        return False
 
 
 def files_are_identical(file1: Path, file2: Path) -> bool:
     """
-    Check if two files are identical by comparing checksums.
+    Check if two files are identical by comparing their contents.
 
     Args:
         file1: First file path
@@ -71,15 +243,81 @@ def files_are_identical(file1: Path, file2: Path) -> bool:
     Returns:
         True if files have same content
     """
-    if not file1.exists() or not file2.exists():
+    try:
+        size1 = file1.stat().st_size
+        size2 = file2.stat().st_size
+    except OSError:
+        # Missing file
         return False
 
     # Quick size check first
-    if file1.stat().st_size != file2.stat().st_size:
+    if size1 != size2:
         return False
 
-    # Compare checksums
-    return compute_checksum(file1) == compute_checksum(file2)
+    # Byte-compare in large blocks rather than hashing both files in full,
+    # so differing files stop at the first mismatching block
+    with open(file1, "rb") as f1, open(file2, "rb") as f2:
+        while True:
+            block = f1.read(_READ_BUFFER_SIZE)
+            if block != f2.read(_READ_BUFFER_SIZE):
+                return False
+            if not block:
+                return True
+
+
+def copy_file_data(source: Path, dest: Path, size: int | None = None) -> None:
+    """
+    Copy file contents (not metadata) from source to dest.
+
+    Uses os.copy_file_range where available so the data is copied in-kernel
+    (or reflinked, on btrfs and XFS). Otherwise falls back to
+    shutil.copyfile, which uses sendfile on Linux and fcopyfile on macOS.
+
+    Args:
+        source: Source file path
+        dest: Destination file path (created or truncated)
+        size: Source size if already known from a prior stat()
+    """
+    if hasattr(os, "copy_file_range"):
+        if size is None:
+            size = source.stat().st_size
+
+        with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+            try:
+                # Copy until EOF in case the file grew since it was stat'd
+                chunk = max(size, 1 << 20)
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), chunk):
+                    pass
+                return
+            except OSError:
+                # Unsupported filesystem or cross-device copy - start over
+                pass
+
+    shutil.copyfile(source, dest)
+
+
+def copy_and_hash(
+    source: Path, dest: Path, algorithm: str = CHECKSUM_ALGORITHM
+) -> tuple[int, str]:
+    """
+    Copy file contents while computing their checksum in the same pass.
+
+    Args:
+        source: Source file path
+        dest: Destination file path (created or truncated)
+        algorithm: Hash algorithm (default: CHECKSUM_ALGORITHM)
+
+    Returns:
+        Tuple of (bytes copied, checksum in format "algorithm:hexdigest")
+    """
+    hasher = _new_hash(algorithm)
+    size = 0
+    with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+        while chunk := fsrc.read(1 << 20):
+            hasher.update(chunk)
+            fdst.write(chunk)
+            size += len(chunk)
+    return size, f"{algorithm}:{hasher.hexdigest()}"
 
 
 def safe_copy_file(
@@ -98,8 +336,10 @@ def safe_copy_file(
         FileNotFoundError: If source doesn't exist
         IsADirectoryError: If dest is a directory
     """
-    if not source.exists():
-        raise FileNotFoundError(f"Source file not found: {source}")
+    try:
+        size = source.stat().st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Source file not found: {source}") from None
 
     if dest.is_dir():
         raise IsADirectoryError(f"Destination is a directory: {dest}")
@@ -113,8 +353,10 @@ def safe_copy_file(
         backup_path = dest.with_suffix(dest.suffix + ".bak")
         shutil.copy2(source, backup_path)
 
-    # Copy file preserving metadata
-    shutil.copy2(source, dest)
+    # Copy in-kernel where possible (a reflink on btrfs and XFS), then
+    # preserve metadata as shutil.copy2 would
+    copy_file_data(source, dest, size)
+    shutil.copystat(source, dest)
 
 
 def safe_delete_file(file_path: Path, backup: bool = False) -> None:
@@ -150,6 +392,9 @@ def read_file_lines(file_path: Path) -> list[str]:
     """
     try:
         with open(file_path, encoding="utf-8") as f:
+            # readlines() splits in C and benchmarks faster than
+            # read().splitlines(keepends=True), which would also split on
+            # form feeds and Unicode line separators
             return f.readlines()
     except UnicodeDecodeError:
         # Binary file or different encoding
@@ -187,6 +432,9 @@ def is_text_file(file_path: Path, sample_size: int = 8192) -> bool:
             # Check for null bytes (common in binary files)
             if b"\x00" in sample:
                 return False
+            # Pure ASCII is valid UTF-8 - skip building a str to find out
+            if sample.isascii():
+                return True
             # Try to decode as UTF-8
             sample.decode("utf-8")
             return True
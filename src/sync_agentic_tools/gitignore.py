@@ -1,5 +1,9 @@
 """Gitignore file parsing for agentic-sync."""
 
+import os
+from collections import deque
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -7,6 +11,8 @@ def parse_gitignore(gitignore_path: Path, add_global_prefix: bool = True) -> lis
     """
     Parse a .gitignore file and return a list of exclude patterns.
 
+    Parsed patterns are cached until the file's mtime or size changes.
+
     Args:
         gitignore_path: Path to .gitignore file
         add_global_prefix: If True, add **/ prefix for global matching (root gitignore).
@@ -15,13 +21,38 @@ def parse_gitignore(gitignore_path: Path, add_global_prefix: bool = True) -> lis
     Returns:
         List of glob patterns to exclude
     """
-    if not gitignore_path.exists():
+    try:
+        stat = gitignore_path.stat()
+    except OSError:
         return []
 
+    return list(
+        _parse_gitignore_cached(
+            str(gitignore_path), stat.st_mtime_ns, stat.st_size, add_global_prefix
+        )
+    )
+
+
+@lru_cache(maxsize=4096)
+def _parse_gitignore_cached(
+    path_str: str, mtime_ns: int, size: int, add_global_prefix: bool
+) -> tuple[str, ...]:
+    """
+    Parse a .gitignore file, memoised on its path, mtime and size.
+
+    Args:
+        path_str: Path to .gitignore file
+        mtime_ns: File modification time, part of the cache key
+        size: File size, part of the cache key
+        add_global_prefix: Passed through to _gitignore_to_glob
+
+    Returns:
+        Tuple of glob patterns to exclude
+    """
     patterns = []
 
     try:
-        with open(gitignore_path, encoding="utf-8") as f:
+        with open(path_str, encoding="utf-8") as f:
             for line in f:
                 # Strip whitespace
                 line = line.strip()
@@ -43,7 +74,7 @@ def parse_gitignore(gitignore_path: Path, add_global_prefix: bool = True) -> lis
         # Ignore files we can't read
         pass
 
-    return patterns
+    return tuple(patterns)
 
 
 def _gitignore_to_glob(pattern: str, add_global_prefix: bool = True) -> str:
@@ -96,6 +127,36 @@ def _gitignore_to_glob(pattern: str, add_global_prefix: bool = True) -> str:
     return f"**/{pattern}"
 
 
+def _find_nested_gitignores(base_path: Path) -> Iterator[Path]:
+    """
+    Find .gitignore files below base_path, excluding the root one.
+
+    Walks the tree with os.scandir so entries are matched by name from the
+    directory listing without a stat() per entry. Symlinked directories and
+    .git directories are not descended into.
+
+    Args:
+        base_path: Base directory to search
+
+    Yields:
+        Paths to nested .gitignore files
+    """
+    pending = deque([base_path])
+    while pending:
+        directory = pending.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == ".gitignore":
+                        if directory != base_path:
+                            yield Path(entry.path)
+                    elif entry.name != ".git" and entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+        except OSError:
+            # Unreadable directory - skip it
+            continue
+
+
 def collect_gitignore_patterns(base_path: Path, respect_nested: bool = True) -> list[str]:
     """
     Collect gitignore patterns from .gitignore files in directory tree.
@@ -116,11 +177,7 @@ def collect_gitignore_patterns(base_path: Path, respect_nested: bool = True) ->
 
     # Read nested .gitignore files if requested
     if respect_nested and base_path.is_dir():
-        for gitignore_path in base_path.rglob(".gitignore"):
-            # Skip the root one we already processed
-            if gitignore_path == root_gitignore:
-                continue
-
+        for gitignore_path in _find_nested_gitignores(base_path):
             # Parse patterns WITHOUT global prefix - we'll scope them to the directory
             nested_patterns = parse_gitignore(gitignore_path, add_global_prefix=False)
 
@@ -2,14 +2,80 @@
 Propagation logic for cross-tool file copying with transformations.
 """
 
+import json
+import os
 import re
-from fnmatch import fnmatch
+import stat
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from .config import Config, PropagationRule
+try:
+    import regex
+except ImportError:
+    # regex is optional - user-supplied patterns then run on re, without a
+    # time limit
+    regex = None
+
+from .config import Config, PropagationRule, PropagationTarget
+from .files import copy_file_data, files_are_identical
 from .ui import show_error, show_info
 
+# Sources larger than this are streamed to targets without transforms rather
+# than read into memory, and only read if some target transforms them
+_STREAM_THRESHOLD = 1 << 20
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile a regex, memoised since the same transforms run for every file."""
+    return re.compile(pattern, flags)
+
+
+# Longest a single user-supplied pattern may run, in seconds, when the regex
+# module is installed
+_USER_PATTERN_TIMEOUT = 10.0
+
+
+@lru_cache(maxsize=256)
+def _compile_user(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """
+    Compile a user-supplied regex, using the regex module when it is installed.
+
+    regex avoids the catastrophic backtracking re can hit on some patterns
+    and supports a timeout, so a bad pattern can't stall propagation.
+    """
+    if regex is not None:
+        return regex.compile(pattern, flags)
+    return re.compile(pattern, flags)
+
+
+def _user_sub(compiled: re.Pattern[str], replace: str, content: str, count: int = 0) -> str:
+    """
+    Substitute with a pattern from _compile_user, bounded by a timeout under regex.
+
+    Raises:
+        TimeoutError: If the substitution runs longer than _USER_PATTERN_TIMEOUT
+    """
+    if regex is not None:
+        return compiled.sub(replace, content, count=count, timeout=_USER_PATTERN_TIMEOUT)
+    return compiled.sub(replace, content, count=count)
+
+
+# Characters that give a sed search pattern regex meaning
+_REGEX_METACHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+@lru_cache(maxsize=256)
+def _is_literal_substitution(search: str, replace: str) -> bool:
+    """Check if a substitution can be done with str.replace instead of re.sub."""
+    # Backslashes in the replacement are escapes or group references
+    return not _REGEX_METACHARS.search(search) and "\\" not in replace
+
 
 def apply_sed_transform(content: str, pattern: str) -> str:
     """
@@ -32,13 +98,12 @@ def apply_sed_transform(content: str, pattern: str) -> str:
     replace = parts[2]
     flags = parts[3] if len(parts) > 3 else ""
 
-    # Apply regex replacement
-    if "g" in flags:
-        # Global replacement
-        return re.sub(search, replace, content)
-    else:
-        # Single replacement
-        return re.sub(search, replace, content, count=1)
+    # Literal patterns (the common case) skip the regex engine entirely
+    if _is_literal_substitution(search, replace):
+        return content.replace(search, replace, -1 if "g" in flags else 1)
+
+    # Apply regex replacement - global with "g", otherwise first match only
+    return _user_sub(_compile_user(search), replace, content, count=0 if "g" in flags else 1)
 
 
 def apply_remove_xml_sections_transform(content: str, sections: list[str]) -> str:
@@ -47,15 +112,34 @@ def apply_remove_xml_sections_transform(content: str, sections: list[str]) -> st
 
     Sections are identified by XML-style tags like <SECTION_NAME>...</SECTION_NAME>
     """
-    result = content
+    # Substring searches are far cheaper than the regex scan, and most
+    # content doesn't contain any of the tags
+    if not any(f"<{section}" in content for section in sections):
+        return content
 
-    for section in sections:
-        # Match section with both self-closing and paired tags
-        # Pattern: <SECTION_NAME>...</SECTION_NAME> or <SECTION_NAME/>
-        pattern = rf"<{section}[^>]*>.*?</{section}>|<{section}\s*/>"
-        result = re.sub(pattern, "", result, flags=re.DOTALL)
+    return _user_sub(_xml_sections_pattern(tuple(sections)), "", content)
 
-    return result
+
+@lru_cache(maxsize=64)
+def _xml_sections_pattern(sections: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Build one regex matching any of the named XML-style sections.
+
+    Matches paired tags <NAME ...>...</NAME>, with the backreference keeping
+    open and close tags the same section, or self-closing <NAME/> tags.
+    Removing all sections is then a single pass over the content.
+    """
+    names = "|".join(re.escape(section) for section in sections)
+    # The lazy .*? can backtrack heavily on long unclosed sections, so this
+    # runs like a user-supplied pattern
+    return _compile_user(rf"<({names})[^>]*>.*?</\1>|<(?:{names})\s*/>", re.DOTALL)
+
+
+@lru_cache(maxsize=64)
+def _markdown_headings_pattern(sections: tuple[str, ...]) -> re.Pattern[str]:
+    """Build one regex matching a heading line for any of the named sections."""
+    names = "|".join(re.escape(section) for section in sections)
+    return re.compile(rf"^#{{1,6}}\s+(?:{names})\s*$", re.MULTILINE)
 
 
 def apply_remove_markdown_sections_transform(content: str, sections: list[str]) -> str:
@@ -68,13 +152,24 @@ def apply_remove_markdown_sections_transform(content: str, sections: list[str])
 
     Headings inside fenced code blocks are ignored.
     """
+    if not sections or "#" not in content:
+        return content
+
+    # One scan finds every heading naming any of the sections, so sections
+    # that don't appear are skipped without scanning the content again
+    headings = [match.group() for match in _markdown_headings_pattern(tuple(sections)).finditer(content)]
+    if not headings:
+        return content
+
     result = content
 
     for section in sections:
-        heading_pattern = re.compile(
+        heading_pattern = _compile(
             rf"^(#{{1,6}})\s+{re.escape(section)}\s*$",
             re.MULTILINE,
         )
+        if not any(heading_pattern.match(heading) for heading in headings):
+            continue
 
         match = heading_pattern.search(result)
         if not match:
@@ -83,22 +178,20 @@ def apply_remove_markdown_sections_transform(content: str, sections: list[str])
         heading_level = len(match.group(1))
         section_start = match.start()
 
-        # Find the next heading at the same or higher level, skipping code blocks
-        next_heading_re = re.compile(
-            rf"^#{{1,{heading_level}}}\s+\S",
+        # Find the next heading at the same or higher level, skipping code
+        # blocks. One regex finds both code fences and candidate headings,
+        # scanning forward from the heading without copying the tail.
+        boundary_re = _compile(
+            rf"^(?:```|#{{1,{heading_level}}}[^\S\n]+\S)",
             re.MULTILINE,
         )
         in_code_block = False
         section_end = len(result)
-        for line_match in re.finditer(r"^.*$", result[match.end():], re.MULTILINE):
-            line = line_match.group()
-            if line.startswith("```"):
+        for boundary in boundary_re.finditer(result, match.end()):
+            if boundary.group().startswith("```"):
                 in_code_block = not in_code_block
-                continue
-            if in_code_block:
-                continue
-            if next_heading_re.match(line):
-                section_end = match.end() + line_match.start()
+            elif not in_code_block:
+                section_end = boundary.start()
                 break
 
         # Remove the section, normalising surrounding blank lines
@@ -138,47 +231,192 @@ def apply_transform(content: str, transform: dict[str, Any]) -> str:
         raise ValueError(f"Unknown transform type: {transform_type}")
 
 
+def _transform_content(content: str, transforms: list[dict[str, Any]]) -> str | None:
+    """
+    Apply a list of transformations to content in order.
+
+    Args:
+        content: File content
+        transforms: List of transformations to apply
+
+    Returns:
+        Transformed content, or None if a transformation failed
+    """
+    for transform in transforms:
+        try:
+            content = apply_transform(content, transform)
+        except Exception as e:
+            show_error(f"Failed to apply transform {transform.get('type')}: {e}")
+            return None
+    return content
+
+
+def _decode_source(data: bytes) -> str:
+    """
+    Decode source file bytes the way a UTF-8 text-mode read would.
+
+    Args:
+        data: Raw file content
+
+    Returns:
+        Decoded content with universal newlines
+
+    Raises:
+        UnicodeDecodeError: If the content isn't valid UTF-8
+    """
+    content = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _transform_for_target(
+    source_file: Path,
+    data: bytes,
+    transforms: list[dict[str, Any]],
+    cache: dict[str, str | None],
+) -> str | bytes | None:
+    """
+    Transform content for a target, reusing results for identical transform lists.
+
+    Targets without transforms get the raw bytes back, so the source is never
+    decoded for them. Otherwise the source is decoded once and each distinct
+    pipeline, keyed by its canonical JSON, runs once per source file.
+
+    Args:
+        source_file: Source file path, for error messages
+        data: Raw source file content
+        transforms: Target's list of transformations
+        cache: Results already computed for this source content
+
+    Returns:
+        Raw bytes when there are no transforms, the transformed text, or None
+        if decoding or a transformation failed
+    """
+    if not transforms:
+        return data
+
+    key = json.dumps(transforms, sort_keys=True)
+    if key not in cache:
+        # The empty pipeline's slot holds the decoded source text, which is
+        # free because untransformed targets never consult the cache
+        if "[]" not in cache:
+            try:
+                cache["[]"] = _decode_source(data)
+            except UnicodeDecodeError as e:
+                show_error(f"Failed to read source file {source_file}: {e}")
+                cache["[]"] = None
+        content = cache["[]"]
+        cache[key] = None if content is None else _transform_content(content, transforms)
+    return cache[key]
+
+
+def _file_has_content(file_path: Path, expected: bytes) -> bool:
+    """
+    Check if a file contains exactly the expected bytes.
+
+    Compares sizes first, so files that changed length aren't read at all,
+    then compares in chunks, stopping at the first difference.
+
+    Args:
+        file_path: File to check
+        expected: Expected file content
+
+    Returns:
+        True if the file exists and matches; False otherwise, including
+        when it can't be read
+    """
+    try:
+        if file_path.stat().st_size != len(expected):
+            return False
+
+        view = memoryview(expected)
+        offset = 0
+        with open(file_path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                if chunk != view[offset : offset + len(chunk)]:
+                    return False
+                offset += len(chunk)
+        return offset == len(expected)
+    except OSError:
+        return False
+
+
+def _ensure_parent_dir(path: Path, created_dirs: set[Path] | None) -> None:
+    """
+    Create a file's parent directory, skipping directories already created.
+
+    Args:
+        path: File whose parent directory is needed
+        created_dirs: Directories already ensured during this propagation,
+            updated in place; None to always call mkdir
+    """
+    parent = path.parent
+    if created_dirs is not None and parent in created_dirs:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    if created_dirs is not None:
+        created_dirs.add(parent)
+
+
+def _write_atomically(target_path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a file via a sibling temporary file and os.replace.
+
+    Readers never see a partially written target, and a failed write leaves
+    the previous content in place. An existing target keeps its permissions,
+    and a symlinked target is written through rather than replaced.
+
+    Args:
+        target_path: File to write
+        write: Writes the new content to the path it is given
+    """
+    target_path = Path(os.path.realpath(target_path))
+    # Hidden, so propagation walks and orphan checks never pick it up
+    temp_path = target_path.with_name(
+        f".{target_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        write(temp_path)
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(target_path).st_mode))
+        except FileNotFoundError:
+            # New target - keep the default permissions
+            pass
+        os.replace(temp_path, target_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
 def propagate_single_file(
     source_file: Path,
     target_base: Path,
     relative_path: Path,
-    content: str,
-    transforms: list[dict[str, Any]],
+    content: str | bytes,
     dry_run: bool,
+    created_dirs: set[Path] | None = None,
 ) -> None:
     """
-    Propagate a single file with transformations.
+    Write already-transformed content to a single target file.
 
     Args:
         source_file: Source file path
         target_base: Target base directory
         relative_path: Relative path for file
-        content: File content
-        transforms: List of transformations to apply
+        content: Transformed text, or raw bytes to copy verbatim
         dry_run: If True, don't actually write files
+        created_dirs: Directories already created during this propagation
     """
     target_path = target_base / relative_path
 
-    # Apply transformations
-    transformed_content = content
-    for transform in transforms:
-        try:
-            transformed_content = apply_transform(transformed_content, transform)
-        except Exception as e:
-            show_error(f"Failed to apply transform {transform.get('type')}: {e}")
-            return
-
-    # Check if target already has the same content
-    needs_update = True
-    if target_path.exists():
-        try:
-            with open(target_path, encoding="utf-8") as f:
-                existing_content = f.read()
-            if existing_content == transformed_content:
-                needs_update = False
-        except Exception:
-            # If we can't read target, assume it needs update
-            needs_update = True
+    # Check if target already has the same content, as the bytes the write
+    # below would produce
+    if isinstance(content, bytes):
+        expected = content
+    else:
+        expected = content.replace("\n", os.linesep).encode("utf-8")
+    needs_update = not _file_has_content(target_path, expected)
 
     # Write to target only if changed
     if not needs_update:
@@ -188,19 +426,204 @@ def propagate_single_file(
         show_info(f"Would propagate: {source_file} → {target_path}")
     else:
         try:
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(target_path, "w", encoding="utf-8") as f:
-                f.write(transformed_content)
+            _ensure_parent_dir(target_path, created_dirs)
+            _write_atomically(target_path, lambda temp_path: temp_path.write_bytes(expected))
             show_info(f"Propagated: {source_file} → {target_path}")
         except Exception as e:
             show_error(f"Failed to write target file {target_path}: {e}")
 
 
+def _stream_single_file(
+    source_file: Path,
+    target_path: Path,
+    size: int,
+    dry_run: bool,
+    created_dirs: set[Path] | None = None,
+) -> None:
+    """
+    Copy a source file to a target unchanged, without loading it into memory.
+
+    Args:
+        source_file: Source file path
+        target_path: Target file path
+        size: Source file size
+        dry_run: If True, don't actually write files
+        created_dirs: Directories already created during this propagation
+    """
+    if files_are_identical(source_file, target_path):
+        # Skip - already up to date
+        return
+
+    if dry_run:
+        show_info(f"Would propagate: {source_file} → {target_path}")
+        return
+
+    try:
+        _ensure_parent_dir(target_path, created_dirs)
+        _write_atomically(target_path, lambda temp_path: copy_file_data(source_file, temp_path, size))
+        show_info(f"Propagated: {source_file} → {target_path}")
+    except Exception as e:
+        show_error(f"Failed to write target file {target_path}: {e}")
+
+
+def _read_source(source_file: Path) -> bytes | None:
+    """
+    Read a source file's raw content.
+
+    Args:
+        source_file: Source file path
+
+    Returns:
+        File content, or None if it couldn't be read (an error is shown)
+    """
+    try:
+        with open(source_file, "rb") as f:
+            return f.read()
+    except Exception as e:
+        show_error(f"Failed to read source file {source_file}: {e}")
+        return None
+
+
+def _propagate_source(
+    source_file: Path,
+    destinations: list[tuple[PropagationTarget, Path, Path]],
+    dry_run: bool,
+    created_dirs: set[Path] | None = None,
+) -> bool:
+    """
+    Propagate one source file to each of its destinations.
+
+    Args:
+        source_file: Source file path
+        destinations: (target, target base, relative path) for each destination
+        dry_run: If True, don't actually write files
+        created_dirs: Directories already created during this propagation
+
+    Returns:
+        False if the source couldn't be read at all, True otherwise
+    """
+    try:
+        size = source_file.stat().st_size
+    except OSError as e:
+        show_error(f"Failed to read source file {source_file}: {e}")
+        return False
+
+    streamed = size > _STREAM_THRESHOLD
+    data = None
+    if not streamed:
+        data = _read_source(source_file)
+        if data is None:
+            return False
+
+    # Propagate to each target, transforming once per distinct pipeline
+    transformed_cache: dict[str, str | None] = {}
+    read_failed = False
+    for target, target_base, relative_path in destinations:
+        if streamed and not target.transforms:
+            _stream_single_file(source_file, target_base / relative_path, size, dry_run, created_dirs)
+            continue
+
+        if data is None:
+            if read_failed:
+                continue
+            data = _read_source(source_file)
+            if data is None:
+                read_failed = True
+                continue
+
+        transformed = _transform_for_target(source_file, data, target.transforms, transformed_cache)
+        if transformed is not None:
+            propagate_single_file(
+                source_file, target_base, relative_path, transformed, dry_run, created_dirs
+            )
+
+    return True
+
+
+def _resolve_target_path(config: Config, target: PropagationTarget) -> Path | None:
+    """
+    Resolve where a propagation target writes to.
+
+    Args:
+        config: Configuration object
+        target: Propagation target
+
+    Returns:
+        Target path, or None if the target is invalid (an error is shown)
+    """
+    if target.dest_path:
+        return Path(target.dest_path).expanduser()
+    if target.tool and target.target_file:
+        if target.tool not in config.tools:
+            show_error(f"Target tool not found: {target.tool}")
+            return None
+        return config.tools[target.tool].target / target.target_file
+    show_error("Target must specify either dest_path or (tool + target_file)")
+    return None
+
+
+@lru_cache(maxsize=64)
+def _exclude_pattern(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """
+    Build one regex matching any of the fnmatch-style exclude patterns.
+
+    Each file is then checked with one regex match instead of a separate
+    fnmatch call per pattern.
+
+    Args:
+        patterns: fnmatch-style patterns
+
+    Returns:
+        Compiled alternation, or None if there are no patterns
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(translate(pattern) for pattern in patterns))
+
+
+def _is_excluded(exclude_re: re.Pattern[str] | None, relative_path: str, name: str) -> bool:
+    """Check if a file's relative path or name matches an exclude pattern."""
+    return exclude_re is not None and bool(exclude_re.match(relative_path) or exclude_re.match(name))
+
+
+def _walk_files(root: Path) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """
+    Recursively find non-hidden files below a directory.
+
+    Uses os.scandir so file and directory checks come from the directory
+    listing, and skips hidden entries before descending so hidden subtrees
+    are never walked. Symlinked directories aren't descended into, matching
+    Path.rglob.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        (path relative to root, directory entry) for each file
+    """
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    relative = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, relative + os.sep))
+                    elif entry.is_file():
+                        yield relative, entry
+        except OSError:
+            # Unreadable directory - skip it
+            continue
+
+
 def find_orphaned_files(
     source_path: Path,
     target_base: Path,
     exclude_patterns: list[str],
-    propagated_files: set[Path],
+    propagated_files: set[str],
 ) -> list[Path]:
     """
     Find files in target that don't exist in source (orphaned files).
@@ -209,29 +632,25 @@ def find_orphaned_files(
         source_path: Source directory
         target_base: Target directory
         exclude_patterns: Patterns to exclude from checking
-        propagated_files: Set of files that were propagated
+        propagated_files: Paths, relative to target_base, of the files the
+            source provides
 
     Returns:
         List of orphaned file paths
     """
-    if not target_base.exists():
-        return []
-
     orphaned = []
+    exclude_re = _exclude_pattern(tuple(exclude_patterns))
 
-    for target_file in target_base.rglob("*"):
-        if not target_file.is_file():
-            continue
-
-        # Skip hidden files
-        relative_path = target_file.relative_to(target_base)
-        if any(part.startswith(".") for part in relative_path.parts):
+    # Hidden files and directories are skipped by the walk, and a missing
+    # target yields nothing
+    for relative_path, entry in _walk_files(target_base):
+        if _is_excluded(exclude_re, relative_path, entry.name):
             continue
 
         # Check if this file was propagated (should exist)
-        if target_file not in propagated_files:
+        if relative_path not in propagated_files:
             # This file exists in target but wasn't propagated from source
-            orphaned.append(target_file)
+            orphaned.append(Path(entry.path))
 
     return orphaned
 
@@ -272,68 +691,52 @@ def propagate_file(
 
     # Check if source is a directory
     if source_path.is_dir():
-        # Track propagated files per target for orphan detection
-        target_propagated_files: dict[Path, set[Path]] = {}
-
-        # Recursively propagate all files in directory
-        for source_file in source_path.rglob("*"):
-            if source_file.is_file():
-                # Calculate relative path from source directory
-                relative_path = source_file.relative_to(source_path)
-                relative_path_str = str(relative_path)
-
-                # Skip hidden files and files in hidden directories
-                if any(part.startswith(".") for part in relative_path.parts):
-                    continue
-
-                # Check exclude patterns
-                excluded = False
-                for pattern in rule.exclude:
-                    if fnmatch(relative_path_str, pattern) or fnmatch(source_file.name, pattern):
-                        excluded = True
-                        break
-
-                if excluded:
-                    continue
-
-                # Read file content
-                try:
-                    with open(source_file, encoding="utf-8") as f:
-                        content = f.read()
-                except Exception as e:
-                    show_error(f"Failed to read source file {source_file}: {e}")
-                    continue
-
-                # Propagate to each target
-                for target in rule.targets:
-                    # Determine target base path
-                    if target.dest_path:
-                        target_base = Path(target.dest_path).expanduser()
-                    elif target.tool and target.target_file:
-                        if target.tool not in config.tools:
-                            show_error(f"Target tool not found: {target.tool}")
-                            continue
-                        target_tool = config.tools[target.tool]
-                        target_base = target_tool.target / target.target_file
-                    else:
-                        show_error("Target must specify either dest_path or (tool + target_file)")
-                        continue
+        # Resolve target directories once for the whole tree
+        target_bases: list[tuple[PropagationTarget, Path]] = []
+        for target in rule.targets:
+            target_base = _resolve_target_path(config, target)
+            if target_base is not None:
+                target_bases.append((target, target_base))
+
+        # Collect files to propagate, skipping hidden and excluded files
+        source_files: list[tuple[Path, str]] = []
+        exclude_re = _exclude_pattern(tuple(rule.exclude))
+        for relative_path_str, entry in _walk_files(source_path):
+            # Check exclude patterns
+            if _is_excluded(exclude_re, relative_path_str, entry.name):
+                continue
+
+            source_files.append((Path(entry.path), relative_path_str))
 
-                    # Track this target's propagated files
-                    if target_base not in target_propagated_files:
-                        target_propagated_files[target_base] = set()
+        # Target directories created so far, so files sharing a directory
+        # don't each repeat the mkdir
+        created_dirs: set[Path] = set()
 
-                    target_file_path = target_base / relative_path
-                    target_propagated_files[target_base].add(target_file_path)
+        def propagate_task(item: tuple[Path, str]) -> None:
+            source_file, relative_path_str = item
+            relative_path = Path(relative_path_str)
+            destinations = [(target, target_base, relative_path) for target, target_base in target_bases]
+            _propagate_source(source_file, destinations, dry_run, created_dirs)
 
-                    propagate_single_file(
-                        source_file, target_base, relative_path, content, target.transforms, dry_run
-                    )
+        # Reads and writes release the GIL, so files are propagated in
+        # parallel unless disabled in settings
+        if config.settings.parallel_propagation and len(source_files) > 1:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(source_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(propagate_task, source_files))
+        else:
+            for item in source_files:
+                propagate_task(item)
+
+        # Every target is expected to hold exactly the source walk's files,
+        # as relative paths in the form _walk_files yields them, whether or
+        # not this run had to write them
+        expected_files = {relative_path_str for _, relative_path_str in source_files}
 
         # Check for orphaned files in each target
-        if not dry_run:
-            for target_base, propagated_files in target_propagated_files.items():
-                orphaned = find_orphaned_files(source_path, target_base, rule.exclude, propagated_files)
+        if not dry_run and source_files:
+            for target_base in dict.fromkeys(target_base for _, target_base in target_bases):
+                orphaned = find_orphaned_files(source_path, target_base, rule.exclude, expected_files)
                 if orphaned:
                     from .ui import show_orphaned_file_action_prompt, show_orphaned_files_prompt
 
@@ -373,7 +776,6 @@ def propagate_file(
 
                     elif action == "select":
                         # Process each file individually
-                        import os
                         import subprocess
 
                         for orphan in orphaned:
@@ -422,31 +824,17 @@ def propagate_file(
         return
 
     # Single file propagation
-    try:
-        with open(source_path, encoding="utf-8") as f:
-            content = f.read()
-    except Exception as e:
-        show_error(f"Failed to read source file {source_path}: {e}")
-        return
-
-    # Propagate to each target
+    destinations = []
     for target in rule.targets:
         # Determine target path (single file)
-        if target.dest_path:
-            target_path = Path(target.dest_path).expanduser()
-        elif target.tool and target.target_file:
-            if target.tool not in config.tools:
-                show_error(f"Target tool not found: {target.tool}")
-                continue
-            target_tool = config.tools[target.tool]
-            target_path = target_tool.target / target.target_file
-        else:
-            show_error("Target must specify either dest_path or (tool + target_file)")
+        target_path = _resolve_target_path(config, target)
+        if target_path is None:
             continue
 
         # Use target filename (not source filename)
-        relative_path = Path(target_path.name)
-        propagate_single_file(source_path, target_path.parent, relative_path, content, target.transforms, dry_run)
+        destinations.append((target, target_path.parent, Path(target_path.name)))
+
+    _propagate_source(source_path, destinations, dry_run)
 
 
 def run_propagation(config: Config, dry_run: bool = False) -> None:
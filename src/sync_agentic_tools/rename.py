@@ -16,6 +16,21 @@ class RenameCandidate:
     confidence: float  # 1.0 = exact match
 
 
+def _checksum_files(files: dict[str, Path], algorithm: str) -> dict[str, str]:
+    """Checksum files with the given algorithm, skipping unreadable ones."""
+    checksums = {}
+    try:
+        for relpath, full_path in files.items():
+            try:
+                checksums[relpath] = compute_checksum(full_path, algorithm)
+            except OSError:
+                continue
+    except ValueError:
+        # Algorithm not available here, so nothing can match
+        return {}
+    return checksums
+
+
 def detect_renames(
     deleted_files: dict[str, str],  # relpath -> checksum
     new_files: dict[str, Path],  # relpath -> full path
@@ -34,18 +49,15 @@ def detect_renames(
     """
     candidates = []
 
-    # Build checksum map for new files
-    new_checksums = {}
-    for relpath, full_path in new_files.items():
-        try:
-            checksum = compute_checksum(full_path)
-            new_checksums[relpath] = checksum
-        except OSError:
-            continue
-
-    # Find matches
+    # Find matches. Each deleted file's checksum records its algorithm, which
+    # may not be the one in use now, so match on checksums made with it.
+    new_checksums: dict[str, dict[str, str]] = {}  # algorithm -> relpath -> checksum
     for deleted_path, deleted_checksum in deleted_files.items():
-        for new_path, new_checksum in new_checksums.items():
+        algorithm = deleted_checksum.partition(":")[0]
+        if algorithm not in new_checksums:
+            new_checksums[algorithm] = _checksum_files(new_files, algorithm)
+
+        for new_path, new_checksum in new_checksums[algorithm].items():
             if deleted_checksum == new_checksum:
                 # Exact match
                 candidate = RenameCandidate(
@@ -1,8 +1,25 @@
 """Special file handling for agentic-sync."""
 
 import json
+import math
 import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
+
+from .files import is_settled
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
+try:
+    import pyjson5
+except ImportError:
+    # pyjson5 is optional - fall back to stripping comments with regexes
+    pyjson5 = None
 
 # Pattern to strip single-line (//) and multi-line (/* */) comments from JSONC,
 # while preserving strings that contain comment-like sequences.
@@ -13,47 +30,155 @@ _JSONC_COMMENT_RE = re.compile(
     r"|/\*[\s\S]*?\*/",  # multi-line comment
 )
 
-# Trailing commas before closing } or ]
-_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+# Trailing commas before closing } or ]. Only the comma is matched, so
+# removing it needs no group substitution.
+_TRAILING_COMMA_RE = re.compile(r",(?=\s*[}\]])")
+
+# Integer literals long enough that they may not fit in 64 bits, which orjson
+# would parse as floats. Matches inside strings only cost a slower parse.
+_LONG_INT_RE = re.compile(r"\d{19,}")
+_LONG_INT_BYTES_RE = re.compile(rb"\d{19,}")
+
+# Extracted data per (file, include keys), stored with the (mtime_ns, size)
+# it was extracted at. A file is compared during planning, diffed for the
+# summary and merged during the sync, so this saves re-parsing it each time.
+_EXTRACT_CACHE: dict[tuple[Path, tuple[str, ...]], tuple[int, int, dict]] = {}
 
 
 def _parse_jsonc(text: str) -> dict:
     """Parse JSONC (JSON with Comments) text into a dict.
 
-    Strips // and /* */ comments and trailing commas before delegating to
-    the stdlib json parser. Safe to call on plain JSON too.
+    Uses pyjson5 when it is installed, which handles comments and trailing
+    commas while tokenising. Otherwise strips // and /* */ comments and
+    trailing commas before delegating to the JSON parser. Safe to call on
+    plain JSON too.
+
+    Raises:
+        json.JSONDecodeError: If the text can't be parsed
     """
-    stripped = _JSONC_COMMENT_RE.sub(
-        lambda m: m.group(0) if m.group(0)[0] in ('"', "'") else "", text
-    )
-    stripped = _TRAILING_COMMA_RE.sub(r"\1", stripped)
-    return json.loads(stripped)
+    if pyjson5 is not None:
+        try:
+            return pyjson5.loads(text)
+        except pyjson5.Json5DecoderException as e:
+            # Keep callers' JSON error handling working
+            raise json.JSONDecodeError(str(e), text, 0) from e
+
+    # The comment pass has to visit every string to skip it, so only run it
+    # when the text could contain a comment at all
+    if "//" in text or "/*" in text:
+        stripped = _JSONC_COMMENT_RE.sub(
+            lambda m: m.group(0) if m.group(0)[0] in ('"', "'") else "", text
+        )
+    else:
+        # Most JSONC files are plain JSON, so try parsing as-is before
+        # scanning for trailing commas. This also keeps ",}" inside strings
+        # intact, which the trailing comma pass can't tell apart.
+        try:
+            return _loads(text)
+        except json.JSONDecodeError:
+            stripped = text
+    stripped = _TRAILING_COMMA_RE.sub("", stripped)
+    return _loads(stripped)
+
+
+def _loads(content: str | bytes) -> Any:
+    """Parse JSON text, using orjson when it is installed.
+
+    orjson parses integers wider than 64 bits as floats and rejects NaN,
+    Infinity and lone surrogates, which the json module accepts. Documents
+    that may contain long integers, or that orjson rejects, are parsed with
+    the json module so the data is the same whether or not orjson is
+    available.
+    """
+    if orjson is not None:
+        long_int_re = _LONG_INT_BYTES_RE if isinstance(content, bytes) else _LONG_INT_RE
+        if long_int_re.search(content) is None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Retry with the json module, which also raises its own error
+                pass
+    return json.loads(content)
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """Check whether parsed JSON data contains NaN or Infinity."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    if isinstance(data, list):
+        return any(_has_non_finite_float(item) for item in data)
+    return False
+
+
+def _dumps(data: Any) -> str:
+    """Serialise data as 2-space indented JSON, using orjson when it is installed.
+
+    Non-ASCII characters are written as-is on both paths, so the output is
+    the same whether or not orjson is available. orjson writes NaN and
+    Infinity as null and rejects integers wider than 64 bits and lone
+    surrogates, so that data is serialised with the json module instead.
+    """
+    if orjson is not None and not _has_non_finite_float(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
 
 def _load_json_or_jsonc(filepath: Path) -> dict:
     """Read and parse a JSON or JSONC file."""
-    with open(filepath) as f:
-        text = f.read()
+    content = filepath.read_bytes()
     if filepath.suffix == ".jsonc":
-        return _parse_jsonc(text)
-    return json.loads(text)
+        return _parse_jsonc(content.decode("utf-8"))
+    return _loads(content)
+
+
+# Marks an include path's terminal node in a path trie
+_LEAF: Any = object()
 
 
-def _filter_dict_by_paths(data: dict, include_paths: set[str], traversal_paths: set[str],
-                          prefix: str = "") -> dict:
-    """Recursively filter *data* to only include keys matching *include_paths*,
-    preserving the original key ordering at every nesting level.
+@lru_cache(maxsize=128)
+def _build_path_trie(include_keys: tuple[str, ...]) -> dict:
+    """Build a trie of dotted include paths.
 
-    *traversal_paths* contains ancestor prefixes that need to be traversed
-    (e.g. ``"provider"`` for include path ``"provider.llama_cpp.npm"``).
+    Each node maps a key to either a child node or ``_LEAF`` when the path
+    ending at that key is included in full. A path that is an ancestor of
+    another wins, since it includes everything beneath it.
+
+    Tries are cached per include list, since the same configured keys are
+    used for every sync, so callers must not mutate the result.
+    """
+    trie: dict = {}
+    for path in include_keys:
+        node = trie
+        *parents, last = path.split(".")
+        for part in parents:
+            child = node.setdefault(part, {})
+            if child is _LEAF:
+                break
+            node = child
+        else:
+            node[last] = _LEAF
+    return trie
+
+
+def _filter_dict_by_paths(data: dict, trie: dict) -> dict:
+    """Recursively filter *data* to only include keys matching the paths in
+    *trie*, preserving the original key ordering at every nesting level.
+
+    *trie* is built by :func:`_build_path_trie`, so each level only needs a
+    single lookup per key rather than rebuilding and hashing dotted paths.
     """
     result: dict = {}
     for key, value in data.items():
-        full_path = f"{prefix}.{key}" if prefix else key
-        if full_path in include_paths:
+        sub = trie.get(key)
+        if sub is _LEAF:
             result[key] = value
-        elif full_path in traversal_paths and isinstance(value, dict):
-            filtered = _filter_dict_by_paths(value, include_paths, traversal_paths, full_path)
+        elif sub is not None and isinstance(value, dict):
+            filtered = _filter_dict_by_paths(value, sub)
             if filtered:
                 result[key] = filtered
     return result
@@ -79,75 +204,79 @@ def extract_json_keys(
     Returns:
         JSON string with only included keys
     """
-    try:
-        data = _load_json_or_jsonc(source_file)
+    return _dumps(extract_json_data(source_file, include_keys))
 
-        include_paths, traversal_paths = _compute_traversal_paths(include_keys)
-        filtered_data = _filter_dict_by_paths(data, include_paths, traversal_paths)
 
-        return json.dumps(filtered_data, indent=2)
+def extract_json_data(source_file: Path, include_keys: list[str]) -> dict:
+    """
+    Extract specific keys from a JSON/JSONC file as parsed data.
 
+    Like :func:`extract_json_keys`, without serialising the result, for
+    callers that only compare or merge it.
+
+    Args:
+        source_file: Path to source JSON/JSONC file
+        include_keys: Keys or dotted paths to include
+
+    Returns:
+        Dict with only included keys, in source order. Results are cached
+        while the file is unchanged, so callers must not mutate it.
+
+    Raises:
+        ValueError: If the file can't be read or parsed
+    """
+    keys = tuple(include_keys)
+    try:
+        stat = source_file.stat()
+        cached = _EXTRACT_CACHE.get((source_file, keys))
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        data = _load_json_or_jsonc(source_file)
     except (json.JSONDecodeError, OSError) as e:
         raise ValueError(f"Failed to extract keys from {source_file}: {e}")
 
+    extracted = _filter_dict_by_paths(data, _build_path_trie(keys))
+    if is_settled(stat):
+        _EXTRACT_CACHE[(source_file, keys)] = (stat.st_mtime_ns, stat.st_size, extracted)
+    return extracted
+
 
-def _merge_dicts_source_order(
-    source: dict,
-    dest: dict,
-    include_paths: set[str] | None = None,
-    traversal_paths: set[str] | None = None,
-    prefix: str = "",
-) -> dict:
+def _merge_dicts_source_order(source: dict, dest: dict, trie: dict | None = None) -> dict:
     """Merge *dest* into *source*, with source providing both ordering and values.
 
     Source keys come first in source order.  Dest-only keys are appended
     in their original dest order.
 
-    When *include_paths* and *traversal_paths* are provided, the merge
-    distinguishes between:
+    When *trie* (built by :func:`_build_path_trie` from the include keys) is
+    provided, the merge distinguishes between:
     - **include paths**: the source value replaces the dest value entirely
       (no recursive merge), because the source is authoritative for these.
-    - **traversal paths**: containers that are recursed into so that
-      dest-only sibling keys are preserved.
-    - **other paths**: recursed into by default for backward compatibility.
+    - **other paths**: containers are recursed into so that dest-only
+      sibling keys are preserved.
     """
+    if trie is None:
+        trie = {}
     result: dict = {}
     # First pass: source keys in source order (source values win)
-    for key in source:
-        full_path = f"{prefix}.{key}" if prefix else key
-        if key in dest and isinstance(source[key], dict) and isinstance(dest[key], dict):
+    for key, value in source.items():
+        if key in dest and isinstance(value, dict) and isinstance(dest[key], dict):
+            sub = trie.get(key)
             # If this is an explicit include path, replace entirely --
             # the source is authoritative for these keys.
-            if include_paths and full_path in include_paths:
-                result[key] = source[key]
+            if sub is _LEAF:
+                result[key] = value
             else:
-                result[key] = _merge_dicts_source_order(
-                    source[key], dest[key], include_paths, traversal_paths, full_path
-                )
+                result[key] = _merge_dicts_source_order(value, dest[key], sub)
         else:
-            result[key] = source[key]
+            result[key] = value
     # Second pass: dest-only keys appended in dest order, but skip
     # include keys that the source doesn't have (source is authoritative).
-    for key in dest:
-        if key not in result:
-            full_path = f"{prefix}.{key}" if prefix else key
-            if include_paths and full_path in include_paths:
-                continue
-            result[key] = dest[key]
+    for key, value in dest.items():
+        if key not in result and trie.get(key) is not _LEAF:
+            result[key] = value
     return result
 
 
-def _compute_traversal_paths(include_keys: list[str]) -> tuple[set[str], set[str]]:
-    """Compute include paths and traversal paths from a list of include keys."""
-    include_paths = set(include_keys)
-    traversal_paths: set[str] = set()
-    for path in include_paths:
-        parts = path.split(".")
-        for i in range(len(parts) - 1):
-            traversal_paths.add(".".join(parts[: i + 1]))
-    return include_paths, traversal_paths
-
-
 def merge_json_keys(
     dest_file: Path, extracted_content: str, include_keys: list[str] | None = None
 ) -> None:
@@ -167,17 +296,27 @@ def merge_json_keys(
             which keys should replace vs merge recursively.
     """
     try:
-        extracted_data = json.loads(extracted_content)
+        extracted_data = _loads(extracted_content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to merge keys into {dest_file}: {e}")
+
+    _merge_json_data(dest_file, extracted_data, include_keys)
+
 
+def _merge_json_data(dest_file: Path, extracted_data: dict, include_keys: list[str] | None) -> None:
+    """Merge already-parsed extracted keys into *dest_file*.
+
+    See :func:`merge_json_keys`, which parses its JSON string argument and
+    then delegates here.
+
+    Raises:
+        ValueError: If the destination can't be read, parsed or written
+    """
+    try:
         if dest_file.exists():
             dest_data = _load_json_or_jsonc(dest_file)
-            if include_keys:
-                inc_paths, trav_paths = _compute_traversal_paths(include_keys)
-            else:
-                inc_paths, trav_paths = None, None
-            merged = _merge_dicts_source_order(
-                extracted_data, dest_data, inc_paths, trav_paths
-            )
+            trie = _build_path_trie(tuple(include_keys)) if include_keys else None
+            merged = _merge_dicts_source_order(extracted_data, dest_data, trie)
         else:
             # No destination yet -- use extracted data directly so source
             # key ordering is preserved exactly.
@@ -185,8 +324,8 @@ def merge_json_keys(
 
         # Write back to destination
         dest_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(dest_file, "w") as f:
-            json.dump(merged, f, indent=2)
+        with open(dest_file, "w", encoding="utf-8") as f:
+            f.write(_dumps(merged))
             f.write("\n")  # Add trailing newline
 
     except (json.JSONDecodeError, OSError) as e:
@@ -217,12 +356,13 @@ def process_special_file(
         if not include_keys:
             raise ValueError("include_keys required for extract_keys mode")
 
-        # Extract keys from source
-        extracted_content = extract_json_keys(source_file, include_keys, exclude_patterns)
+        # Extract keys from source, keeping the parsed data rather than
+        # round-tripping it through a JSON string
+        extracted_data = extract_json_data(source_file, include_keys)
 
         # Merge into destination, passing include_keys so the merge
         # knows which keys to replace entirely vs merge recursively.
-        merge_json_keys(dest_file, extracted_content, include_keys)
+        _merge_json_data(dest_file, extracted_data, include_keys)
 
         return True
     else:
@@ -1,12 +1,38 @@
 """State tracking for agentic-sync."""
 
-import json
-from dataclasses import asdict, dataclass, field
+import hashlib
+import os
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Self
 
-from .files import FileMetadata
-from .utils import get_machine_id
+from .files import FileMetadata, is_settled
+from .utils import dump_json_file, dumps_json, get_machine_id, load_json_file
+
+
+def _datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime (naive means local time) to integer Unix nanoseconds."""
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def _content_digest(data: dict) -> bytes:
+    """Hash serialised state data, ignoring the last_sync timestamp."""
+    content = {key: value for key, value in data.items() if key != "last_sync"}
+    return hashlib.blake2b(dumps_json(content), digest_size=16).digest()
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(value: datetime) -> tuple[str, int]:
+    """Return *value* as an ISO string and Unix nanoseconds.
+
+    Cached so a batch of updates sharing one sync time formats it once.
+    """
+    return value.isoformat(), _datetime_to_ns(value)
 
 
 @dataclass
@@ -15,6 +41,53 @@ class FileState:
 
     checksum: str
     last_synced: str  # ISO format datetime
+    # last_synced as Unix nanoseconds, so finding the most recent state
+    # compares ints; derived from last_synced when not given
+    last_synced_ns: int = 0
+    # Size and mtime of each side just after the last sync, so planning can
+    # skip comparing contents of files untouched since; 0 mtimes mean unknown,
+    # including files modified too recently for their stats to be trusted
+    source_size: int = 0
+    source_mtime_ns: int = 0
+    target_size: int = 0
+    target_mtime_ns: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.last_synced_ns:
+            self.last_synced_ns = _datetime_to_ns(datetime.fromisoformat(self.last_synced))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """Create from dictionary, ignoring fields from older versions."""
+        return cls(
+            checksum=data["checksum"],
+            last_synced=data["last_synced"],
+            last_synced_ns=data.get("last_synced_ns", 0),
+            source_size=data.get("source_size", 0),
+            source_mtime_ns=data.get("source_mtime_ns", 0),
+            target_size=data.get("target_size", 0),
+            target_mtime_ns=data.get("target_mtime_ns", 0),
+        )
+
+    def matches_stats(self, source_stat: os.stat_result, target_stat: os.stat_result) -> bool:
+        """
+        Check whether both sides are unchanged since they were last synced.
+
+        Args:
+            source_stat: Current stat of the source file
+            target_stat: Current stat of the target file
+
+        Returns:
+            True if sizes and mtimes recorded at the last sync match
+        """
+        return (
+            self.source_mtime_ns != 0
+            and self.target_mtime_ns != 0
+            and source_stat.st_mtime_ns == self.source_mtime_ns
+            and target_stat.st_mtime_ns == self.target_mtime_ns
+            and source_stat.st_size == self.source_size
+            and target_stat.st_size == self.target_size
+        )
 
 
 @dataclass
@@ -38,50 +111,111 @@ class SyncState:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialisation."""
-        return asdict(self)
+        # Built explicitly rather than with asdict, which deep-copies every
+        # value through field reflection
+        return {
+            "machine_id": self.machine_id,
+            "hostname": self.hostname,
+            "last_sync": self.last_sync,
+            "files": {
+                path: {
+                    "checksum": fs.checksum,
+                    "last_synced": fs.last_synced,
+                    "last_synced_ns": fs.last_synced_ns,
+                    "source_size": fs.source_size,
+                    "source_mtime_ns": fs.source_mtime_ns,
+                    "target_size": fs.target_size,
+                    "target_mtime_ns": fs.target_mtime_ns,
+                }
+                for path, fs in self.files.items()
+            },
+            "deletions": {
+                path: {"deleted_at": d.deleted_at, "checksum": d.checksum, "decision": d.decision}
+                for path, d in self.deletions.items()
+            },
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "SyncState":
         """Create from dictionary."""
-        # Handle backwards compatibility - filter out old fields (size, mtime)
+        # A batch of files synced together shares one timestamp, so share
+        # one string object per distinct timestamp rather than one per file
+        timestamps: dict[str, str] = {}
+
+        # Handle backwards compatibility - FileState.from_dict ignores old
+        # fields, and derives last_synced_ns when it is missing
         files = {}
         for path, file_data in data.get("files", {}).items():
-            # Only keep fields that FileState accepts
-            filtered_data = {
-                "checksum": file_data["checksum"],
-                "last_synced": file_data["last_synced"],
-            }
-            files[path] = FileState(**filtered_data)
+            file_state = FileState.from_dict(file_data)
+            file_state.last_synced = timestamps.setdefault(file_state.last_synced, file_state.last_synced)
+            files[path] = file_state
 
         deletions = {
-            path: DeletionRecord(**del_data) for path, del_data in data.get("deletions", {}).items()
+            path: DeletionRecord(
+                deleted_at=timestamps.setdefault(del_data["deleted_at"], del_data["deleted_at"]),
+                checksum=del_data["checksum"],
+                decision=sys.intern(del_data["decision"]),
+            )
+            for path, del_data in data.get("deletions", {}).items()
         }
 
         return cls(
-            machine_id=data["machine_id"],
-            hostname=data["hostname"],
+            machine_id=sys.intern(data["machine_id"]),
+            hostname=sys.intern(data["hostname"]),
             last_sync=data["last_sync"],
             files=files,
             deletions=deletions,
         )
 
-    def update_file(self, metadata: FileMetadata, tool_name: str) -> None:
+    def update_file(
+        self,
+        metadata: FileMetadata,
+        tool_name: str,
+        now: datetime | None = None,
+        source_stat: os.stat_result | None = None,
+        target_stat: os.stat_result | None = None,
+    ) -> None:
         """
         Update file state.
 
         Args:
             metadata: File metadata
             tool_name: Tool name for path prefix
+            now: Sync time, shared across a batch of updates (current time
+                if None)
+            source_stat: Stat of the source file after syncing, if known
+            target_stat: Stat of the target file after syncing, if known.
+                Both stats are only recorded once both files have settled,
+                since an edit within the same mtime tick wouldn't change them.
         """
         # Store relative path with tool prefix
         relative_path = f"{tool_name}/{metadata.relative_path}"
 
-        self.files[relative_path] = FileState(
+        last_synced, last_synced_ns = _format_timestamp(now or datetime.now())
+        file_state = FileState(
             checksum=metadata.checksum,
-            last_synced=datetime.now().isoformat(),
+            last_synced=last_synced,
+            last_synced_ns=last_synced_ns,
         )
-
-    def record_deletion(self, relative_path: str, checksum: str, decision: str = "pending") -> None:
+        if (
+            source_stat is not None
+            and target_stat is not None
+            and is_settled(source_stat)
+            and is_settled(target_stat)
+        ):
+            file_state.source_size = source_stat.st_size
+            file_state.source_mtime_ns = source_stat.st_mtime_ns
+            file_state.target_size = target_stat.st_size
+            file_state.target_mtime_ns = target_stat.st_mtime_ns
+        self.files[relative_path] = file_state
+
+    def record_deletion(
+        self,
+        relative_path: str,
+        checksum: str,
+        decision: str = "pending",
+        now: datetime | None = None,
+    ) -> None:
         """
         Record a file deletion.
 
@@ -89,9 +223,12 @@ class SyncState:
             relative_path: Relative path to deleted file
             checksum: Checksum of deleted file
             decision: User decision ("confirmed", "skipped", "pending")
+            now: Deletion time, shared across a batch (current time if None)
         """
         self.deletions[relative_path] = DeletionRecord(
-            deleted_at=datetime.now().isoformat(), checksum=checksum, decision=decision
+            deleted_at=_format_timestamp(now or datetime.now())[0],
+            checksum=checksum,
+            decision=decision,
         )
 
     def remove_file(self, relative_path: str) -> None:
@@ -129,6 +266,59 @@ class SyncState:
         return relative_path in self.deletions
 
 
+# Parsed state files by path, with the (mtime_ns, size) they were parsed at
+_STATE_CACHE: dict[Path, tuple[int, int, SyncState]] = {}
+
+
+def _cached_state(state_file: Path, stat: os.stat_result) -> SyncState | None:
+    """Return the cached state for *state_file* if the file is unchanged."""
+    cached = _STATE_CACHE.get(state_file)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    return None
+
+
+def _load_state_file(state_file: Path) -> tuple[os.stat_result, SyncState] | None:
+    """Load a state file, from the cache if it is unchanged.
+
+    Returns:
+        Tuple of the file's stat result and its state, or None if the file
+        can't be read or parsed
+    """
+    try:
+        stat = state_file.stat()
+        state = _cached_state(state_file, stat)
+        if state is None:
+            state = SyncState.from_dict(load_json_file(state_file))
+        return stat, state
+    except (ValueError, KeyError, OSError):
+        # Skip invalid state files, including unparseable JSON and
+        # timestamps
+        return None
+
+
+def _peek_file_state(state_file: Path, relative_path: str) -> tuple[str, FileState | None]:
+    """Read one file's state from a state file without building the whole SyncState.
+
+    Args:
+        state_file: Path to a machine's state file
+        relative_path: Relative path to look up
+
+    Returns:
+        Tuple of the state file's machine_id and the FileState for
+        *relative_path*, or None if it has no entry
+
+    Raises:
+        ValueError: If the file isn't valid JSON or has a bad timestamp
+        KeyError: If required fields are missing
+    """
+    data = load_json_file(state_file)
+    file_data = data.get("files", {}).get(relative_path)
+    if file_data is None:
+        return data["machine_id"], None
+    return data["machine_id"], FileState.from_dict(file_data)
+
+
 class StateManager:
     """Manages sync state files."""
 
@@ -143,6 +333,9 @@ class StateManager:
         self.state_dir = target_path / ".sync-state"
         self.machine_id = get_machine_id()
         self.hostname = self.machine_id.split("-")[0]
+        # Digest of the state content (everything but last_sync) as last
+        # loaded or saved, so unchanged state isn't rewritten
+        self._saved_digest: bytes | None = None
 
     def load_state(self) -> SyncState:
         """
@@ -154,9 +347,10 @@ class StateManager:
         state_file = self._get_state_file_path()
 
         if state_file.exists():
-            with open(state_file) as f:
-                data = json.load(f)
-                return SyncState.from_dict(data)
+            data = load_json_file(state_file)
+            state = SyncState.from_dict(data)
+            self._saved_digest = _content_digest(data)
+            return state
         else:
             # Create new state
             return SyncState(
@@ -169,29 +363,45 @@ class StateManager:
         """
         Save state for current machine.
 
+        Nothing is written if the files and deletions are unchanged since
+        the state was loaded or last saved, which also leaves last_sync as
+        it was rather than churning the shared state file.
+
         Args:
             state: State to save
         """
+        state_file = self._get_state_file_path()
+        data = state.to_dict()
+        digest = _content_digest(data)
+        if digest == self._saved_digest and state_file.exists():
+            return
+
         # Ensure state directory exists
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
         # Update timestamp
-        state.last_sync = datetime.now().isoformat()
-
-        state_file = self._get_state_file_path()
+        state.last_sync = data["last_sync"] = datetime.now().isoformat()
 
+        # State files are shared with other machines (and other versions of
+        # this tool) through the target, so they stay plain JSON rather than
+        # a binary format that needs an extra dependency to read.
         # Atomic write using temporary file
         temp_file = state_file.with_suffix(".tmp")
-        with open(temp_file, "w") as f:
-            json.dump(state.to_dict(), f, indent=2)
+        dump_json_file(temp_file, data, fsync=True)
 
-        # Rename to final location (atomic on POSIX)
-        temp_file.replace(state_file)
+        # Rename to final location (atomic on POSIX, and durable since the
+        # data was synced first)
+        os.replace(temp_file, state_file)
+        self._saved_digest = digest
 
     def load_all_states(self) -> dict[str, SyncState]:
         """
         Load states from all machines.
 
+        State files that haven't changed since they were last parsed are
+        served from a cache, so the returned states are shared and must be
+        treated as read-only.
+
         Returns:
             Dictionary mapping machine_id to SyncState
         """
@@ -200,20 +410,32 @@ class StateManager:
         if not self.state_dir.exists():
             return states
 
-        for state_file in self.state_dir.glob("*.json"):
-            try:
-                with open(state_file) as f:
-                    data = json.load(f)
-                    state = SyncState.from_dict(data)
-                    states[state.machine_id] = state
-            except (json.JSONDecodeError, KeyError):
-                # Skip invalid state files
+        state_files = list(self.state_dir.glob("*.json"))
+
+        # Reads are I/O-bound and overlap well on slow or network storage;
+        # results keep glob order and the cache is updated here rather than
+        # from worker threads
+        if len(state_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(state_files))) as executor:
+                results = list(executor.map(_load_state_file, state_files))
+        else:
+            results = [_load_state_file(state_file) for state_file in state_files]
+
+        for state_file, result in zip(state_files, results, strict=True):
+            if result is None:
                 continue
+            stat, state = result
+            if is_settled(stat):
+                _STATE_CACHE[state_file] = (stat.st_mtime_ns, stat.st_size, state)
+            states[state.machine_id] = state
 
         return states
 
     def get_most_recent_state_for_file(
-        self, relative_path: str, exclude_current: bool = False
+        self,
+        relative_path: str,
+        exclude_current: bool = False,
+        all_states: dict[str, SyncState] | None = None,
     ) -> FileState | None:
         """
         Get most recent state for a file across all machines.
@@ -221,24 +443,86 @@ class StateManager:
         Args:
             relative_path: Relative path to file
             exclude_current: Exclude current machine from search
+            all_states: States from load_all_states(), to reuse across
+                lookups (loaded if None)
 
         Returns:
             Most recent FileState or None
         """
-        all_states = self.load_all_states()
+        if all_states is not None:
+            return self.get_most_recent_states({relative_path}, exclude_current, all_states).get(
+                relative_path
+            )
+
+        # Without preloaded states, only build the one entry asked for from
+        # each state file that isn't already cached
         most_recent = None
-        most_recent_time = None
+        if not self.state_dir.exists():
+            return None
+
+        for state_file in self.state_dir.glob("*.json"):
+            try:
+                state = _cached_state(state_file, state_file.stat())
+                if state is not None:
+                    machine_id, file_state = state.machine_id, state.files.get(relative_path)
+                else:
+                    machine_id, file_state = _peek_file_state(state_file, relative_path)
+            except (ValueError, KeyError, OSError):
+                continue
+
+            if exclude_current and machine_id == self.machine_id:
+                continue
+            if file_state and (
+                most_recent is None or file_state.last_synced_ns > most_recent.last_synced_ns
+            ):
+                most_recent = file_state
+
+        return most_recent
+
+    def get_most_recent_states(
+        self,
+        relative_paths: Iterable[str],
+        exclude_current: bool = False,
+        all_states: dict[str, SyncState] | None = None,
+    ) -> dict[str, FileState]:
+        """
+        Get the most recent state for each of several files across all machines.
+
+        States are loaded once for the whole batch, and timestamps are
+        compared as integer nanoseconds.
+
+        Args:
+            relative_paths: Relative paths to files
+            exclude_current: Exclude current machine from search
+            all_states: States from load_all_states(), to reuse across
+                lookups (loaded if None)
+
+        Returns:
+            Dictionary mapping each path that has state to its most recent
+            FileState
+        """
+        if all_states is None:
+            all_states = self.load_all_states()
+        paths = relative_paths if isinstance(relative_paths, (set, frozenset)) else set(relative_paths)
+
+        most_recent: dict[str, FileState] = {}
 
         for machine_id, state in all_states.items():
             if exclude_current and machine_id == self.machine_id:
                 continue
 
-            file_state = state.get_file_state(relative_path)
-            if file_state:
-                synced_time = datetime.fromisoformat(file_state.last_synced)
-                if most_recent_time is None or synced_time > most_recent_time:
-                    most_recent = file_state
-                    most_recent_time = synced_time
+            # Walk whichever side is smaller
+            if len(paths) <= len(state.files):
+                candidates = ((path, state.files.get(path)) for path in paths)
+            else:
+                candidates = ((path, fs) for path, fs in state.files.items() if path in paths)
+
+            for path, file_state in candidates:
+                if not file_state:
+                    continue
+                best = most_recent.get(path)
+                if best is None or file_state.last_synced_ns > best.last_synced_ns:
+                    most_recent[path] = file_state
 
         return most_recent
 
@@ -1,16 +1,30 @@
 """Core sync logic for agentic-sync."""
 
-import json
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
+from functools import partial
 from pathlib import Path
 
 from .backup import BackupManager
 from .config import Config, ToolConfig
-from .diff import count_diff_lines, count_diff_lines_from_strings, generate_diff_between_strings, generate_unified_diff
-from .files import FileMetadata, files_are_identical, safe_copy_file
-from .special_files import extract_json_keys, process_special_file
-from .state import StateManager, SyncState
+from .diff import (
+    DiffStats,
+    count_diff_lines,
+    count_diff_lines_from_strings,
+    generate_diff_between_strings,
+    generate_unified_diff,
+)
+from .files import (
+    FileMetadata,
+    file_matches_checksum,
+    files_are_identical,
+    safe_copy_file,
+)
+from .special_files import extract_json_data, extract_json_keys, process_special_file
+from .state import FileState, StateManager, SyncState
 from .ui import (
     ChangeType,
     FileChange,
@@ -20,7 +34,31 @@ from .ui import (
     show_summary,
     show_warning,
 )
-from .utils import find_files
+from .utils import find_files_with_stats
+
+_MTIME_DISPLAY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _format_mtime(mtime: float) -> str:
+    """Format a modification time for display in prompts."""
+    return f"modified {datetime.fromtimestamp(mtime):{_MTIME_DISPLAY_FORMAT}}"
+
+
+def _relpath(path: Path, root: Path) -> str:
+    """
+    Get a planned path relative to its root.
+
+    Plan paths always live under the root they were found in, so this strips
+    the root's string prefix instead of going through ``Path.relative_to``.
+
+    Args:
+        path: Path under root
+        root: Root directory
+
+    Returns:
+        Relative path string
+    """
+    return str(path).removeprefix(os.path.join(str(root), ""))
 
 
 class SyncDirection(Enum):
@@ -43,6 +81,17 @@ class SyncPlan:
     reverse_suggestions: list[tuple[Path, Path]]  # (source, target) where target is newer
     orphaned_files: list[Path]  # Files in target with no source and no state
     confirmed_deletions: set[Path]  # Files already confirmed for deletion (skip re-prompting)
+    stat_cache: dict[Path, os.stat_result] = field(default_factory=dict)
+    # Diffs already generated for the summary, keyed by (old, new), for reuse
+    # when they're displayed
+    diffs: dict[tuple[Path, Path], list[str]] = field(default_factory=dict)
+
+    def stat(self, path: Path) -> os.stat_result:
+        """Stat a file, at most once per plan."""
+        result = self.stat_cache.get(path)
+        if result is None:
+            result = self.stat_cache[path] = path.stat()
+        return result
 
 
 class SyncEngine:
@@ -87,6 +136,49 @@ class SyncEngine:
         except Exception:
             return None
 
+    def _diff_files(self, tool: ToolConfig, old: Path, new: Path) -> tuple[list[str], DiffStats]:
+        """Diff two files, limited to the synced keys for special_handling files.
+
+        Diffing only the extracted keys avoids exposing unsynced content
+        (e.g. secrets).
+        """
+        old_extracted = self._extract_special_handling_content(tool, old)
+        new_extracted = self._extract_special_handling_content(tool, new)
+        if old_extracted is not None and new_extracted is not None:
+            return generate_diff_between_strings(old_extracted, new_extracted, str(old), str(new))
+        return generate_unified_diff(old, new)
+
+    def _summary_diff_stats(self, plan: SyncPlan, old: Path, new: Path) -> DiffStats:
+        """Get diff stats for the summary of a modified file.
+
+        When diffs will be auto-displayed the full diff is generated now and
+        kept on the plan, so the file isn't diffed twice. Otherwise only the
+        changed lines are counted.
+        """
+        if self.config.settings.show_diff_threshold > 0:
+            diff_lines, stats = self._diff_files(plan.tool, old, new)
+            plan.diffs[(old, new)] = diff_lines
+            return stats
+
+        old_extracted = self._extract_special_handling_content(plan.tool, old)
+        new_extracted = self._extract_special_handling_content(plan.tool, new)
+        if old_extracted is not None and new_extracted is not None:
+            return count_diff_lines_from_strings(old_extracted, new_extracted, str(old), str(new))
+        return count_diff_lines(old, new)
+
+    def _unchanged_since_sync(
+        self, plan: SyncPlan, source_path: Path, target_path: Path, file_state: FileState | None
+    ) -> bool:
+        """Check whether neither side has been touched since the last sync.
+
+        Compares the current size and mtime of both files against those
+        recorded when they were last synced, so unchanged files don't need
+        to be read at all.
+        """
+        return file_state is not None and file_state.matches_stats(
+            plan.stat(source_path), plan.stat(target_path)
+        )
+
     def _files_are_identical_with_special_handling(
         self, tool: ToolConfig, source_path: Path, target_path: Path
     ) -> bool:
@@ -103,16 +195,12 @@ class SyncEngine:
             handling = tool.special_handling[filename]
 
             # Extract the relevant parts from both files and compare the
-            # parsed dicts so key ordering differences are ignored.
+            # parsed dicts directly, so key ordering differences are ignored
+            # and nothing is serialised or hashed.
             try:
-                source_extracted = extract_json_keys(
-                    source_path, handling.include_keys, handling.exclude_patterns
+                return extract_json_data(source_path, handling.include_keys) == extract_json_data(
+                    target_path, handling.include_keys
                 )
-                target_extracted = extract_json_keys(
-                    target_path, handling.include_keys, handling.exclude_patterns
-                )
-
-                return json.loads(source_extracted) == json.loads(target_extracted)
             except Exception:
                 # If extraction fails, fall back to normal comparison
                 return files_are_identical(source_path, target_path)
@@ -247,15 +335,6 @@ class SyncEngine:
         # Build list of propagation-managed paths to exclude
         propagation_exclude = self._get_propagation_managed_paths(tool)
 
-        # Find files in source and target
-        source_files = find_files(
-            tool.source,
-            tool.include,
-            list(tool.exclude) + propagation_exclude,
-            self.config.settings.follow_symlinks,
-            self.config.settings.respect_gitignore,
-        )
-
         # If not following symlinks, find which source paths are symlinks
         # and exclude their target equivalents from scanning
         target_exclude = list(tool.exclude) + propagation_exclude
@@ -287,38 +366,86 @@ class SyncEngine:
                     f"Excluding symlinked paths from target scan: {', '.join(symlink_paths)}"
                 )
 
-        target_files = find_files(
-            tool.target,
-            tool.include,
-            target_exclude,  # Use extended exclude list
-            self.config.settings.follow_symlinks,
-            self.config.settings.respect_gitignore,
-        )
+        # Find files in source and target. The scans are independent, so run
+        # them side by side: on a cold cache each mostly waits on the disk.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_scan = executor.submit(
+                find_files_with_stats,
+                tool.source,
+                tool.include,
+                list(tool.exclude) + propagation_exclude,
+                self.config.settings.follow_symlinks,
+                self.config.settings.respect_gitignore,
+            )
+            target_scan = executor.submit(
+                find_files_with_stats,
+                tool.target,
+                tool.include,
+                target_exclude,  # Use extended exclude list
+                self.config.settings.follow_symlinks,
+                self.config.settings.respect_gitignore,
+            )
+            source_files = source_scan.result()
+            target_files = target_scan.result()
 
         # Debug: Show what was found
         show_info(f"Source: {tool.source} ({len(source_files)} files)")
         show_info(f"Target: {tool.target} ({len(target_files)} files)")
 
-        # Build path mappings
-        source_by_relpath = {str(f.relative_to(tool.source)): f for f in source_files}
-        target_by_relpath = {str(f.relative_to(tool.target)): f for f in target_files}
+        # The scan already statted every file, so planning can reuse those
+        plan.stat_cache.update(source_files)
+        plan.stat_cache.update(target_files)
+
+        # Build path mappings. Every file is below its root, so slicing off
+        # the root prefix gives the same result as relative_to.
+        source_prefix = len(os.path.join(str(tool.source), ""))
+        target_prefix = len(os.path.join(str(tool.target), ""))
+        source_by_relpath = {str(f)[source_prefix:]: f for f in source_files}
+        target_by_relpath = {str(f)[target_prefix:]: f for f in target_files}
+
+        # Sorted so the plan, and the summary shown from it, is stable
+        all_relpaths = sorted(source_by_relpath.keys() | target_by_relpath.keys())
+        file_states = {
+            relpath: state.get_file_state(f"{tool.name}/{relpath}") for relpath in all_relpaths
+        }
 
-        all_relpaths = set(source_by_relpath.keys()) | set(target_by_relpath.keys())
+        # Comparing files present on both sides reads (and may parse) both,
+        # which is I/O-bound and releases the GIL, so check them in parallel
+        # up front
+        in_both = [
+            relpath
+            for relpath in all_relpaths
+            if relpath in source_by_relpath and relpath in target_by_relpath
+        ]
+
+        def check_identical(relpath: str) -> bool:
+            source_path = source_by_relpath[relpath]
+            target_path = target_by_relpath[relpath]
+            return self._unchanged_since_sync(
+                plan, source_path, target_path, file_states[relpath]
+            ) or self._files_are_identical_with_special_handling(tool, source_path, target_path)
+
+        if len(in_both) > 1:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(in_both))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                identical = dict(zip(in_both, executor.map(check_identical, in_both), strict=True))
+        else:
+            identical = {relpath: check_identical(relpath) for relpath in in_both}
 
         for relpath in all_relpaths:
             source_path = source_by_relpath.get(relpath)
             target_path = target_by_relpath.get(relpath)
-            state_path = f"{tool.name}/{relpath}"
-
-            # Get state for this file
-            file_state = state.get_file_state(state_path)
+            file_state = file_states[relpath]
+            is_identical = identical.get(relpath, False)
 
             if direction == SyncDirection.PUSH:
-                self._plan_push(plan, source_path, target_path, file_state, relpath)
+                self._plan_push(plan, source_path, target_path, file_state, relpath, is_identical)
             elif direction == SyncDirection.PULL:
-                self._plan_pull(plan, source_path, target_path, file_state, relpath)
+                self._plan_pull(plan, source_path, target_path, file_state, relpath, is_identical)
             else:  # SYNC (bidirectional)
-                self._plan_bidirectional(plan, source_path, target_path, file_state, relpath)
+                self._plan_bidirectional(
+                    plan, source_path, target_path, file_state, relpath, is_identical
+                )
 
         return plan
 
@@ -329,6 +456,7 @@ class SyncEngine:
         target_path: Path | None,
         file_state,
         relpath: str,
+        identical: bool = False,
     ):
         """Plan push operation (source → target)."""
         if source_path and not target_path:
@@ -336,9 +464,7 @@ class SyncEngine:
             plan.files_to_copy.append((source_path, plan.tool.target / relpath))
         elif source_path and target_path:
             # File exists in both
-            if not self._files_are_identical_with_special_handling(
-                plan.tool, source_path, target_path
-            ):
+            if not identical:
                 # For files with special_handling (partial sync), mtime
                 # reflects the entire file including sections we don't sync.
                 # The target can appear "newer" due to edits in unsynced
@@ -349,8 +475,8 @@ class SyncEngine:
                     plan.files_to_copy.append((source_path, target_path))
                 else:
                     # Different content - check if target is newer
-                    source_mtime = source_path.stat().st_mtime
-                    target_mtime = target_path.stat().st_mtime
+                    source_mtime = plan.stat(source_path).st_mtime
+                    target_mtime = plan.stat(target_path).st_mtime
 
                     # If target is newer, suggest reverse sync instead of pushing
                     if target_mtime > source_mtime:
@@ -372,6 +498,7 @@ class SyncEngine:
         target_path: Path | None,
         file_state,
         relpath: str,
+        identical: bool = False,
     ):
         """Plan pull operation (target → source)."""
         if target_path and not source_path:
@@ -379,9 +506,7 @@ class SyncEngine:
             plan.files_to_copy.append((target_path, plan.tool.source / relpath))
         elif source_path and target_path:
             # File exists in both
-            if not self._files_are_identical_with_special_handling(
-                plan.tool, source_path, target_path
-            ):
+            if not identical:
                 # Different content - pull target to source
                 plan.files_to_copy.append((target_path, source_path))
         elif source_path and not target_path:
@@ -396,6 +521,7 @@ class SyncEngine:
         target_path: Path | None,
         file_state,
         relpath: str,
+        identical: bool = False,
     ):
         """Plan bidirectional sync with three-way merge."""
         # Three-way merge logic
@@ -417,20 +543,14 @@ class SyncEngine:
 
         elif source_path and target_path:
             # File exists in both
-            if not self._files_are_identical_with_special_handling(
-                plan.tool, source_path, target_path
-            ):
+            if not identical:
                 # Check if either changed since last sync
                 if file_state:
                     # Has state - can detect conflicts
-                    source_changed = (
-                        FileMetadata.from_file(source_path, plan.tool.source).checksum
-                        != file_state.checksum
-                    )
-                    target_changed = (
-                        FileMetadata.from_file(target_path, plan.tool.target).checksum
-                        != file_state.checksum
-                    )
+                    # Checksums are cached, so the source isn't hashed
+                    # again when its state is recorded after copying
+                    source_changed = not file_matches_checksum(source_path, file_state.checksum)
+                    target_changed = not file_matches_checksum(target_path, file_state.checksum)
 
                     if source_changed and not target_changed:
                         # Only source changed - push
@@ -469,30 +589,18 @@ class SyncEngine:
                 )
 
                 for source_path, target_path in plan.reverse_suggestions:
-                    relpath = str(source_path.relative_to(tool.source))
+                    relpath = _relpath(source_path, tool.source)
                     special_keys = self._get_special_handling_keys(tool, source_path.name)
 
-                    from datetime import datetime
-
-                    source_mtime = source_path.stat().st_mtime
-                    target_mtime = target_path.stat().st_mtime
-
-                    source_info = f"modified {datetime.fromtimestamp(source_mtime).strftime('%Y-%m-%d %H:%M:%S')}"
-                    target_info = f"modified {datetime.fromtimestamp(target_mtime).strftime('%Y-%m-%d %H:%M:%S')}"
+                    source_info = _format_mtime(plan.stat(source_path).st_mtime)
+                    target_info = _format_mtime(plan.stat(target_path).st_mtime)
 
                     choice = show_reverse_sync_prompt(relpath, source_info, target_info, special_keys)
 
                     if choice == "diff":
-                        # For special_handling files, diff only extracted keys
-                        # to avoid exposing unsynced content (e.g. secrets).
-                        src_ext = self._extract_special_handling_content(tool, source_path)
-                        tgt_ext = self._extract_special_handling_content(tool, target_path)
-                        if src_ext is not None and tgt_ext is not None:
-                            diff_lines, _ = generate_diff_between_strings(
-                                tgt_ext, src_ext, str(target_path), str(source_path)
-                            )
-                        else:
-                            diff_lines, _ = generate_unified_diff(target_path, source_path)
+                        diff_lines = plan.diffs.get((target_path, source_path))
+                        if diff_lines is None:
+                            diff_lines, _ = self._diff_files(tool, target_path, source_path)
                         from .ui import show_diff
 
                         show_diff(relpath, diff_lines, "target", "source")
@@ -516,15 +624,17 @@ class SyncEngine:
                 show_warning(f"Found {len(plan.conflicts)} conflict(s) - need resolution")
 
                 for source_path, target_path in plan.conflicts:
-                    relpath = str(source_path.relative_to(tool.source))
+                    relpath = _relpath(source_path, tool.source)
                     special_keys = self._get_special_handling_keys(tool, source_path.name)
 
-                    source_info = f"modified {source_path.stat().st_mtime}"
-                    target_info = f"modified {target_path.stat().st_mtime}"
+                    source_mtime = plan.stat(source_path).st_mtime
+                    target_mtime = plan.stat(target_path).st_mtime
+                    source_info = f"modified {source_mtime}"
+                    target_info = f"modified {target_mtime}"
 
                     if auto_resolve:
                         # Auto-resolve using timestamps
-                        if source_path.stat().st_mtime > target_path.stat().st_mtime:
+                        if source_mtime > target_mtime:
                             choice = "keep_source"
                             show_info(f"Auto: Keeping source (newer) for {relpath}")
                         else:
@@ -534,15 +644,9 @@ class SyncEngine:
                         choice = show_conflict_resolution_prompt(relpath, source_info, target_info, special_keys)
 
                     if choice == "diff":
-                        # For special_handling files, diff only extracted keys
-                        src_ext = self._extract_special_handling_content(tool, source_path)
-                        tgt_ext = self._extract_special_handling_content(tool, target_path)
-                        if src_ext is not None and tgt_ext is not None:
-                            diff_lines, _ = generate_diff_between_strings(
-                                tgt_ext, src_ext, str(target_path), str(source_path)
-                            )
-                        else:
-                            diff_lines, _ = generate_unified_diff(target_path, source_path)
+                        diff_lines = plan.diffs.get((target_path, source_path))
+                        if diff_lines is None:
+                            diff_lines, _ = self._diff_files(tool, target_path, source_path)
                         from .ui import show_diff
 
                         show_diff(relpath, diff_lines, "target", "source")
@@ -554,7 +658,7 @@ class SyncEngine:
                         plan.files_to_copy.append((target_path, source_path))
                     elif choice == "auto":
                         # Same as auto_resolve logic
-                        if source_path.stat().st_mtime > target_path.stat().st_mtime:
+                        if source_mtime > target_mtime:
                             plan.files_to_copy.append((source_path, target_path))
                         else:
                             plan.files_to_copy.append((target_path, source_path))
@@ -576,7 +680,7 @@ class SyncEngine:
                     # Check if any orphaned files are under directories that might be symlinks
                     orphan_dirs = set()
                     for orphan_path in plan.orphaned_files:
-                        relpath = str(orphan_path.relative_to(tool.target))
+                        relpath = _relpath(orphan_path, tool.target)
                         parts = relpath.split("/")
                         if len(parts) > 1:
                             orphan_dirs.add(parts[0] + "/" + parts[1])  # First two levels
@@ -594,21 +698,21 @@ class SyncEngine:
                 if bulk_choice == "delete_all":
                     # Delete all orphaned files
                     for orphan_path in plan.orphaned_files:
-                        relpath = str(orphan_path.relative_to(tool.target))
+                        relpath = _relpath(orphan_path, tool.target)
                         plan.files_to_delete.append((orphan_path, "target"))
                         plan.confirmed_deletions.add(orphan_path)  # Mark as already confirmed
                         show_info(f"Will delete orphaned file: {relpath}")
                 elif bulk_choice == "sync_back_all":
                     # Sync all back to source
                     for orphan_path in plan.orphaned_files:
-                        relpath = str(orphan_path.relative_to(tool.target))
+                        relpath = _relpath(orphan_path, tool.target)
                         source_dest = tool.source / relpath
                         plan.files_to_copy.append((orphan_path, source_dest))
                         show_info(f"Will sync back to source: {relpath}")
                 elif bulk_choice == "select":
                     # Handle individually
                     for orphan_path in plan.orphaned_files:
-                        relpath = str(orphan_path.relative_to(tool.target))
+                        relpath = _relpath(orphan_path, tool.target)
                         choice = show_orphaned_file_action_prompt(relpath)
 
                         if choice == "delete":
@@ -621,7 +725,6 @@ class SyncEngine:
                             show_info(f"Will sync back to source: {relpath}")
                         elif choice == "view":
                             # Open in editor (using $EDITOR or 'less')
-                            import os
                             import subprocess
 
                             editor = os.environ.get("EDITOR", "less")
@@ -648,9 +751,7 @@ class SyncEngine:
                 confirmed_deletions = []
 
                 for path, location in plan.files_to_delete:
-                    relpath = str(
-                        path.relative_to(tool.source if location == "source" else tool.target)
-                    )
+                    relpath = _relpath(path, tool.source if location == "source" else tool.target)
 
                     # Skip confirmation if already confirmed (e.g., from orphaned file handling)
                     if path in plan.confirmed_deletions:
@@ -691,7 +792,6 @@ class SyncEngine:
                                     show_info(f"Will sync back to target: {relpath}")
                         elif choice == "view":
                             # Open file in editor and ask again
-                            import os
                             import subprocess
 
                             editor = os.environ.get("EDITOR", "less")
@@ -745,64 +845,78 @@ class SyncEngine:
                     )
                     show_info(f"Created backup: {backup_dir.name}")
 
-            # Execute copies
+            # Confirm overwrites up front, so no prompt has to wait on copies
+            # running in parallel
+            copies = []
             for source, dest in plan.files_to_copy:
-                try:
-                    # Confirm before overwriting source files in pull mode
-                    if (
-                        plan.direction == SyncDirection.PULL
-                        and dest.exists()
-                        and self.config.settings.confirm_destructive_source
-                        and not auto_resolve
-                    ):
-                        relpath = str(dest.relative_to(tool.source))
-                        special_keys = self._get_special_handling_keys(tool, source.name)
-                        if special_keys:
-                            keys_str = ", ".join(special_keys)
-                            prompt_msg = f"Update sections ({keys_str}) in source file {relpath}?"
+                # Confirm before overwriting source files in pull mode
+                if (
+                    plan.direction == SyncDirection.PULL
+                    and dest.exists()
+                    and self.config.settings.confirm_destructive_source
+                    and not auto_resolve
+                ):
+                    relpath = _relpath(dest, tool.source)
+                    special_keys = self._get_special_handling_keys(tool, source.name)
+                    if special_keys:
+                        keys_str = ", ".join(special_keys)
+                        prompt_msg = f"Update sections ({keys_str}) in source file {relpath}?"
+                    else:
+                        prompt_msg = f"Overwrite source file {relpath}?"
+                    if not confirm_action(prompt_msg):
+                        show_info(f"Skipped: {relpath}")
+                        continue
+                copies.append((source, dest))
+
+            # Copies release the GIL, so they run in parallel unless disabled
+            # in settings. Results are recorded in plan order on this thread,
+            # since the state isn't thread-safe.
+            executor = None
+            futures = []
+            if self.config.settings.parallel_sync and len(copies) > 1:
+                executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) * 4, len(copies))
+                )
+                futures = [
+                    executor.submit(self._copy_planned_file, tool, plan.direction, source, dest)
+                    for source, dest in copies
+                ]
+
+            # Record every copy at the same sync time
+            sync_time = datetime.now()
+            try:
+                for index, (source, dest) in enumerate(copies):
+                    try:
+                        if executor is not None:
+                            metadata, source_stat, target_stat = futures[index].result()
                         else:
-                            prompt_msg = f"Overwrite source file {relpath}?"
-                        if not confirm_action(prompt_msg):
-                            show_info(f"Skipped: {relpath}")
-                            continue
-
-                    # Check if this file has special handling
-                    source_name = source.name
-                    if source_name in tool.special_handling:
-                        handling = tool.special_handling[source_name]
+                            metadata, source_stat, target_stat = self._copy_planned_file(
+                                tool, plan.direction, source, dest
+                            )
+                    except Exception as e:
+                        show_error(f"Failed to copy {source}: {e}")
+                        return False
+
+                    handling = tool.special_handling.get(source.name)
+                    if handling is not None:
                         keys_str = ", ".join(handling.include_keys) if handling.include_keys else "all"
-                        show_info(f"Partial sync for {source_name} - updating sections: {keys_str}")
-
-                        process_special_file(
-                            source,
-                            dest,
-                            handling.mode,
-                            handling.include_keys,
-                            handling.exclude_patterns,
-                        )
-                    else:
-                        # Normal file copy
-                        safe_copy_file(source, dest, create_parents=True)
-
-                    # Update state
-                    # Determine base_path based on which file is the actual source
-                    # For files being copied: source contains the file, dest is the destination
-                    # Need to determine which directory the source file belongs to
-                    if source.is_relative_to(tool.source):
-                        base_path = tool.source
-                    elif source.is_relative_to(tool.target):
-                        base_path = tool.target
-                    else:
-                        # Fallback to plan direction
-                        base_path = tool.source if plan.direction == SyncDirection.PUSH else tool.target
+                        show_info(f"Partial sync for {source.name} - updated sections: {keys_str}")
 
-                    metadata = FileMetadata.from_file(source, base_path)
-                    state.update_file(metadata, tool.name)
+                    # Record both sides as they are now, so the next plan can
+                    # skip comparing them if neither is touched
+                    state.update_file(
+                        metadata,
+                        tool.name,
+                        sync_time,
+                        source_stat=source_stat,
+                        target_stat=target_stat,
+                    )
 
                     show_success(f"Synced: {metadata.relative_path}")
-                except Exception as e:
-                    show_error(f"Failed to copy {source}: {e}")
-                    return False
+            finally:
+                if executor is not None:
+                    # After a failure, don't start copies that haven't begun
+                    executor.shutdown(cancel_futures=True)
 
             # Execute deletions
             for path, location in plan.files_to_delete:
@@ -811,9 +925,7 @@ class SyncEngine:
 
                     # Don't create .deleted files - BackupManager already handles backups
                     safe_delete_file(path, backup=False)
-                    relpath = str(
-                        path.relative_to(tool.source if location == "source" else tool.target)
-                    )
+                    relpath = _relpath(path, tool.source if location == "source" else tool.target)
                     state.remove_file(f"{tool.name}/{relpath}")
                     show_success(f"Deleted: {relpath}")
                 except Exception as e:
@@ -829,6 +941,53 @@ class SyncEngine:
             show_error(f"Sync failed: {e}")
             return False
 
+    def _copy_planned_file(
+        self, tool: ToolConfig, direction: SyncDirection, source: Path, dest: Path
+    ) -> tuple[FileMetadata, os.stat_result, os.stat_result]:
+        """
+        Copy one planned file, or merge its synced keys for special_handling files.
+
+        Safe to run from worker threads: it only touches the two files.
+
+        Args:
+            tool: Tool being synced
+            direction: Sync direction, used when source is under neither root
+            source: File to copy from
+            dest: File to copy to
+
+        Returns:
+            Tuple of the copied file's metadata and the stats of its source
+            and target sides after the copy
+        """
+        handling = tool.special_handling.get(source.name)
+        if handling is not None:
+            process_special_file(
+                source,
+                dest,
+                handling.mode,
+                handling.include_keys,
+                handling.exclude_patterns,
+            )
+        else:
+            safe_copy_file(source, dest, create_parents=True)
+
+        # The copied file may come from either root, so work out which one
+        # its relative path is against
+        source_str = str(source)
+        if source_str.startswith(os.path.join(str(tool.source), "")):
+            base_path = tool.source
+        elif source_str.startswith(os.path.join(str(tool.target), "")):
+            base_path = tool.target
+        else:
+            base_path = tool.source if direction == SyncDirection.PUSH else tool.target
+
+        metadata = FileMetadata.from_file(source, base_path)
+        return (
+            metadata,
+            (tool.source / metadata.relative_path).stat(),
+            (tool.target / metadata.relative_path).stat(),
+        )
+
     def _plan_to_changes(self, plan: SyncPlan) -> list[FileChange]:
         """Convert sync plan to FileChange list for UI."""
         changes = []
@@ -836,26 +995,18 @@ class SyncEngine:
         for source, dest in plan.files_to_copy:
             # Determine relative path
             if plan.direction == SyncDirection.PUSH:
-                relpath = str(source.relative_to(plan.tool.source))
+                relpath = _relpath(source, plan.tool.source)
             else:
-                relpath = str(source.relative_to(plan.tool.target))
+                relpath = _relpath(source, plan.tool.target)
 
             # Get special handling keys if applicable
             special_keys = self._get_special_handling_keys(plan.tool, source.name)
 
-            # Determine change type
+            # Determine change type. Diff stats are only worked out when the
+            # summary shows them.
             if dest.exists():
                 change_type = ChangeType.MODIFIED
-                # For special_handling files, diff only the extracted keys
-                # to avoid exposing unsynced content (e.g. secrets).
-                source_extracted = self._extract_special_handling_content(plan.tool, source)
-                dest_extracted = self._extract_special_handling_content(plan.tool, dest)
-                if source_extracted is not None and dest_extracted is not None:
-                    diff_stats = count_diff_lines_from_strings(
-                        dest_extracted, source_extracted, str(dest), str(source)
-                    )
-                else:
-                    diff_stats = count_diff_lines(dest, source)
+                diff_stats = partial(self._summary_diff_stats, plan, dest, source)
             else:
                 change_type = ChangeType.NEW
                 diff_stats = None
@@ -865,41 +1016,32 @@ class SyncEngine:
         for path, _ in plan.files_to_delete:
             # Determine relative path
             if plan.direction == SyncDirection.PUSH:
-                relpath = str(path.relative_to(plan.tool.target))
+                relpath = _relpath(path, plan.tool.target)
             else:
-                relpath = str(path.relative_to(plan.tool.source))
+                relpath = _relpath(path, plan.tool.source)
 
             changes.append(FileChange(relpath, ChangeType.DELETED))
 
         for source, target in plan.conflicts:
-            relpath = str(source.relative_to(plan.tool.source))
+            relpath = _relpath(source, plan.tool.source)
             special_keys = self._get_special_handling_keys(plan.tool, source.name)
             changes.append(FileChange(relpath, ChangeType.CONFLICT, special_handling_keys=special_keys))
 
         for source, target in plan.reverse_suggestions:
-            relpath = str(source.relative_to(plan.tool.source))
+            relpath = _relpath(source, plan.tool.source)
             special_keys = self._get_special_handling_keys(plan.tool, source.name)
-            # For special_handling files, diff only extracted keys
-            source_extracted = self._extract_special_handling_content(plan.tool, source)
-            target_extracted = self._extract_special_handling_content(plan.tool, target)
-            if source_extracted is not None and target_extracted is not None:
-                diff_stats = count_diff_lines_from_strings(
-                    target_extracted, source_extracted, str(target), str(source)
-                )
-            else:
-                diff_stats = count_diff_lines(target, source)
             changes.append(
                 FileChange(
                     relpath,
                     ChangeType.MODIFIED,
-                    diff_stats,
+                    partial(self._summary_diff_stats, plan, target, source),
                     warnings=["Target is newer than source"],
                     special_handling_keys=special_keys,
                 )
             )
 
         for orphan_path in plan.orphaned_files:
-            relpath = str(orphan_path.relative_to(plan.tool.target))
+            relpath = _relpath(orphan_path, plan.tool.target)
             changes.append(
                 FileChange(
                     relpath,
@@ -934,21 +1076,16 @@ class SyncEngine:
                 continue
 
             if plan.direction == SyncDirection.PUSH:
-                relpath = str(source.relative_to(plan.tool.source))
+                relpath = _relpath(source, plan.tool.source)
             else:
-                relpath = str(source.relative_to(plan.tool.target))
+                relpath = _relpath(source, plan.tool.target)
 
             if relpath not in modified_relpaths or relpath in shown:
                 continue
 
-            src_ext = self._extract_special_handling_content(plan.tool, source)
-            dst_ext = self._extract_special_handling_content(plan.tool, dest)
-            if src_ext is not None and dst_ext is not None:
-                diff_lines, _ = generate_diff_between_strings(
-                    dst_ext, src_ext, str(dest), str(source)
-                )
-            else:
-                diff_lines, _ = generate_unified_diff(dest, source)
+            diff_lines = plan.diffs.get((dest, source))
+            if diff_lines is None:
+                diff_lines, _ = self._diff_files(plan.tool, dest, source)
 
             truncated = len(diff_lines) > max_lines
             show_diff(relpath, diff_lines[:max_lines] if truncated else diff_lines, "target", "source")
@@ -957,18 +1094,13 @@ class SyncEngine:
             shown.add(relpath)
 
         for source, target in plan.reverse_suggestions:
-            relpath = str(source.relative_to(plan.tool.source))
+            relpath = _relpath(source, plan.tool.source)
             if relpath not in modified_relpaths or relpath in shown:
                 continue
 
-            src_ext = self._extract_special_handling_content(plan.tool, source)
-            tgt_ext = self._extract_special_handling_content(plan.tool, target)
-            if src_ext is not None and tgt_ext is not None:
-                diff_lines, _ = generate_diff_between_strings(
-                    tgt_ext, src_ext, str(target), str(source)
-                )
-            else:
-                diff_lines, _ = generate_unified_diff(target, source)
+            diff_lines = plan.diffs.get((target, source))
+            if diff_lines is None:
+                diff_lines, _ = self._diff_files(plan.tool, target, source)
 
             truncated = len(diff_lines) > max_lines
             show_diff(relpath, diff_lines[:max_lines] if truncated else diff_lines, "target", "source")
@@ -1,5 +1,6 @@
 """UI components for agentic-sync using rich."""
 
+from collections.abc import Callable
 from enum import Enum
 
 from rich.console import Console
@@ -30,16 +31,23 @@ class FileChange:
         self,
         relative_path: str,
         change_type: ChangeType,
-        diff_stats: DiffStats | None = None,
+        diff_stats: DiffStats | Callable[[], DiffStats | None] | None = None,
         warnings: list[str] | None = None,
         special_handling_keys: list[str] | None = None,
     ):
         self.relative_path = relative_path
         self.change_type = change_type
-        self.diff_stats = diff_stats
+        self._diff_stats = diff_stats
         self.warnings = warnings or []
         self.special_handling_keys = special_handling_keys  # Keys being synced for partial files
 
+    @property
+    def diff_stats(self) -> DiffStats | None:
+        """Diff stats, computed on first access when given as a callable."""
+        if callable(self._diff_stats):
+            self._diff_stats = self._diff_stats()
+        return self._diff_stats
+
 
 def show_summary(
     changes: list[FileChange],
@@ -1,9 +1,22 @@
 """Utility functions for agentic-sync."""
 
 import fnmatch
+import json
+import os
+import re
 import socket
+import stat
 import uuid
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to the stdlib json module
+    orjson = None
 
 
 def matches_pattern(path: Path, pattern: str, base_path: Path) -> bool:
@@ -74,6 +87,125 @@ def _matches_recursive_pattern(path_parts: list[str], pattern_parts: list[str])
         return False
 
 
+def _translate_segment(pattern: str) -> str:
+    """
+    Translate an fnmatch pattern for a single path segment to a regex.
+
+    Unlike fnmatch.translate, wildcards and character classes never match
+    "/", so the regex can be embedded in a whole-path regex.
+
+    Args:
+        pattern: fnmatch pattern for one path segment
+
+    Returns:
+        Regex source
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            # Find the end of the character class, as fnmatch does
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                # Unclosed class - treat "[" literally
+                parts.append("\\[")
+                continue
+            stuff = pattern[i:j].replace("\\", "\\\\")
+            # Escape characters re treats as set operations
+            stuff = re.sub(r"([&~|])", r"\\\1", stuff)
+            i = j + 1
+            if stuff.startswith("!"):
+                stuff = "^" + stuff[1:]
+            elif stuff.startswith("^"):
+                stuff = "\\" + stuff
+            parts.append(f"(?!/)[{stuff}]")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def _translate_recursive_pattern(pattern: str) -> str:
+    """
+    Translate a pattern containing ** to a regex with matches_pattern semantics.
+
+    The regex is matched against the relative path with a trailing "/", so
+    every segment, including the last, ends in a separator.
+
+    Args:
+        pattern: Glob pattern containing **
+
+    Returns:
+        Regex source
+    """
+    parts = []
+    for part in pattern.split("/"):
+        if part == "**":
+            # ** matches zero or more whole segments
+            parts.append("(?:[^/]*/)*")
+        else:
+            parts.append(_translate_segment(part) + "/")
+    return "".join(parts) + r"\Z"
+
+
+class PatternMatcher:
+    """
+    Match relative paths against a set of glob patterns.
+
+    All patterns are compiled into a single regex up front, so each path is
+    tested in one regex match instead of one fnmatch call per pattern.
+    Matching has the same semantics as matches_pattern().
+    """
+
+    def __init__(self, patterns: list[str], fnmatch_recursive: bool = False):
+        """
+        Compile patterns.
+
+        Args:
+            patterns: Glob patterns (supports * and **)
+            fnmatch_recursive: Also match ** patterns with fnmatch against the
+                whole path, as matches_patterns() does
+        """
+        # Patterns without ** are matched with fnmatch against the whole path
+        simple = [fnmatch.translate(p) for p in patterns if fnmatch_recursive or "**" not in p]
+        recursive = [_translate_recursive_pattern(p) for p in patterns if "**" in p]
+        self._simple = re.compile("|".join(f"(?:{r})" for r in simple)) if simple else None
+        self._recursive = (
+            re.compile("|".join(f"(?:{r})" for r in recursive)) if recursive else None
+        )
+
+    def matches(self, relative_path: str) -> bool:
+        """
+        Check if a relative path matches any of the patterns.
+
+        Args:
+            relative_path: Path relative to base (as string)
+
+        Returns:
+            True if any pattern matches
+        """
+        if self._simple is not None and self._simple.match(relative_path):
+            return True
+        return self._recursive is not None and bool(self._recursive.match(relative_path + "/"))
+
+
+@lru_cache(maxsize=128)
+def _pattern_matcher(patterns: tuple[str, ...], fnmatch_recursive: bool = False) -> PatternMatcher:
+    """Get a compiled matcher for patterns, reused for every call with the same patterns."""
+    return PatternMatcher(list(patterns), fnmatch_recursive)
+
+
 def matches_patterns(
     relative_path: str,
     include_patterns: list[str],
@@ -90,47 +222,89 @@ def matches_patterns(
     Returns:
         True if path would be included after applying patterns
     """
-    # If no include patterns, everything is potentially included
-    included = not include_patterns
-
-    # Check include patterns
+    # Compiled matchers are cached, since callers check many paths against
+    # the same tool patterns
     if include_patterns:
-        for pattern in include_patterns:
-            if fnmatch.fnmatch(relative_path, pattern):
-                included = True
-                break
-            # Handle ** patterns
-            if "**" in pattern:
-                pattern_parts = pattern.split("/")
-                path_parts = relative_path.split("/")
-                if _matches_recursive_pattern(path_parts, pattern_parts):
-                    included = True
-                    break
-
-    # Check exclude patterns
-    if included:
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(relative_path, pattern):
-                return False
-            # Handle ** patterns
-            if "**" in pattern:
-                pattern_parts = pattern.split("/")
-                path_parts = relative_path.split("/")
-                if _matches_recursive_pattern(path_parts, pattern_parts):
-                    return False
-
-    return included
+        include_matcher = _pattern_matcher(tuple(include_patterns), fnmatch_recursive=True)
+        if not include_matcher.matches(relative_path):
+            return False
+    if exclude_patterns:
+        exclude_matcher = _pattern_matcher(tuple(exclude_patterns), fnmatch_recursive=True)
+        return not exclude_matcher.matches(relative_path)
+    return True
+
+
+def _scan_files(
+    root: str, prefix: str, exclude_matcher: PatternMatcher
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Walk a directory tree with os.scandir, yielding files that aren't excluded.
 
+    Symlinked directories below *root* aren't descended into, matching
+    pathlib's recursive globbing, and directories matching an exclude
+    pattern are pruned rather than walked.
 
-def find_files(
+    Args:
+        root: Directory to walk
+        prefix: Relative path of *root* from the search base, "" for the base
+        exclude_matcher: Matcher for paths relative to the search base
+
+    Yields:
+        Tuples of (path relative to the search base, DirEntry)
+    """
+    stack = [(root, prefix)]
+    while stack:
+        directory, dir_rel = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel = f"{dir_rel}{entry.name}"
+                    if exclude_matcher.matches(rel):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{rel}/"))
+                    else:
+                        yield rel, entry
+        except OSError:
+            continue
+
+
+def _split_include(pattern: str) -> tuple[str, str]:
+    """
+    Split a recursive include pattern into a start directory and the glob
+    searched for recursively below it.
+
+    Mirrors how find_files has always expanded these patterns with rglob:
+    "**/rest" searches for rest below the base, and "dir/**/rest" searches
+    for rest below dir (with "*" when rest is empty).
+
+    Args:
+        pattern: Include pattern containing **
+
+    Returns:
+        Tuple of (start directory relative to the base, "" for the base
+        itself, and the glob to search for)
+    """
+    parts = Path(pattern).parts
+    if parts[0] == "**":
+        return "", "/".join(parts[1:]) or "*"
+    return parts[0], "/".join(parts[2:]) or "*"
+
+
+def find_files_with_stats(
     base_path: Path,
     include_patterns: list[str],
     exclude_patterns: list[str],
     follow_symlinks: bool = False,
     respect_gitignore: bool = True,
-) -> set[Path]:
+) -> dict[Path, os.stat_result]:
     """
-    Find files matching include/exclude patterns.
+    Find files matching include/exclude patterns, with their stat results.
+
+    Each directory tree an include pattern reaches into is walked once with
+    os.scandir, however many patterns share it, and every file found is
+    statted exactly once, so callers can reuse the results rather than
+    statting again.
 
     Args:
         base_path: Base directory to search
@@ -140,10 +314,10 @@ def find_files(
         respect_gitignore: Whether to respect .gitignore files
 
     Returns:
-        Set of matching file paths
+        Dictionary mapping each matching file path to its stat result
     """
     if not base_path.exists():
-        return set()
+        return {}
 
     # Combine exclude patterns with gitignore patterns if requested
     combined_excludes = list(exclude_patterns)
@@ -153,80 +327,105 @@ def find_files(
         gitignore_patterns = get_gitignore_excludes(base_path)
         combined_excludes.extend(gitignore_patterns)
 
-    candidates = set()
-
-    # If no include patterns, include everything
+    exclude_matcher = _pattern_matcher(tuple(combined_excludes))
+    result: dict[Path, os.stat_result] = {}
+
+    def add(path: Path, stat_target: os.DirEntry | Path) -> None:
+        try:
+            st = stat_target.stat()
+        except OSError:
+            return
+        if stat.S_ISREG(st.st_mode):
+            result[path] = st
+
+    # Group recursive patterns by the directory they search from, so each
+    # tree is only walked once. Searches for a single file name glob (the
+    # usual "dir/**" and "**/*.ext") are matched during the walk; deeper
+    # globs keep rglob's handling of symlinks part way down the pattern.
+    walks: dict[str, list[re.Pattern[str]]] = {}
+    rglob_patterns = []
+    simple_patterns = []
     if not include_patterns:
-        for item in base_path.rglob("*"):
-            if item.is_file():
-                if not follow_symlinks and item.is_symlink():
-                    continue
-                candidates.add(item)
-    else:
-        # Process each include pattern
-        for pattern in include_patterns:
-            # Handle ** patterns with rglob
-            if "**" in pattern:
-                # Extract the glob part after **
-                pattern_path = Path(pattern)
-                parts = pattern_path.parts
-
-                if parts[0] == "**":
-                    # **/*.ext or **/dir/**
-                    search_pattern = "/".join(parts[1:]) if len(parts) > 1 else "*"
-                    for item in base_path.rglob(search_pattern):
-                        if item.is_file():
-                            if not follow_symlinks and item.is_symlink():
-                                continue
-                            candidates.add(item)
-                else:
-                    # dir/**/*.ext
-                    subdir = base_path / parts[0]
-                    if subdir.exists():
-                        search_pattern = "/".join(parts[2:]) if len(parts) > 2 else "*"
-                        for item in subdir.rglob(search_pattern):
-                            if item.is_file():
-                                if not follow_symlinks and item.is_symlink():
-                                    continue
-                                candidates.add(item)
-            else:
-                # Simple glob
-                for item in base_path.glob(pattern):
-                    if item.is_file():
-                        if not follow_symlinks and item.is_symlink():
-                            continue
-                        candidates.add(item)
-
-    # Apply exclusions
-    result = set()
-    for candidate in candidates:
-        excluded = False
-        relative_path = candidate.relative_to(base_path)
-
-        for exclude_pattern in combined_excludes:
-            # Check if the file itself matches the pattern
-            if matches_pattern(candidate, exclude_pattern, base_path):
-                excluded = True
-                break
-
-            # Also check if any parent directory matches the pattern
-            # This ensures that patterns like "**/.git" exclude all files within .git directories
-            for parent in relative_path.parents:
-                if parent != Path("."):  # Skip the root "." parent
-                    parent_path = base_path / parent
-                    if matches_pattern(parent_path, exclude_pattern, base_path):
-                        excluded = True
-                        break
-
-            if excluded:
-                break
-
-        if not excluded:
-            result.add(candidate)
+        walks[""] = [re.compile(r".")]
+    for pattern in include_patterns:
+        if "**" not in pattern:
+            simple_patterns.append(pattern)
+            continue
+        start, rest = _split_include(pattern)
+        if "/" in rest or "**" in rest:
+            rglob_patterns.append((start, rest))
+        else:
+            walks.setdefault(start, []).append(re.compile(_translate_segment(rest) + r"\Z"))
+
+    base = str(base_path)
+    for start, matchers in walks.items():
+        if start:
+            # The start directory itself is followed even if it is a symlink
+            start_dir = base_path / start
+            if not start_dir.is_dir() or exclude_matcher.matches(start):
+                continue
+            root, prefix = str(start_dir), f"{start}/"
+        else:
+            root, prefix = base, ""
+        for rel, entry in _scan_files(root, prefix, exclude_matcher):
+            if not follow_symlinks and entry.is_symlink():
+                continue
+            if any(matcher.match(entry.name) for matcher in matchers):
+                add(base_path / rel, entry)
+
+    # Plain globs don't recurse and are usually single file names, so they
+    # and the remaining recursive patterns are expanded with pathlib
+    globbed = (base_path.glob(pattern) for pattern in simple_patterns)
+    rglobbed = (
+        (base_path / start).rglob(rest)
+        for start, rest in rglob_patterns
+        if start == "" or (base_path / start).exists()
+    )
+    for items in (*globbed, *rglobbed):
+        for item in items:
+            if item in result or (not follow_symlinks and item.is_symlink()):
+                continue
+            rel = item.relative_to(base_path).as_posix()
+            if exclude_matcher.matches(rel) or _has_excluded_parent(exclude_matcher, rel):
+                continue
+            add(item, item)
 
     return result
 
 
+def _has_excluded_parent(exclude_matcher: PatternMatcher, rel: str) -> bool:
+    """Check whether any parent directory of a relative path is excluded."""
+    parts = rel.split("/")
+    return any(exclude_matcher.matches("/".join(parts[:i])) for i in range(1, len(parts)))
+
+
+def find_files(
+    base_path: Path,
+    include_patterns: list[str],
+    exclude_patterns: list[str],
+    follow_symlinks: bool = False,
+    respect_gitignore: bool = True,
+) -> set[Path]:
+    """
+    Find files matching include/exclude patterns.
+
+    Args:
+        base_path: Base directory to search
+        include_patterns: Patterns to include (empty = include all)
+        exclude_patterns: Patterns to exclude
+        follow_symlinks: Whether to follow symbolic links
+        respect_gitignore: Whether to respect .gitignore files
+
+    Returns:
+        Set of matching file paths
+    """
+    return set(
+        find_files_with_stats(
+            base_path, include_patterns, exclude_patterns, follow_symlinks, respect_gitignore
+        )
+    )
+
+
 def get_machine_id() -> str:
     """
     Generate a unique machine identifier.
@@ -256,3 +455,66 @@ def format_size(size_bytes: int) -> str:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024.0
     return f"{size_bytes:.1f} TB"
+
+
+def load_json_file(file_path: Path) -> Any:
+    """
+    Read and parse a JSON file, using orjson when it is installed.
+
+    Args:
+        file_path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(file_path.read_bytes())
+    # orjson writes UTF-8 regardless of locale, so read it back the same way
+    with open(file_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialise data as indented JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: JSON-serialisable data
+
+    Returns:
+        UTF-8 encoded JSON, as written by dump_json_file
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def dump_json_file(file_path: Path, data: Any, fsync: bool = False) -> None:
+    """
+    Write data to a file as indented JSON, using orjson when it is installed.
+
+    The whole document is serialised to bytes up front and written with
+    unbuffered os.write calls, which for the small files written here is a
+    single syscall.
+
+    Args:
+        file_path: Path to write
+        data: JSON-serialisable data
+        fsync: Flush the file to disk before returning, so a following
+            rename is durable across a crash
+    """
+    content = dumps_json(data)
+
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view) :]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,585 @@
+"""Tests for backup module."""
+
+import gzip
+import json
+import shutil
+import sqlite3
+import tarfile
+from dataclasses import asdict
+from datetime import datetime
+
+import pytest
+
+from sync_agentic_tools import backup
+from sync_agentic_tools.backup import (
+    BackupChange,
+    BackupManager,
+    BackupManifest,
+    _parse_backup_dir_timestamp,
+)
+from sync_agentic_tools.files import compute_checksum
+
+
+def _make_backup(backup_root, backup_id, timestamp, tool="claude", operation="push"):
+    """Create a minimal backup directory with a manifest."""
+    backup_dir = backup_root / backup_id
+    (backup_dir / "files").mkdir(parents=True)
+    manifest = {
+        "timestamp": timestamp,
+        "operation": operation,
+        "direction": "source→target",
+        "tool": tool,
+        "machine_id": "test-machine",
+        "changes": [],
+    }
+    (backup_dir / "manifest.json").write_text(json.dumps(manifest))
+    return backup_dir
+
+
+class TestBackupManifest:
+    """Test BackupManifest serialisation."""
+
+    def test_to_dict_matches_asdict(self):
+        """Test the hand-written to_dict matches dataclasses.asdict."""
+        manifest = BackupManifest(
+            timestamp="2024-01-01T12:00:00",
+            operation="push",
+            direction="source→target",
+            tool="claude",
+            machine_id="test-machine",
+            changes=[BackupChange(file="/a", action="modified", size_before=1, backup_name="a")],
+        )
+
+        assert manifest.to_dict() == asdict(manifest)
+
+    def test_round_trip(self):
+        """Test from_dict(to_dict()) reproduces the manifest."""
+        manifest = BackupManifest(
+            timestamp="2024-01-01T12:00:00",
+            operation="push",
+            direction="source→target",
+            tool="claude",
+            machine_id="test-machine",
+            changes=[BackupChange(file="/a", action="deleted")],
+        )
+
+        assert BackupManifest.from_dict(manifest.to_dict()) == manifest
+
+
+class TestBackupManagerInit:
+    """Test BackupManager initialisation."""
+
+    def test_backup_root_created_lazily(self, tmp_path):
+        """Test the backup root isn't created until a backup is made."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+
+        assert not root.exists()
+        assert manager.list_backups() == []
+        assert manager.cleanup_old_backups() == 0
+        assert manager.compress_old_backups() == 0
+        assert not root.exists()
+
+        manager.create_backup("claude", "push", "source→target", "test-machine", {})
+        assert root.is_dir()
+
+
+class TestCreateBackup:
+    """Test creating backups."""
+
+    def test_backs_up_file_contents(self, tmp_path):
+        """Test that file contents and sizes are recorded."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        original = tmp_path / "CLAUDE.md"
+        original.write_text("original content")
+        replacement = tmp_path / "new.md"
+        replacement.write_text("new")
+
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", {original: replacement}
+        )
+
+        assert (backup_dir / "files" / "CLAUDE.md").read_text() == "original content"
+        manifest = json.loads((backup_dir / "manifest.json").read_text())
+        change = manifest["changes"][0]
+        assert change["action"] == "modified"
+        assert change["size_before"] == len("original content")
+        assert change["size_after"] == len("new")
+        assert change["checksum_before"] == compute_checksum(original)
+
+    def test_records_action_per_file(self, tmp_path):
+        """Test created and deleted actions are recorded."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+        to_create = tmp_path / "create.md"
+        to_create.write_text("create")
+        to_delete = tmp_path / "delete.md"
+        to_delete.write_text("delete")
+
+        backup_dir = manager.create_backup(
+            "claude",
+            "push",
+            "source→target",
+            "test-machine",
+            {to_create: tmp_path / "missing.md", to_delete: None},
+        )
+
+        manifest = json.loads((backup_dir / "manifest.json").read_text())
+        actions = {c["file"]: (c["action"], c["size_after"]) for c in manifest["changes"]}
+        assert actions[str(to_create)] == ("created", None)
+        assert actions[str(to_delete)] == ("deleted", None)
+
+    def test_same_name_files_get_unique_backup_names(self, tmp_path):
+        """Test files sharing a name don't overwrite each other in the backup."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+        originals = []
+        for i in range(3):
+            original = tmp_path / f"dir{i}" / "rules.md"
+            original.parent.mkdir()
+            original.write_text(f"rules {i}")
+            originals.append(original)
+
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", dict.fromkeys(originals)
+        )
+
+        files_dir = backup_dir / "files"
+        assert sorted(p.name for p in files_dir.iterdir()) == [
+            "rules.md",
+            "rules_1.md",
+            "rules_2.md",
+        ]
+        assert sorted(p.read_text() for p in files_dir.iterdir()) == [
+            "rules 0",
+            "rules 1",
+            "rules 2",
+        ]
+
+    def test_skips_missing_files(self, tmp_path):
+        """Test that files which no longer exist are skipped."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", {tmp_path / "missing.md": None}
+        )
+
+        manifest = json.loads((backup_dir / "manifest.json").read_text())
+        assert manifest["changes"] == []
+
+
+class TestRestoreBackup:
+    """Test restoring backups."""
+
+    def test_restores_file_contents(self, tmp_path):
+        """Test files are restored to their original location."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+        original = tmp_path / "CLAUDE.md"
+        original.write_text("original")
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", {original: None}
+        )
+        original.write_text("changed")
+
+        manifest = manager.restore_backup(backup_dir.name)
+
+        assert len(manifest.changes) == 1
+        assert original.read_text() == "original"
+
+    def test_restores_prefix_named_files_correctly(self, tmp_path):
+        """Test files whose names share a prefix restore their own contents."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+        config = tmp_path / "config"
+        config.write_text("config")
+        config_local = tmp_path / "config_local"
+        config_local.write_text("config_local")
+        backup_dir = manager.create_backup(
+            "claude",
+            "push",
+            "source→target",
+            "test-machine",
+            {config_local: None, config: None},
+        )
+        config.write_text("changed")
+        config_local.write_text("changed")
+
+        manager.restore_backup(backup_dir.name)
+
+        assert config.read_text() == "config"
+        assert config_local.read_text() == "config_local"
+
+    def test_restores_legacy_manifest(self, tmp_path):
+        """Test manifests without backup names restore by exact file name."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        original = tmp_path / "config"
+        original.write_text("changed")
+        backup_dir = _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        (backup_dir / "files" / "config_local").write_text("wrong file")
+        (backup_dir / "files" / "config").write_text("original")
+        manifest = json.loads((backup_dir / "manifest.json").read_text())
+        manifest["changes"] = [{"file": str(original), "action": "deleted"}]
+        (backup_dir / "manifest.json").write_text(json.dumps(manifest))
+
+        manager.restore_backup(backup_dir.name)
+
+        assert original.read_text() == "original"
+
+    def test_restores_compressed_backup(self, tmp_path):
+        """Test files from compressed backups are decompressed on restore."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        original = tmp_path / "CLAUDE.md"
+        original.write_text("original")
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", {original: None}
+        )
+        manager.compress_old_backups(age_days=-1)
+        original.write_text("changed")
+
+        manager.restore_backup(backup_dir.name)
+
+        assert original.read_text() == "original"
+
+    def test_restores_legacy_gzipped_files(self, tmp_path):
+        """Test files individually gzipped by older versions are restored."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        original = tmp_path / "CLAUDE.md"
+        original.write_text("original")
+        backup_dir = manager.create_backup(
+            "claude", "push", "source→target", "test-machine", {original: None}
+        )
+        backup_file = backup_dir / "files" / "CLAUDE.md"
+        with gzip.open(f"{backup_file}.gz", "wb") as f:
+            f.write(backup_file.read_bytes())
+        backup_file.unlink()
+        original.write_text("changed")
+
+        manager.restore_backup(backup_dir.name)
+
+        assert original.read_text() == "original"
+
+    def test_restores_legacy_gzipped_files_from_archive(self, tmp_path):
+        """Test individually gzipped files are restored after being archived."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        original = tmp_path / "config"
+        original.write_text("changed")
+        backup_dir = _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        with gzip.open(backup_dir / "files" / "config.gz", "wb") as f:
+            f.write(b"original")
+        manifest = json.loads((backup_dir / "manifest.json").read_text())
+        manifest["changes"] = [{"file": str(original), "action": "deleted"}]
+        (backup_dir / "manifest.json").write_text(json.dumps(manifest))
+        manager.compress_old_backups(age_days=7)
+        assert (backup_dir / "files.tar.gz").exists()
+
+        manager.restore_backup(backup_dir.name)
+
+        assert original.read_text() == "original"
+
+    def test_missing_backup_raises(self, tmp_path):
+        """Test restoring an unknown backup raises FileNotFoundError."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+
+        with pytest.raises(FileNotFoundError):
+            manager.restore_backup("does-not-exist")
+
+
+class TestListBackups:
+    """Test listing backups."""
+
+    def test_empty_backup_root(self, tmp_path):
+        """Test listing with no backups."""
+        manager = BackupManager(backup_root=tmp_path / "backups")
+        assert manager.list_backups() == []
+
+    def test_sorted_newest_first(self, tmp_path):
+        """Test backups are listed newest first."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        _make_backup(root, "2024-03-01_120000_push_claude", "2024-03-01T12:00:00")
+        _make_backup(root, "2024-02-01_120000_push_claude", "2024-02-01T12:00:00")
+
+        ids = [b["id"] for b in manager.list_backups()]
+        assert ids == [
+            "2024-03-01_120000_push_claude",
+            "2024-02-01_120000_push_claude",
+            "2024-01-01_120000_push_claude",
+        ]
+
+    def test_filter_by_tool(self, tmp_path):
+        """Test filtering backups by tool name."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00", tool="claude")
+        _make_backup(root, "2024-01-02_120000_push_cline", "2024-01-02T12:00:00", tool="cline")
+
+        backups = manager.list_backups("cline")
+        assert [b["id"] for b in backups] == ["2024-01-02_120000_push_cline"]
+
+    def test_iter_backups_partial_consumption_keeps_index(self, tmp_path):
+        """Test stopping iteration early doesn't prune unseen index entries."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        _make_backup(root, "2024-01-02_120000_push_claude", "2024-01-02T12:00:00")
+        manager.list_backups()
+
+        first = next(manager.iter_backups())
+
+        assert first["id"] == "2024-01-02_120000_push_claude"
+        index = manager._index.load()
+        assert len(index) == 2
+
+    def test_skips_non_backup_entries(self, tmp_path):
+        """Test that stray files and dirs without manifests are ignored."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        (root / "stray.txt").write_text("not a backup")
+        (root / "no-manifest").mkdir()
+
+        assert len(manager.list_backups()) == 1
+
+
+class TestCleanupOldBackups:
+    """Test backup retention cleanup."""
+
+    def test_deletes_old_beyond_retention_count(self, tmp_path):
+        """Test old backups beyond the retention count are deleted."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        _make_backup(root, "2020-01-02_120000_push_claude", "2020-01-02T12:00:00")
+        _make_backup(root, "2020-01-03_120000_push_claude", "2020-01-03T12:00:00")
+
+        deleted = manager.cleanup_old_backups(retention_days=30, retention_count=1)
+
+        assert deleted == 2
+        assert (root / "2020-01-03_120000_push_claude").exists()
+        assert not (root / "2020-01-01_120000_push_claude").exists()
+
+    def test_deletes_nested_backup_contents(self, tmp_path):
+        """Test backups with nested directories and archives are fully removed."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        nested = backup_dir / "files" / "nested" / "deeper"
+        nested.mkdir(parents=True)
+        (nested / "file.md").write_text("content")
+        (backup_dir / "files" / "top.md").write_text("content")
+
+        assert manager.cleanup_old_backups(retention_days=30, retention_count=0) == 1
+        assert not backup_dir.exists()
+
+    def test_keeps_recent_backups(self, tmp_path):
+        """Test backups within the retention window are kept."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        manager.create_backup("claude", "push", "source→target", "test-machine", {})
+
+        deleted = manager.cleanup_old_backups(retention_days=30, retention_count=0)
+
+        assert deleted == 0
+        assert len(manager.list_backups()) == 1
+
+    def test_falls_back_to_manifest_timestamp(self, tmp_path):
+        """Test backups without a timestamped name use the manifest timestamp."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "legacy-old", "2020-01-01T12:00:00")
+        _make_backup(root, "legacy-new", "2999-01-01T12:00:00")
+
+        deleted = manager.cleanup_old_backups(retention_days=30, retention_count=0)
+
+        assert deleted == 1
+        assert not (root / "legacy-old").exists()
+        assert (root / "legacy-new").exists()
+
+    def test_mixed_legacy_and_standard_names_ordered_by_time(self, tmp_path):
+        """Test retention order uses each backup's time, not its name."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        _make_backup(root, "legacy", "2020-06-01T12:00:00")
+
+        deleted = manager.cleanup_old_backups(retention_days=30, retention_count=1)
+
+        assert deleted == 1
+        assert (root / "legacy").exists()
+        assert not (root / "2020-01-01_120000_push_claude").exists()
+
+
+class TestParseBackupDirTimestamp:
+    """Test parsing timestamps from backup IDs."""
+
+    def test_valid_backup_id(self):
+        """Test parsing a standard backup ID."""
+        result = _parse_backup_dir_timestamp("2024-05-06_071809_push_claude")
+        assert result == datetime(2024, 5, 6, 7, 18, 9)
+
+    def test_invalid_backup_id(self):
+        """Test non-timestamped names return None."""
+        assert _parse_backup_dir_timestamp("legacy-backup") is None
+        assert _parse_backup_dir_timestamp("") is None
+
+
+class TestBackupIndex:
+    """Test the backup metadata index."""
+
+    def test_create_backup_updates_index(self, tmp_path):
+        """Test new backups are added to the index."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+
+        backup_dir = manager.create_backup("claude", "push", "source→target", "test-machine", {})
+
+        index = manager._index.load()
+        assert index[backup_dir.name]["tool"] == "claude"
+        assert index[backup_dir.name]["changes"] == 0
+
+    def test_list_backfills_missing_entries(self, tmp_path):
+        """Test backups missing from the index are read from their manifest."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+
+        assert len(manager.list_backups()) == 1
+
+        index = manager._index.load()
+        assert "2024-01-01_120000_push_claude" in index
+
+    def test_list_uses_index_over_manifest(self, tmp_path):
+        """Test indexed backups don't need their manifest re-read."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        manager.list_backups()
+        (backup_dir / "manifest.json").write_text("{corrupt")
+
+        assert [b["tool"] for b in manager.list_backups()] == ["claude"]
+
+    def test_cleanup_removes_index_entries(self, tmp_path):
+        """Test deleted backups are dropped from the index."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        manager.list_backups()
+
+        assert manager.cleanup_old_backups(retention_days=30, retention_count=0) == 1
+
+        assert manager._index.load() == {}
+
+    def test_malformed_manifests_skipped(self, tmp_path):
+        """Test manifests missing required fields are ignored."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        bad_dir = root / "2024-01-02_120000_push_claude"
+        bad_dir.mkdir()
+        (bad_dir / "manifest.json").write_text(json.dumps({"tool": "claude"}))
+        list_dir = root / "2024-01-03_120000_push_claude"
+        list_dir.mkdir()
+        (list_dir / "manifest.json").write_text("[]")
+
+        assert [b["id"] for b in manager.list_backups()] == ["2024-01-01_120000_push_claude"]
+
+    def test_corrupt_index_is_ignored(self, tmp_path):
+        """Test a corrupt index falls back to reading manifests."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        (root / "index.db").write_text("not a database")
+
+        assert len(manager.list_backups()) == 1
+        assert "2024-01-01_120000_push_claude" in manager._index.load()
+
+    def test_locked_index_is_not_rebuilt(self, tmp_path, monkeypatch):
+        """Test a locked index is left intact and listing reads manifests."""
+        monkeypatch.setattr(backup, "_INDEX_TIMEOUT", 0.1)
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        _make_backup(root, "2024-01-02_120000_push_codex", "2024-01-02T12:00:00", tool="codex")
+        manager.list_backups()
+        inode = (root / "index.db").stat().st_ino
+
+        lock = sqlite3.connect(root / "index.db", isolation_level=None)
+        try:
+            lock.execute("BEGIN EXCLUSIVE")
+            assert [b["id"] for b in manager.list_backups()] == [
+                "2024-01-02_120000_push_codex",
+                "2024-01-01_120000_push_claude",
+            ]
+            assert [b["id"] for b in manager.list_backups("claude")] == [
+                "2024-01-01_120000_push_claude"
+            ]
+            manager.create_backup("claude", "push", "source→target", "test-machine", {})
+        finally:
+            lock.close()
+
+        assert (root / "index.db").stat().st_ino == inode
+        assert len(manager._index.load()) == 2
+
+    def test_unopenable_index_falls_back_to_manifests(self, tmp_path):
+        """Test an index that can't be opened is not deleted and manifests are listed."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        (root / "index.db").mkdir()
+
+        assert [b["id"] for b in manager.list_backups()] == ["2024-01-01_120000_push_claude"]
+        assert (root / "index.db").is_dir()
+
+    def test_list_drops_removed_backups(self, tmp_path):
+        """Test index entries for backups deleted outside the manager are dropped."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2024-01-01_120000_push_claude", "2024-01-01T12:00:00")
+        manager.list_backups()
+        shutil.rmtree(backup_dir)
+
+        assert manager.list_backups() == []
+        assert manager._index.load() == {}
+
+
+class TestCompressOldBackups:
+    """Test compressing old backups."""
+
+    def test_compresses_old_backup_files(self, tmp_path):
+        """Test files in old backups are packed into a single archive."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        for i in range(5):
+            (backup_dir / "files" / f"file{i}.md").write_text(f"content {i}")
+
+        compressed = manager.compress_old_backups(age_days=7)
+
+        assert compressed == 1
+        assert not (backup_dir / "files").exists()
+        with tarfile.open(backup_dir / "files.tar.gz", "r:gz") as tar:
+            assert tar.getnames() == [f"file{i}.md" for i in range(5)]
+            assert tar.extractfile("file3.md").read() == b"content 3"
+
+    def test_skips_recent_backups(self, tmp_path):
+        """Test recent backups are left uncompressed."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2999-01-01_120000_push_claude", "2999-01-01T12:00:00")
+        (backup_dir / "files" / "file.md").write_text("content")
+
+        assert manager.compress_old_backups(age_days=7) == 0
+        assert (backup_dir / "files" / "file.md").exists()
+
+    def test_already_compressed_backups_skipped(self, tmp_path):
+        """Test backups marked compressed in the index aren't counted again."""
+        root = tmp_path / "backups"
+        manager = BackupManager(backup_root=root)
+        backup_dir = _make_backup(root, "2020-01-01_120000_push_claude", "2020-01-01T12:00:00")
+        (backup_dir / "files" / "file.md").write_text("content")
+
+        assert manager.compress_old_backups(age_days=7) == 1
+        assert manager.compress_old_backups(age_days=7) == 0
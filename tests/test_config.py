@@ -1,5 +1,7 @@
 """Tests for config module."""
 
+import json
+import os
 from pathlib import Path
 
 import pytest
@@ -158,6 +160,34 @@ class TestConfig:
         assert handling.mode == "extract_keys"
         assert "permissions" in handling.include_keys
 
+    def test_from_dict_ignores_unknown_keys(self, tmp_path):
+        """Test keys that aren't dataclass fields are ignored."""
+        config_dict = {
+            "settings": {"backup_retention_days": 7, "future_setting": True},
+            "tools": {
+                "test_tool": {
+                    "source": str(tmp_path),
+                    "target": str(tmp_path),
+                    "special_handling": {"settings.json": {"include_keys": ["a"], "extra": 1}},
+                }
+            },
+            "propagate": [
+                {
+                    "source_tool": "test_tool",
+                    "source_file": "RULES.md",
+                    "exclude": ["*.tmp"],
+                    "targets": [{"tool": "test_tool", "exclude": ["*.bak"]}],
+                }
+            ],
+        }
+
+        config = Config.from_dict(config_dict)
+
+        assert config.settings.backup_retention_days == 7
+        assert config.tools["test_tool"].special_handling["settings.json"].include_keys == ["a"]
+        assert config.propagate[0].targets[0].tool == "test_tool"
+        assert config.propagate[0].exclude == ["*.tmp"]
+
     def test_from_dict_with_propagation(self, tmp_path):
         """Test creating config with propagation rules."""
         source = tmp_path / "source"
@@ -234,6 +264,86 @@ class TestConfig:
         assert config.settings.backup_retention_days == 90
         assert "test_tool" in config.tools
 
+    def test_load_non_ascii_file(self, tmp_path):
+        """Test UTF-8 config files are decoded correctly."""
+        source = tmp_path / "söurce"
+        source.mkdir()
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            f"tools:\n  tëst:\n    source: {source}\n    target: {tmp_path}\n",
+            encoding="utf-8",
+        )
+
+        config = Config.load(config_file)
+
+        assert config.tools["tëst"].source == source
+
+    def test_load_writes_cache(self, tmp_path):
+        """Test loading a config caches the parsed data next to it."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"tools:\n  t:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+        os.utime(config_file, ns=(0, 1_000_000_000))
+
+        Config.load(config_file)
+
+        cache = json.loads(Config.cache_path(config_file).read_text())
+        assert cache["data"]["tools"]["t"]["source"] == str(tmp_path)
+        assert cache["meta"]["size"] == config_file.stat().st_size
+
+    def test_load_uses_fresh_cache(self, tmp_path):
+        """Test an up-to-date cache is used instead of parsing the YAML."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"tools:\n  t:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+        os.utime(config_file, ns=(0, 1_000_000_000))
+        Config.load(config_file)
+
+        cache_file = Config.cache_path(config_file)
+        cache = json.loads(cache_file.read_text())
+        cache["data"]["tools"]["cached"] = cache["data"]["tools"].pop("t")
+        cache_file.write_text(json.dumps(cache))
+
+        assert list(Config.load(config_file).tools) == ["cached"]
+
+    def test_load_does_not_cache_recently_written_file(self, tmp_path):
+        """Test a config modified within the mtime granularity is not cached."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"tools:\n  t:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+
+        Config.load(config_file)
+
+        assert not Config.cache_path(config_file).exists()
+
+    def test_load_does_not_cache_non_json_values(self, tmp_path):
+        """Test YAML dates are not cached, so every load returns date objects."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            f"updated: 2024-01-02\ntools:\n  t:\n    source: {tmp_path}\n    target: {tmp_path}\n"
+        )
+        os.utime(config_file, ns=(0, 1_000_000_000))
+
+        Config.load(config_file)
+
+        assert not Config.cache_path(config_file).exists()
+
+    def test_load_ignores_stale_cache(self, tmp_path):
+        """Test the YAML is re-parsed after the config file changes."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"tools:\n  old:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+        Config.load(config_file)
+
+        config_file.write_text(f"tools:\n  newer:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+
+        assert list(Config.load(config_file).tools) == ["newer"]
+
+    def test_load_ignores_corrupt_cache(self, tmp_path):
+        """Test a corrupt cache falls back to parsing the YAML."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"tools:\n  t:\n    source: {tmp_path}\n    target: {tmp_path}\n")
+        Config.cache_path(config_file).write_text("{corrupt")
+
+        assert list(Config.load(config_file).tools) == ["t"]
+
     def test_load_nonexistent_file(self, tmp_path):
         """Test loading nonexistent config file."""
         config_file = tmp_path / "nonexistent.yaml"
@@ -285,6 +395,29 @@ class TestConfig:
         assert any("source path does not exist" in error for error in errors)
         assert any("target path does not exist" in error for error in errors)
 
+    def test_validate_sibling_paths(self, tmp_path):
+        """Test paths sharing a parent are each checked correctly."""
+        (tmp_path / "source").mkdir()
+        (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+        config = Config.from_dict(
+            {
+                "tools": {
+                    "present": {"source": str(tmp_path / "source"), "target": str(tmp_path)},
+                    "absent": {
+                        "source": str(tmp_path / "dangling"),
+                        "target": str(tmp_path / "missing"),
+                    },
+                }
+            }
+        )
+
+        errors = config.validate()
+
+        assert errors == [
+            f"Tool 'absent': source path does not exist: {tmp_path / 'dangling'}",
+            f"Tool 'absent': target path does not exist: {tmp_path / 'missing'}",
+        ]
+
     def test_validate_propagation_missing_source(self, tmp_path):
         """Test validation with invalid propagation rule."""
         source = tmp_path / "source"
@@ -361,6 +494,10 @@ class TestConfig:
         assert "tools:" in template
         assert "respect_gitignore:" in template
 
+    def test_create_template_is_cached(self):
+        """Test the template is only read once per process."""
+        assert Config.create_template() is Config.create_template()
+
     def test_exclude_rulesets_basic(self, tmp_path):
         """Test basic exclude rulesets functionality."""
         source = tmp_path / "source"
@@ -399,6 +536,27 @@ class TestConfig:
         # Private ruleset shouldn't be included
         assert "**/private/**" not in tool.exclude
 
+    def test_patterns_stored_as_tuples(self, tmp_path):
+        """Test include and merged exclude patterns are stored as tuples in order."""
+        config = Config.from_dict(
+            {
+                "exclude_rulesets": {"common": ["**/.DS_Store"]},
+                "tools": {
+                    "t": {
+                        "source": str(tmp_path),
+                        "target": str(tmp_path),
+                        "include": ["*.md"],
+                        "exclude": ["*.log"],
+                        "exclude_rulesets": ["common"],
+                    }
+                },
+            }
+        )
+
+        tool = config.tools["t"]
+        assert tool.include == ("*.md",)
+        assert tool.exclude == ("**/.DS_Store", "*.log")
+
     def test_exclude_rulesets_multiple(self, tmp_path):
         """Test using multiple rulesets."""
         source = tmp_path / "source"
@@ -0,0 +1,89 @@
+"""Tests for diff module."""
+
+from sync_agentic_tools.diff import (
+    count_diff_lines,
+    count_diff_lines_from_strings,
+    generate_diff_between_strings,
+    generate_unified_diff,
+)
+
+
+class TestGenerateUnifiedDiff:
+    """Test unified diff generation between files."""
+
+    def test_counts_additions_and_deletions(self, tmp_path):
+        """Test added and removed lines are counted."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("one\ntwo\nthree\n")
+        file2.write_text("one\nTWO\nthree\nfour\n")
+
+        diff, stats = generate_unified_diff(file1, file2)
+
+        assert diff[0].startswith("---")
+        assert diff[1].startswith("+++")
+        assert stats.additions == 2
+        assert stats.deletions == 1
+        assert stats.total_changes == 3
+
+    def test_identical_files(self, tmp_path):
+        """Test identical files produce an empty diff."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("same\n")
+        file2.write_text("same\n")
+
+        diff, stats = generate_unified_diff(file1, file2)
+
+        assert diff == []
+        assert stats.change_summary == "no changes"
+
+
+class TestGenerateDiffBetweenStrings:
+    """Test unified diff generation between strings."""
+
+    def test_counts_additions_and_deletions(self):
+        """Test added and removed lines are counted."""
+        _, stats = generate_diff_between_strings("a\nb\n", "a\nc\nd\n")
+
+        assert stats.additions == 2
+        assert stats.deletions == 1
+
+    def test_lines_resembling_headers_are_counted(self):
+        """Test content lines starting with ++ or -- aren't mistaken for headers."""
+        _, stats = generate_diff_between_strings("--x\nkeep\n", "keep\n++y\n")
+
+        assert stats.additions == 1
+        assert stats.deletions == 1
+
+
+class TestCountDiffLines:
+    """Test counting diff lines."""
+
+    def test_count_diff_lines(self, tmp_path):
+        """Test counts match the full diff stats."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("one\ntwo\nthree\n")
+        file2.write_text("zero\none\nthree\n")
+
+        stats = count_diff_lines(file1, file2)
+
+        assert stats == generate_unified_diff(file1, file2)[1]
+        assert stats.change_summary == "+1 -1"
+
+    def test_count_diff_lines_from_strings(self):
+        """Test counting changes between strings."""
+        stats = count_diff_lines_from_strings("a\nb\n", "a\nb\nc\n")
+
+        assert stats.additions == 1
+        assert stats.deletions == 0
+
+    def test_counts_match_generated_diff(self):
+        """Test counting agrees with the stats of a full diff."""
+        text1 = "".join(f"line {i}\n" for i in range(200))
+        text2 = "".join(f"line {i * 2}\n" for i in range(150)) + "extra\n"
+
+        _, diff_stats = generate_diff_between_strings(text1, text2)
+
+        assert count_diff_lines_from_strings(text1, text2) == diff_stats
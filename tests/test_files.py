@@ -1,12 +1,20 @@
 """Tests for files module."""
 
+import hashlib
+import mmap
+import os
 
 import pytest
 
+from sync_agentic_tools import files
 from sync_agentic_tools.files import (
+    CHECKSUM_ALGORITHM,
     FileMetadata,
     compute_checksum,
+    copy_and_hash,
+    copy_file_data,
     count_lines,
+    file_matches_checksum,
     files_are_identical,
     is_text_file,
     read_file_lines,
@@ -47,7 +55,7 @@ class TestComputeChecksum:
         test_file.write_text("test content")
 
         checksum = compute_checksum(test_file)
-        assert checksum.startswith("sha256:")
+        assert checksum.startswith(f"{CHECKSUM_ALGORITHM}:")
         # SHA256 hex digest is 64 characters
         assert len(checksum.split(":")[1]) == 64
 
@@ -57,7 +65,124 @@ class TestComputeChecksum:
         binary_file.write_bytes(b"\x00\x01\x02\x03\xff\xfe\xfd")
 
         checksum = compute_checksum(binary_file)
-        assert checksum.startswith("sha256:")
+        assert checksum.startswith(f"{CHECKSUM_ALGORITHM}:")
+
+    def test_empty_and_small_file_checksums(self, tmp_path):
+        """Test files read in a single call hash correctly, including empty files."""
+        for data in (b"", b"small config\n", b"x" * 4096):
+            small_file = tmp_path / "small.bin"
+            small_file.write_bytes(data)
+
+            assert compute_checksum(small_file, "sha256") == f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+    def test_multi_chunk_file_checksum(self, tmp_path):
+        """Test files larger than the read buffer hash correctly."""
+        data = bytes(range(256)) * 10000
+        large_file = tmp_path / "large.bin"
+        large_file.write_bytes(data)
+
+        assert compute_checksum(large_file, "sha256") == f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+    def test_large_file_checksum_without_mmap(self, tmp_path, monkeypatch):
+        """Test large files fall back to chunked reads when mmap fails."""
+        data = bytes(range(256)) * 10000
+        large_file = tmp_path / "large.bin"
+        large_file.write_bytes(data)
+
+        def failing_mmap(*args, **kwargs):
+            raise OSError("mmap not supported")
+
+        monkeypatch.setattr(mmap, "mmap", failing_mmap)
+
+        assert compute_checksum(large_file, "sha256") == f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+    @pytest.mark.skipif(not hasattr(os, "O_NOATIME"), reason="O_NOATIME not supported")
+    def test_checksum_of_file_owned_by_another_user(self, tmp_path, monkeypatch):
+        """Test files that can't be opened with O_NOATIME are still hashed."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+        real_open = os.open
+
+        def open_without_noatime(path, flags, *args):
+            if flags & os.O_NOATIME:
+                raise PermissionError("not the owner")
+            return real_open(path, flags, *args)
+
+        monkeypatch.setattr(os, "open", open_without_noatime)
+
+        assert compute_checksum(test_file, "sha256") == (
+            f"sha256:{hashlib.sha256(b'content').hexdigest()}"
+        )
+
+
+    def test_unchanged_file_not_rehashed(self, tmp_path, monkeypatch):
+        """Test an old, unchanged file's checksum is reused while a modified one is rehashed."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+        os.utime(test_file, ns=(0, 1_000_000_000))
+        hashed = []
+        real_hash = files._hash_open_file
+        monkeypatch.setattr(
+            files, "_hash_open_file", lambda f, *args: hashed.append(f) or real_hash(f, *args)
+        )
+
+        first = compute_checksum(test_file)
+        assert compute_checksum(test_file) == first
+        assert FileMetadata.from_file(test_file, tmp_path).checksum == first
+        assert len(hashed) == 1
+
+        test_file.write_text("changed")
+        os.utime(test_file, ns=(0, 2_000_000_000))
+
+        assert compute_checksum(test_file) != first
+        assert len(hashed) == 2
+
+    def test_recently_modified_file_not_cached(self, tmp_path):
+        """Test a same-size rewrite within timestamp granularity is still detected."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("aaaa")
+        compute_checksum(test_file, "sha256")
+        mtime_ns = test_file.stat().st_mtime_ns
+
+        test_file.write_text("bbbb")
+        os.utime(test_file, ns=(mtime_ns, mtime_ns))
+
+        assert compute_checksum(test_file, "sha256") == (
+            f"sha256:{hashlib.sha256(b'bbbb').hexdigest()}"
+        )
+
+
+class TestFileMatchesChecksum:
+    """Test checking files against stored checksums."""
+
+    def test_uses_stored_algorithm(self, tmp_path):
+        """Test checksums recorded with another algorithm are recomputed with it."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+
+        assert file_matches_checksum(test_file, f"sha1:{hashlib.sha1(b'content').hexdigest()}")
+        assert file_matches_checksum(test_file, f"sha256:{hashlib.sha256(b'content').hexdigest()}")
+        assert not file_matches_checksum(test_file, f"sha256:{hashlib.sha256(b'other').hexdigest()}")
+
+    def test_unavailable_algorithm_never_matches(self, tmp_path, monkeypatch):
+        """Test checksums from an algorithm missing here count as changed."""
+        monkeypatch.setattr(files, "blake3", None)
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+
+        assert not file_matches_checksum(test_file, "blake3:abc")
+        assert not file_matches_checksum(test_file, "nosuchhash:abc")
+
+    def test_blake3_checksum(self, tmp_path):
+        """Test blake3 checksums match the blake3 package's digest."""
+        blake3 = pytest.importorskip("blake3")
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+
+        checksum = compute_checksum(test_file, "blake3")
+
+        assert checksum == f"blake3:{blake3.blake3(b'content').hexdigest()}"
+        assert file_matches_checksum(test_file, checksum)
 
 
 class TestFilesAreIdentical:
@@ -92,6 +217,19 @@ class TestFilesAreIdentical:
         # Should return False quickly based on size difference
         assert not files_are_identical(file1, file2)
 
+    def test_same_size_large_files(self, tmp_path):
+        """Test large same-size files are compared by content."""
+        data = bytes(range(256)) * 10000
+        file1 = tmp_path / "file1.bin"
+        file2 = tmp_path / "file2.bin"
+        file3 = tmp_path / "file3.bin"
+        file1.write_bytes(data)
+        file2.write_bytes(data)
+        file3.write_bytes(data[:-1] + b"\x00")
+
+        assert files_are_identical(file1, file2)
+        assert not files_are_identical(file1, file3)
+
     def test_nonexistent_file(self, tmp_path):
         """Test comparison with nonexistent file."""
         file1 = tmp_path / "file1.txt"
@@ -281,6 +419,13 @@ class TestIsTextFile:
 
         assert is_text_file(test_file)
 
+    def test_invalid_utf8_without_null_bytes(self, tmp_path):
+        """Test non-ASCII bytes that aren't valid UTF-8 are treated as binary."""
+        test_file = tmp_path / "latin1.txt"
+        test_file.write_bytes("café".encode("latin-1"))
+
+        assert not is_text_file(test_file)
+
 
 class TestFileMetadata:
     """Test FileMetadata class."""
@@ -296,7 +441,7 @@ class TestFileMetadata:
         assert metadata.path == test_file
         assert metadata.relative_path == "test.txt"
         assert metadata.size == len(content.encode())
-        assert metadata.checksum.startswith("sha256:")
+        assert metadata.checksum.startswith(f"{CHECKSUM_ALGORITHM}:")
         assert metadata.mtime is not None
 
     def test_from_nested_file(self, tmp_path):
@@ -309,3 +454,74 @@ class TestFileMetadata:
         metadata = FileMetadata.from_file(test_file, tmp_path)
 
         assert metadata.relative_path == "subdir/test.txt"
+
+
+class TestCopyFileData:
+    """Test raw file content copying."""
+
+    def test_copies_content(self, tmp_path):
+        """Test file content is copied exactly."""
+        source = tmp_path / "source.bin"
+        dest = tmp_path / "dest.bin"
+        content = bytes(range(256)) * 5000
+        source.write_bytes(content)
+
+        copy_file_data(source, dest)
+
+        assert dest.read_bytes() == content
+
+    def test_overwrites_existing_dest(self, tmp_path):
+        """Test a longer existing destination is truncated."""
+        source = tmp_path / "source.txt"
+        dest = tmp_path / "dest.txt"
+        source.write_text("short")
+        dest.write_text("much longer existing content")
+
+        copy_file_data(source, dest)
+
+        assert dest.read_text() == "short"
+
+    def test_empty_file(self, tmp_path):
+        """Test copying an empty file."""
+        source = tmp_path / "empty.txt"
+        dest = tmp_path / "dest.txt"
+        source.write_text("")
+
+        copy_file_data(source, dest)
+
+        assert dest.exists()
+        assert dest.read_text() == ""
+
+
+    def test_falls_back_when_copy_file_range_fails(self, tmp_path, monkeypatch):
+        """Test unsupported in-kernel copies fall back to a regular copy over a longer dest."""
+        source = tmp_path / "source.txt"
+        dest = tmp_path / "dest.txt"
+        source.write_text("new")
+        dest.write_text("much longer old content")
+
+        def failing_copy_file_range(*args):
+            raise OSError("cross-device copy")
+
+        monkeypatch.setattr(os, "copy_file_range", failing_copy_file_range, raising=False)
+
+        copy_file_data(source, dest)
+
+        assert dest.read_text() == "new"
+
+
+class TestCopyAndHash:
+    """Test copying with checksum computation."""
+
+    def test_checksum_matches_compute_checksum(self, tmp_path):
+        """Test the returned checksum matches compute_checksum of the source."""
+        source = tmp_path / "source.bin"
+        dest = tmp_path / "dest.bin"
+        content = b"abc" * 500000
+        source.write_bytes(content)
+
+        size, checksum = copy_and_hash(source, dest)
+
+        assert size == len(content)
+        assert checksum == compute_checksum(source)
+        assert dest.read_bytes() == content
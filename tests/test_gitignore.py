@@ -105,6 +105,33 @@ node_modules/
         patterns = parse_gitignore(gitignore)
         assert patterns == []
 
+    def test_reparses_modified_file(self, tmp_path):
+        """Test cached patterns are refreshed when the file changes."""
+        gitignore = tmp_path / ".gitignore"
+        gitignore.write_text("*.log\n")
+        assert parse_gitignore(gitignore) == ["**/*.log"]
+
+        gitignore.write_text("*.log\n*.tmp\n")
+
+        assert parse_gitignore(gitignore) == ["**/*.log", "**/*.tmp"]
+
+    def test_returned_list_is_a_copy(self, tmp_path):
+        """Test mutating the result doesn't affect later calls."""
+        gitignore = tmp_path / ".gitignore"
+        gitignore.write_text("*.log\n")
+
+        parse_gitignore(gitignore).append("extra")
+
+        assert parse_gitignore(gitignore) == ["**/*.log"]
+
+    def test_prefix_mode_cached_separately(self, tmp_path):
+        """Test global and scoped parses of the same file don't share results."""
+        gitignore = tmp_path / ".gitignore"
+        gitignore.write_text("*.log\n")
+
+        assert parse_gitignore(gitignore, add_global_prefix=True) == ["**/*.log"]
+        assert parse_gitignore(gitignore, add_global_prefix=False) == ["*.log"]
+
 
 class TestCollectGitignorePatterns:
     """Test collecting gitignore patterns from directory tree."""
@@ -135,6 +162,31 @@ class TestCollectGitignorePatterns:
         # Nested pattern should be prefixed or kept as global
         assert any("*.tmp" in p for p in patterns)
 
+    def test_deeply_nested_gitignore(self, tmp_path):
+        """Test gitignore files several levels down are scoped to their directory."""
+        deep = tmp_path / "a" / "b"
+        deep.mkdir(parents=True)
+        (deep / ".gitignore").write_text("*.tmp\n")
+
+        patterns = collect_gitignore_patterns(tmp_path, respect_nested=True)
+
+        assert patterns == ["a/b/**/*.tmp"]
+
+    def test_skips_git_and_symlinked_dirs(self, tmp_path):
+        """Test .git directories and symlinked directories aren't searched."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / ".gitignore").write_text("*.git\n")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / ".gitignore").write_text("*.out\n")
+        base = tmp_path / "base"
+        base.mkdir()
+        (base / ".git").mkdir()
+        (base / ".git" / ".gitignore").write_text("*.git\n")
+        (base / "link").symlink_to(outside)
+
+        assert collect_gitignore_patterns(base, respect_nested=True) == []
+
     def test_no_gitignore(self, tmp_path):
         """Test collecting patterns when no gitignore exists."""
         patterns = collect_gitignore_patterns(tmp_path)
@@ -1,11 +1,21 @@
 """Tests for propagation transforms."""
 
+import os
+from pathlib import Path
+
 import pytest
 
+from sync_agentic_tools import propagate, ui
+from sync_agentic_tools.config import Config, PropagationRule, PropagationTarget, Settings
 from sync_agentic_tools.propagate import (
+    _walk_files,
     apply_remove_markdown_sections_transform,
     apply_remove_xml_sections_transform,
+    apply_sed_transform,
     apply_transform,
+    find_orphaned_files,
+    propagate_file,
+    propagate_single_file,
 )
 
 
@@ -117,6 +127,29 @@ class TestRemoveMarkdownSections:
         result = apply_remove_markdown_sections_transform(content, [])
         assert result == content
 
+    def test_content_without_headings_returned_unchanged(self):
+        """Test content with no headings at all skips the heading scans."""
+        content = "Just prose.\n"
+        assert apply_remove_markdown_sections_transform(content, ["Heading"]) is content
+
+    def test_sections_processed_in_list_order(self):
+        """Test a nested section listed after its parent falls back to its next occurrence."""
+        content = "# A\n## B\nnested\n# Keep\ntext\n## B\nlater\n# End\n"
+
+        parent_first = apply_remove_markdown_sections_transform(content, ["A", "B"])
+        nested_first = apply_remove_markdown_sections_transform(content, ["B", "A"])
+
+        assert parent_first == "# Keep\ntext\n\n# End\n"
+        assert nested_first == "# Keep\ntext\n## B\nlater\n# End\n"
+
+    def test_heading_prefix_names_distinguished(self):
+        """Test a section name that prefixes another heading doesn't match it."""
+        content = "## Foo Bar\nbar\n## Foo\nfoo\n"
+
+        result = apply_remove_markdown_sections_transform(content, ["Foo"])
+
+        assert result == "## Foo Bar\nbar\n\n"
+
     def test_higher_level_heading_terminates_section(self):
         """A ## heading should terminate a ### section."""
         content = (
@@ -203,6 +236,58 @@ class TestRemoveMarkdownSections:
         assert "### Keep" in result
         assert "### After" in result
 
+    def test_marker_without_heading_text_doesnt_end_section(self):
+        """A bare # line followed by text on the next line isn't a heading."""
+        content = "## Remove\nText.\n#\nStill removed.\n## Keep\nKept.\n"
+        result = apply_remove_markdown_sections_transform(content, ["Remove"])
+        assert result == "## Keep\nKept.\n"
+
+
+class TestSedTransform:
+    """Tests for apply_sed_transform."""
+
+    def test_global_replacement(self):
+        """All matches are replaced with the g flag."""
+        assert apply_sed_transform("a-a-a", "s/a/b/g") == "b-b-b"
+
+    def test_single_replacement(self):
+        """Only the first match is replaced without the g flag."""
+        assert apply_sed_transform("a-a-a", "s/a/b/") == "b-a-a"
+
+    def test_regex_with_backreference(self):
+        """Regex patterns and group references are supported."""
+        assert apply_sed_transform("Claude Code", r"s/(\w+) Code/\1 Tool/g") == "Claude Tool"
+
+    def test_literal_pattern(self):
+        """Literal patterns replace exact text only."""
+        content = "Claude Code and claude code"
+        assert apply_sed_transform(content, "s/Claude Code/Cline/g") == "Cline and claude code"
+
+    def test_metacharacters_keep_regex_meaning(self):
+        """Patterns with regex metacharacters are still treated as regexes."""
+        assert apply_sed_transform("abc a.c", "s/a.c/X/g") == "X X"
+
+    def test_replacement_escapes_are_processed(self):
+        """Backslash escapes in the replacement aren't inserted literally."""
+        assert apply_sed_transform("a b", r"s/ /\n/g") == "a\nb"
+
+    def test_alternate_delimiter(self):
+        """Delimiters other than / are supported."""
+        assert apply_sed_transform("path/to/file", "s|/|.|g") == "path.to.file"
+
+    def test_invalid_pattern_raises(self):
+        """Patterns that aren't substitutions are rejected."""
+        with pytest.raises(ValueError, match="Invalid sed pattern"):
+            apply_sed_transform("content", "y/a/b/")
+
+    def test_slow_pattern_times_out(self, monkeypatch):
+        """Patterns running past the time limit fail under the regex module."""
+        pytest.importorskip("regex")
+        monkeypatch.setattr(propagate, "_USER_PATTERN_TIMEOUT", 1e-9)
+
+        with pytest.raises(TimeoutError):
+            apply_sed_transform("a" * 1_000_000, "s/a./b/g")
+
 
 class TestRemoveXmlSections:
     """Tests for apply_remove_xml_sections_transform."""
@@ -221,6 +306,26 @@ class TestRemoveXmlSections:
         assert "Before." in result
         assert "After." in result
 
+    def test_removes_multiple_sections(self):
+        content = "<A>one</A> keep <B attr='x'>two</B> <C/> end"
+        result = apply_remove_xml_sections_transform(content, ["A", "B", "C"])
+        assert result == " keep   end"
+
+    def test_close_tag_must_match_open_tag(self):
+        content = "<A>text</B> kept"
+        result = apply_remove_xml_sections_transform(content, ["A", "B"])
+        assert result == content
+
+    def test_section_names_are_literal(self):
+        content = "<A.B>x</A.B> <AxB>y</AxB>"
+        result = apply_remove_xml_sections_transform(content, ["A.B"])
+        assert result == " <AxB>y</AxB>"
+
+    def test_content_without_tags_returned_unchanged(self):
+        """Content with none of the section tags is returned as-is."""
+        content = "Plain text with <other>tags</other>\n"
+        assert apply_remove_xml_sections_transform(content, ["SECTION"]) is content
+
 
 class TestApplyTransform:
     """Tests for apply_transform dispatcher."""
@@ -249,3 +354,363 @@ class TestApplyTransform:
     def test_unknown_type_raises(self):
         with pytest.raises(ValueError, match="Unknown transform type"):
             apply_transform("content", {"type": "bogus"})
+
+
+class TestPropagateSingleFile:
+    """Tests for propagate_single_file."""
+
+    def test_writes_content(self, tmp_path):
+        """Test content is written to a new target file."""
+        source = tmp_path / "SOURCE.md"
+        propagate_single_file(source, tmp_path / "target", Path("TARGET.md"), "Cline rules\n", dry_run=False)
+        assert (tmp_path / "target" / "TARGET.md").read_text() == "Cline rules\n"
+
+    def test_unchanged_target_not_rewritten(self, tmp_path):
+        target = tmp_path / "TARGET.md"
+        target.write_text("same\n")
+        os.utime(target, (1_000_000, 1_000_000))
+
+        propagate_single_file(tmp_path / "S.md", tmp_path, Path("TARGET.md"), "same\n", False)
+
+        assert target.stat().st_mtime == 1_000_000
+
+    def test_same_size_different_content_rewritten(self, tmp_path):
+        target = tmp_path / "TARGET.md"
+        target.write_text("old!\n")
+
+        propagate_single_file(tmp_path / "S.md", tmp_path, Path("TARGET.md"), "new!\n", False)
+
+        assert target.read_text() == "new!\n"
+
+
+    def test_existing_target_keeps_permissions(self, tmp_path):
+        """Test rewriting a target preserves its mode."""
+        target = tmp_path / "TARGET.md"
+        target.write_text("old\n")
+        target.chmod(0o640)
+
+        propagate_single_file(tmp_path / "S.md", tmp_path, Path("TARGET.md"), "new\n", False)
+
+        assert target.read_text() == "new\n"
+        assert target.stat().st_mode & 0o777 == 0o640
+
+    def test_symlinked_target_written_through(self, tmp_path):
+        """Test a symlinked target updates the file it points to."""
+        real = tmp_path / "real.md"
+        real.write_text("old\n")
+        (tmp_path / "link.md").symlink_to(real)
+
+        propagate_single_file(tmp_path / "S.md", tmp_path, Path("link.md"), "new\n", False)
+
+        assert (tmp_path / "link.md").is_symlink()
+        assert real.read_text() == "new\n"
+
+    def test_failed_write_keeps_old_content(self, tmp_path, monkeypatch):
+        """Test a failed write leaves the target intact and no temp file behind."""
+        target = tmp_path / "TARGET.md"
+        target.write_text("old\n")
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+
+        propagate_single_file(tmp_path / "S.md", tmp_path, Path("TARGET.md"), "new\n", False)
+
+        assert target.read_text() == "old\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["TARGET.md"]
+
+class TestPropagateFile:
+    """Tests for propagate_file."""
+
+    def _config(self):
+        return Config(settings=Settings(), tools={})
+
+    def test_shared_transforms_applied_once(self, tmp_path, monkeypatch):
+        """Test targets with identical transforms reuse the transformed content."""
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "RULES.md").write_text("Claude rules\n")
+        transforms = [{"type": "sed", "pattern": "s/Claude/Cline/g"}]
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(dest_path=str(tmp_path / "a"), transforms=transforms),
+                PropagationTarget(dest_path=str(tmp_path / "b"), transforms=list(transforms)),
+                PropagationTarget(dest_path=str(tmp_path / "c")),
+            ],
+        )
+        calls = []
+        original = propagate.apply_transform
+
+        def counting_apply_transform(content, transform):
+            calls.append(transform)
+            return original(content, transform)
+
+        monkeypatch.setattr(propagate, "apply_transform", counting_apply_transform)
+
+        propagate_file(self._config(), rule)
+
+        assert len(calls) == 1
+        assert (tmp_path / "a" / "RULES.md").read_text() == "Cline rules\n"
+        assert (tmp_path / "b" / "RULES.md").read_text() == "Cline rules\n"
+        assert (tmp_path / "c" / "RULES.md").read_text() == "Claude rules\n"
+
+    def test_failed_transform_skips_target(self, tmp_path):
+        """Test a target whose transform fails isn't written."""
+        source = tmp_path / "SOURCE.md"
+        source.write_text("text\n")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(dest_path=str(tmp_path / "bad.md"), transforms=[{"type": "unknown"}]),
+                PropagationTarget(dest_path=str(tmp_path / "good.md")),
+            ],
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert not (tmp_path / "bad.md").exists()
+        assert (tmp_path / "good.md").read_text() == "text\n"
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_directory_propagation(self, tmp_path, parallel):
+        """Test every directory file reaches the target, with or without threads."""
+        source = tmp_path / "src"
+        (source / "nested").mkdir(parents=True)
+        for i in range(20):
+            (source / "nested" / f"file{i}.md").write_text(f"Claude {i}\n")
+        (source / ".hidden.md").write_text("Claude\n")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(
+                    dest_path=str(tmp_path / "dest"),
+                    transforms=[{"type": "sed", "pattern": "s/Claude/Cline/"}],
+                )
+            ],
+        )
+        config = Config(settings=Settings(parallel_propagation=parallel), tools={})
+
+        propagate_file(config, rule, dry_run=True)
+        assert not (tmp_path / "dest").exists()
+
+        propagate_file(config, rule)
+
+        for i in range(20):
+            assert (tmp_path / "dest" / "nested" / f"file{i}.md").read_text() == f"Cline {i}\n"
+        assert not (tmp_path / "dest" / ".hidden.md").exists()
+
+    def test_target_directories_created_once(self, tmp_path, monkeypatch):
+        """Test files sharing a target directory don't each call mkdir."""
+        source = tmp_path / "src"
+        (source / "sub").mkdir(parents=True)
+        for i in range(10):
+            (source / "sub" / f"file{i}.md").write_text("x")
+        (tmp_path / "dest" / "sub").mkdir(parents=True)
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[PropagationTarget(dest_path=str(tmp_path / "dest"))],
+        )
+        mkdirs = []
+        original_mkdir = Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            mkdirs.append(self)
+            return original_mkdir(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+
+        propagate_file(Config(settings=Settings(parallel_propagation=False), tools={}), rule)
+
+        assert mkdirs == [tmp_path / "dest" / "sub"]
+        assert len(list((tmp_path / "dest" / "sub").iterdir())) == 10
+
+    def test_orphans_compared_against_source_files(self, tmp_path, monkeypatch):
+        """Test only target files absent from the source are offered as orphans."""
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "same.md").write_text("same\n")
+        (source / "bad.md").write_text("text\n")
+        dest = tmp_path / "dest"
+        dest.mkdir()
+        (dest / "same.md").write_text("same\n")
+        (dest / "bad.md").write_text("old\n")
+        (dest / "stale.md").write_text("x")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(dest_path=str(dest), transforms=[{"type": "unknown"}]),
+                PropagationTarget(tool="missing", target_file="x"),
+            ],
+        )
+        prompts = []
+        errors = []
+        monkeypatch.setattr(ui, "show_orphaned_files_prompt", lambda count: prompts.append(count) or "delete_all")
+        monkeypatch.setattr(propagate, "show_error", errors.append)
+
+        propagate_file(self._config(), rule)
+
+        # Failed transforms don't make the target's copy an orphan
+        assert prompts == [1]
+        assert sorted(p.name for p in dest.iterdir()) == ["bad.md", "same.md"]
+        assert errors.count("Target tool not found: missing") == 1
+
+    def test_excluded_files_not_propagated(self, tmp_path):
+        """Test source files matching an exclude pattern by path or name are skipped."""
+        source = tmp_path / "src"
+        (source / "drafts").mkdir(parents=True)
+        (source / "keep.md").write_text("x")
+        (source / "skip.tmp").write_text("x")
+        (source / "drafts" / "idea.md").write_text("x")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[PropagationTarget(dest_path=str(tmp_path / "dest"))],
+            exclude=["*.tmp", "drafts/*"],
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert sorted(p.name for p in (tmp_path / "dest").rglob("*") if p.is_file()) == ["keep.md"]
+
+    def test_untransformed_target_copied_verbatim(self, tmp_path):
+        """Test targets without transforms get the source bytes unchanged."""
+        source = tmp_path / "SOURCE.md"
+        source.write_bytes(b"caf\xe9\r\nline\r\n")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(dest_path=str(tmp_path / "copy.md")),
+                PropagationTarget(
+                    dest_path=str(tmp_path / "sed.md"),
+                    transforms=[{"type": "sed", "pattern": "s/line/LINE/"}],
+                ),
+            ],
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert (tmp_path / "copy.md").read_bytes() == b"caf\xe9\r\nline\r\n"
+        assert not (tmp_path / "sed.md").exists()
+
+    def test_transformed_target_uses_universal_newlines(self, tmp_path):
+        """Test transformed content is decoded with newlines normalised."""
+        source = tmp_path / "SOURCE.md"
+        source.write_bytes(b"one\r\ntwo\rthree\n")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[
+                PropagationTarget(
+                    dest_path=str(tmp_path / "sed.md"),
+                    transforms=[{"type": "sed", "pattern": "s/two/2/"}],
+                )
+            ],
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert (tmp_path / "sed.md").read_text() == "one\n2\nthree\n"
+
+    def test_large_source_streamed_to_untransformed_targets(self, tmp_path, monkeypatch):
+        """Test large sources are copied without being read unless a target transforms them."""
+        monkeypatch.setattr(propagate, "_STREAM_THRESHOLD", 8)
+        reads = []
+        original = propagate._read_source
+
+        def counting_read_source(source_file):
+            reads.append(source_file)
+            return original(source_file)
+
+        monkeypatch.setattr(propagate, "_read_source", counting_read_source)
+        source = tmp_path / "SOURCE.md"
+        source.write_text("Claude says hello\n")
+        rule = PropagationRule(
+            source_path=str(source),
+            targets=[PropagationTarget(dest_path=str(tmp_path / "copy.md"))],
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert (tmp_path / "copy.md").read_text() == "Claude says hello\n"
+        assert reads == []
+
+        rule.targets.append(
+            PropagationTarget(
+                dest_path=str(tmp_path / "sed.md"),
+                transforms=[{"type": "sed", "pattern": "s/Claude/Cline/"}],
+            )
+        )
+
+        propagate_file(self._config(), rule)
+
+        assert (tmp_path / "sed.md").read_text() == "Cline says hello\n"
+        assert reads == [source]
+
+
+class TestWalkFiles:
+    """Tests for _walk_files."""
+
+    def test_yields_relative_paths_of_files(self, tmp_path):
+        """Test nested files are found with paths relative to the root."""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "top.md").write_text("x")
+        (tmp_path / "a" / "b" / "deep.md").write_text("x")
+
+        found = {relative: entry.path for relative, entry in _walk_files(tmp_path)}
+
+        assert found == {
+            "top.md": str(tmp_path / "top.md"),
+            os.path.join("a", "b", "deep.md"): str(tmp_path / "a" / "b" / "deep.md"),
+        }
+
+    def test_skips_hidden_entries_and_symlinked_dirs(self, tmp_path):
+        """Test hidden files, hidden subtrees and symlinked directories are skipped."""
+        root = tmp_path / "root"
+        (root / ".hidden").mkdir(parents=True)
+        (root / ".hidden" / "file.md").write_text("x")
+        (root / ".dotfile").write_text("x")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "file.md").write_text("x")
+        (root / "link").symlink_to(outside)
+        (root / "file-link.md").symlink_to(outside / "file.md")
+
+        assert [relative for relative, _ in _walk_files(root)] == ["file-link.md"]
+
+    def test_missing_root(self, tmp_path):
+        """Test a missing directory yields nothing."""
+        assert list(_walk_files(tmp_path / "missing")) == []
+
+
+class TestFindOrphanedFiles:
+    """Tests for find_orphaned_files."""
+
+    def test_reports_files_not_propagated(self, tmp_path):
+        """Test target files missing from the propagated set are orphans."""
+        target = tmp_path / "target"
+        (target / "sub").mkdir(parents=True)
+        (target / "kept.md").write_text("x")
+        (target / "sub" / "kept.md").write_text("x")
+        (target / "sub" / "stale.md").write_text("x")
+        (target / ".hidden.md").write_text("x")
+
+        propagated = {"kept.md", os.path.join("sub", "kept.md")}
+        orphaned = find_orphaned_files(tmp_path / "src", target, [], propagated)
+
+        assert orphaned == [target / "sub" / "stale.md"]
+
+    def test_excluded_files_not_reported(self, tmp_path):
+        """Test files matching the exclude patterns aren't orphans."""
+        target = tmp_path / "target"
+        (target / "cache").mkdir(parents=True)
+        (target / "notes.log").write_text("x")
+        (target / "cache" / "data.bin").write_text("x")
+        (target / "stale.md").write_text("x")
+
+        orphaned = find_orphaned_files(tmp_path / "src", target, ["*.log", "cache/*"], set())
+
+        assert orphaned == [target / "stale.md"]
+
+    def test_missing_target(self, tmp_path):
+        """Test a missing target directory has no orphans."""
+        assert find_orphaned_files(tmp_path, tmp_path / "missing", [], set()) == []
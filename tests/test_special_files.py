@@ -0,0 +1,248 @@
+"""Tests for special_files module."""
+
+import json
+import os
+
+import pytest
+
+from sync_agentic_tools import special_files
+from sync_agentic_tools.special_files import (
+    _build_path_trie,
+    _filter_dict_by_paths,
+    _parse_jsonc,
+    extract_json_data,
+    extract_json_keys,
+    merge_json_keys,
+    process_special_file,
+)
+
+
+@pytest.fixture(params=["pyjson5", "fallback"])
+def jsonc_parser(request, monkeypatch):
+    """Run a test with pyjson5 (when installed) and with the regex fallback."""
+    if request.param == "pyjson5":
+        pytest.importorskip("pyjson5")
+    else:
+        monkeypatch.setattr(special_files, "pyjson5", None)
+
+
+@pytest.mark.usefixtures("jsonc_parser")
+class TestParseJsonc:
+    """Test JSONC parsing."""
+
+    def test_plain_json(self):
+        """Test JSON without comments parses unchanged."""
+        assert _parse_jsonc('{"a": 1, "b": [1, 2]}') == {"a": 1, "b": [1, 2]}
+
+    def test_strips_comments(self):
+        """Test line and block comments are removed."""
+        text = '// header\n{\n  /* block\n  comment */ "a": 1, // trailing\n  "b": 2\n}\n'
+        assert _parse_jsonc(text) == {"a": 1, "b": 2}
+
+    def test_comment_markers_inside_strings_kept(self):
+        """Test comment-like sequences inside strings are preserved."""
+        text = '{"url": "https://example.com", "glob": "src/*.py */", "quote": "a \\" // b"}'
+        assert _parse_jsonc(text) == {
+            "url": "https://example.com",
+            "glob": "src/*.py */",
+            "quote": 'a " // b',
+        }
+
+    def test_nested_comment_markers(self):
+        """Test comment markers inside other comments don't start new comments."""
+        text = '{\n  /* see // below */ "a": 1, // has /* inside\n  "b": "/*"\n}'
+        assert _parse_jsonc(text) == {"a": 1, "b": "/*"}
+
+    def test_trailing_commas(self):
+        """Test trailing commas before closing brackets are removed."""
+        assert _parse_jsonc('{"a": [1, 2,], "b": {"c": 3,},}') == {"a": [1, 2], "b": {"c": 3}}
+
+    def test_trailing_comma_before_comment(self):
+        """Test a trailing comma followed by a comment before the bracket is removed."""
+        assert _parse_jsonc('{"a": [1, 2, // last\n], /* end */}') == {"a": [1, 2]}
+
+    def test_plain_json_keeps_comma_bracket_in_strings(self):
+        """Test strings containing ",}" survive when the text is already valid JSON."""
+        assert _parse_jsonc('{"a": "x,}", "b": "y, ]"}') == {"a": "x,}", "b": "y, ]"}
+
+    def test_invalid_json_raises(self):
+        """Test invalid content still raises a JSON decode error."""
+        with pytest.raises(json.JSONDecodeError):
+            _parse_jsonc('{"a": }')
+
+
+class TestFilterDictByPaths:
+    """Test filtering nested dicts by dotted include paths."""
+
+    def test_nested_paths_keep_source_order(self):
+        """Test nested include paths keep only the matching branches, in source order."""
+        data = {"z": 1, "provider": {"other": 2, "llama": {"npm": "x", "url": "y"}}, "a": 3}
+        trie = _build_path_trie(("a", "provider.llama.npm", "z"))
+
+        result = _filter_dict_by_paths(data, trie)
+
+        assert result == {"z": 1, "provider": {"llama": {"npm": "x"}}, "a": 3}
+        assert list(result) == ["z", "provider", "a"]
+
+    def test_ancestor_path_includes_everything(self):
+        """Test an included ancestor wins over a more specific path, in either order."""
+        data = {"a": {"b": 1, "c": 2}}
+
+        for keys in (("a", "a.b"), ("a.b", "a")):
+            assert _filter_dict_by_paths(data, _build_path_trie(keys)) == data
+
+    def test_trie_reused_for_same_keys(self):
+        """Test the same include keys share one cached trie."""
+        assert _build_path_trie(("a.b", "c")) is _build_path_trie(("a.b", "c"))
+
+    def test_non_dict_values_not_traversed(self):
+        """Test paths through non-dict values and empty results are dropped."""
+        data = {"a": [1, 2], "b": {"c": 1}}
+
+        assert _filter_dict_by_paths(data, _build_path_trie(("a.x", "b.missing"))) == {}
+
+
+class TestExtractAndMerge:
+    """Test extracting keys and merging them into a destination."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_output_independent_of_orjson(self, tmp_path, monkeypatch, use_orjson):
+        """Test merged files are byte-identical with and without orjson."""
+        if not use_orjson:
+            monkeypatch.setattr(special_files, "orjson", None)
+        source = tmp_path / "settings.json"
+        source.write_text('{"model": "opus", "theme": "caf\u00e9 \u2615", "other": 1}', encoding="utf-8")
+        dest = tmp_path / "dest" / "settings.json"
+
+        extracted = extract_json_keys(source, ["theme", "model"])
+        merge_json_keys(dest, extracted, ["theme", "model"])
+
+        assert dest.read_bytes() == '{\n  "model": "opus",\n  "theme": "caf\u00e9 \u2615"\n}\n'.encode()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_large_integers_preserved(self, tmp_path, monkeypatch, use_orjson):
+        """Test integers wider than 64 bits are merged without losing precision."""
+        if not use_orjson:
+            monkeypatch.setattr(special_files, "orjson", None)
+        source = tmp_path / "settings.json"
+        source.write_text('{"id": 123456789012345678901234567890, "min": -9223372036854775809}')
+        dest = tmp_path / "dest.json"
+
+        merge_json_keys(dest, extract_json_keys(source, ["id", "min"]), ["id", "min"])
+
+        assert json.loads(dest.read_text()) == {
+            "id": 123456789012345678901234567890,
+            "min": -9223372036854775809,
+        }
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_non_finite_floats_preserved(self, tmp_path, monkeypatch, use_orjson):
+        """Test NaN and Infinity, accepted by the json module, survive a merge."""
+        if not use_orjson:
+            monkeypatch.setattr(special_files, "orjson", None)
+        source = tmp_path / "settings.json"
+        source.write_text('{"a": NaN, "b": Infinity, "c": 1.5}')
+        dest = tmp_path / "dest.json"
+
+        merge_json_keys(dest, extract_json_keys(source, ["a", "b", "c"]), ["a", "b", "c"])
+
+        assert dest.read_text() == '{\n  "a": NaN,\n  "b": Infinity,\n  "c": 1.5\n}\n'
+
+    def test_invalid_json_still_rejected(self, tmp_path):
+        """Test falling back to the json module still reports invalid JSON."""
+        source = tmp_path / "settings.json"
+        source.write_text('{"a": }')
+
+        with pytest.raises(ValueError):
+            extract_json_keys(source, ["a"])
+
+    def test_included_key_missing_from_source_removed_from_dest(self, tmp_path):
+        """Test a nested include path absent from the source is dropped from dest, siblings kept."""
+        dest = tmp_path / "dest.json"
+        dest.write_text('{"p": {"a": {"x": 1}, "b": 2, "keep": 3}}')
+
+        merge_json_keys(dest, '{"p": {"a": {"y": 2}}}', ["p.a", "p.b"])
+
+        assert json.loads(dest.read_text()) == {"p": {"a": {"y": 2}, "keep": 3}}
+
+    def test_unchanged_file_not_reparsed(self, tmp_path, monkeypatch):
+        """Test extraction from an old, unchanged file is reused until the file changes."""
+        source = tmp_path / "settings.json"
+        source.write_text('{"a": 1, "b": 2}')
+        os.utime(source, ns=(0, 1_000_000_000))
+        loaded = []
+        real_load = special_files._load_json_or_jsonc
+        monkeypatch.setattr(
+            special_files, "_load_json_or_jsonc", lambda path: loaded.append(path) or real_load(path)
+        )
+
+        assert extract_json_data(source, ["a"]) == {"a": 1}
+        assert extract_json_keys(source, ["a"]) == '{\n  "a": 1\n}'
+        assert extract_json_data(source, ["b"]) == {"b": 2}
+        assert len(loaded) == 2
+
+        source.write_text('{"a": 3, "b": 2}')
+        os.utime(source, ns=(0, 2_000_000_000))
+
+        assert extract_json_data(source, ["a"]) == {"a": 3}
+        assert len(loaded) == 3
+
+    def test_invalid_source_raises_value_error(self, tmp_path):
+        """Test unparseable sources are reported as ValueError."""
+        source = tmp_path / "settings.json"
+        source.write_text("{not json")
+
+        with pytest.raises(ValueError, match="Failed to extract keys"):
+            extract_json_keys(source, ["a"])
+
+
+class TestProcessSpecialFile:
+    """Test processing files with special handling."""
+
+    def test_extract_keys_merges_into_dest(self, tmp_path):
+        """Test included keys replace dest values while dest-only keys are kept."""
+        source = tmp_path / "settings.jsonc"
+        source.write_text('{\n  // comment\n  "permissions": {"allow": ["a"]},\n  "local": true,\n}\n')
+        dest = tmp_path / "settings.json"
+        dest.write_text('{"permissions": {"allow": ["old"], "deny": []}, "theme": "dark"}')
+
+        assert process_special_file(source, dest, "extract_keys", ["permissions"])
+
+        assert json.loads(dest.read_text()) == {"permissions": {"allow": ["a"]}, "theme": "dark"}
+
+    def test_nested_include_path_keeps_dest_siblings(self, tmp_path):
+        """Test a dotted include path replaces only its leaf and keeps dest-only siblings."""
+        source = tmp_path / "opencode.json"
+        source.write_text('{"provider": {"llama": {"npm": "new", "extra": 1}}}')
+        dest = tmp_path / "dest.json"
+        dest.write_text('{"provider": {"llama": {"npm": "old", "url": "u"}, "other": {}}, "x": 1}')
+
+        assert process_special_file(source, dest, "extract_keys", ["provider.llama.npm"])
+
+        assert json.loads(dest.read_text()) == {
+            "provider": {"llama": {"npm": "new", "url": "u"}, "other": {}},
+            "x": 1,
+        }
+
+    def test_extracted_data_not_round_tripped(self, tmp_path, monkeypatch):
+        """Test the extracted keys are serialised only once, when writing the dest."""
+        source = tmp_path / "settings.json"
+        source.write_text('{"a": 1, "b": 2}')
+        dest = tmp_path / "dest.json"
+        dumps_calls = []
+        real_dumps = special_files._dumps
+
+        def counting_dumps(data):
+            dumps_calls.append(data)
+            return real_dumps(data)
+
+        monkeypatch.setattr(special_files, "_dumps", counting_dumps)
+
+        process_special_file(source, dest, "extract_keys", ["a"])
+
+        assert dumps_calls == [{"a": 1}]
+
+    def test_unknown_mode_raises(self, tmp_path):
+        """Test unsupported modes are rejected."""
+        with pytest.raises(ValueError, match="Unknown special file mode"):
+            process_special_file(tmp_path / "a", tmp_path / "b", "copy", ["x"])
@@ -1,7 +1,9 @@
 """Tests for state module."""
 
 import json
+import os
 
+from sync_agentic_tools import state as state_module
 from sync_agentic_tools.files import FileMetadata
 from sync_agentic_tools.state import DeletionRecord, FileState, StateManager, SyncState
 
@@ -123,6 +125,102 @@ class TestSyncState:
         assert state.files["test/file.txt"].checksum == "sha256:abc123"
         assert state.files["test/file.txt"].last_synced == "2025-01-01T12:00:00"
 
+    def test_last_synced_ns_derived_for_old_files(self):
+        """Test states without last_synced_ns get it from last_synced."""
+        state = SyncState.from_dict(
+            {
+                "machine_id": "test-12345678",
+                "hostname": "test",
+                "last_sync": "2025-01-01T12:00:00",
+                "files": {
+                    "a": {"checksum": "sha256:a", "last_synced": "2025-01-01T12:00:00.000001+00:00"},
+                    "b": {"checksum": "sha256:b", "last_synced": "2025-01-01T12:00:00", "last_synced_ns": 42},
+                },
+            }
+        )
+
+        assert state.files["a"].last_synced_ns == 1_735_732_800_000_001_000
+        assert state.files["b"].last_synced_ns == 42
+
+    def test_from_dict_shares_repeated_strings(self):
+        """Test equal timestamps and decisions are loaded as a single shared object."""
+        data = json.loads(
+            json.dumps(
+                {
+                    "machine_id": "test-12345678",
+                    "hostname": "test",
+                    "last_sync": "2025-01-01T12:00:00",
+                    "files": {
+                        "a": {"checksum": "sha256:a", "last_synced": "2025-01-01T12:00:00"},
+                        "b": {"checksum": "sha256:b", "last_synced": "2025-01-01T12:00:00"},
+                    },
+                    "deletions": {
+                        "c": {"deleted_at": "2025-01-01T12:00:00", "checksum": "x", "decision": "confirmed"},
+                        "d": {"deleted_at": "2025-01-02T12:00:00", "checksum": "y", "decision": "confirmed"},
+                    },
+                }
+            )
+        )
+
+        state = SyncState.from_dict(data)
+
+        assert state.files["a"].last_synced is state.files["b"].last_synced
+        assert state.deletions["c"].deleted_at is state.files["a"].last_synced
+        assert state.deletions["c"].decision is state.deletions["d"].decision
+
+    def test_sync_stats_round_trip_and_match(self, tmp_path):
+        """Test recorded post-sync stats are saved, restored and matched against current stats."""
+        import os
+
+        source = tmp_path / "source.txt"
+        target = tmp_path / "target.txt"
+        source.write_text("content")
+        target.write_text("content")
+        os.utime(source, ns=(0, 1_000_000_000))
+        os.utime(target, ns=(0, 1_000_000_000))
+        state = SyncState(machine_id="test-12345678", hostname="test", last_sync="2025-01-01T12:00:00")
+        state.update_file(
+            FileMetadata.from_file(source, tmp_path), "tool", source_stat=source.stat(), target_stat=target.stat()
+        )
+
+        restored = SyncState.from_dict(json.loads(json.dumps(state.to_dict())))
+        file_state = restored.files["tool/source.txt"]
+
+        assert file_state == state.files["tool/source.txt"]
+        assert file_state.matches_stats(source.stat(), target.stat())
+        os.utime(target, ns=(1, 1))
+        assert not file_state.matches_stats(source.stat(), target.stat())
+        assert not FileState(checksum="x", last_synced="2025-01-01T12:00:00").matches_stats(
+            source.stat(), target.stat()
+        )
+
+    def test_recent_sync_stats_not_recorded(self, tmp_path):
+        """Test stats of files modified just now aren't trusted to detect later edits."""
+        source = tmp_path / "source.txt"
+        target = tmp_path / "target.txt"
+        source.write_text("content")
+        os.utime(source, ns=(0, 1_000_000_000))
+        target.write_text("content")
+        state = SyncState(machine_id="test-12345678", hostname="test", last_sync="2025-01-01T12:00:00")
+        state.update_file(
+            FileMetadata.from_file(source, tmp_path), "tool", source_stat=source.stat(), target_stat=target.stat()
+        )
+
+        assert not state.files["tool/source.txt"].matches_stats(source.stat(), target.stat())
+
+    def test_last_synced_ns_round_trips(self):
+        """Test last_synced_ns is saved and restored."""
+        state = SyncState(
+            machine_id="test-12345678",
+            hostname="test",
+            last_sync="2025-01-01T12:00:00",
+            files={"a": FileState(checksum="sha256:a", last_synced="2025-01-01T12:00:00", last_synced_ns=7)},
+        )
+
+        restored = SyncState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        assert restored.files["a"].last_synced_ns == 7
+
     def test_update_file(self, tmp_path):
         """Test updating file state."""
         state = SyncState(
@@ -141,6 +239,26 @@ class TestSyncState:
         assert "test_tool/test.txt" in state.files
         file_state = state.files["test_tool/test.txt"]
         assert file_state.checksum == metadata.checksum
+        assert FileState(checksum="", last_synced=file_state.last_synced).last_synced_ns == file_state.last_synced_ns
+
+    def test_update_file_with_shared_time(self, tmp_path):
+        """Test a batch of updates given one sync time records it for every file."""
+        from datetime import datetime
+
+        state = SyncState(
+            machine_id="test-12345678",
+            hostname="test",
+            last_sync="2025-01-01T12:00:00",
+        )
+        now = datetime(2025, 6, 1, 9, 30, 15, 123456)
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text(name)
+            state.update_file(FileMetadata.from_file(tmp_path / name, tmp_path), "tool", now)
+        state.record_deletion("tool/c.txt", "sha256:c", now=now)
+
+        assert {fs.last_synced for fs in state.files.values()} == {"2025-06-01T09:30:15.123456"}
+        assert state.files["tool/a.txt"].last_synced_ns == state_module._datetime_to_ns(now)
+        assert state.deletions["tool/c.txt"].deleted_at == "2025-06-01T09:30:15.123456"
 
     def test_record_deletion(self):
         """Test recording file deletion."""
@@ -253,6 +371,48 @@ class TestStateManager:
         assert "test/file.txt" in loaded_state.files
         assert loaded_state.files["test/file.txt"].checksum == "sha256:abc123"
 
+    def test_saved_state_readable_without_orjson(self, tmp_path, monkeypatch):
+        """Test state written with orjson loads with the stdlib fallback, as on other machines."""
+        from sync_agentic_tools import utils
+
+        manager = StateManager(tmp_path)
+        state = manager.load_state()
+        state.files["test/caf\u00e9.txt"] = FileState(
+            checksum="sha256:abc123",
+            last_synced="2025-01-01T12:00:00",
+        )
+        manager.save_state(state)
+
+        monkeypatch.setattr(utils, "orjson", None)
+
+        assert manager.load_state().to_dict() == state.to_dict()
+        assert json.loads(manager._get_state_file_path().read_text(encoding="utf-8")) == state.to_dict()
+
+    def test_save_skips_unchanged_state(self, tmp_path, monkeypatch):
+        """Test saving state with no file or deletion changes doesn't rewrite the file."""
+        manager = StateManager(tmp_path)
+        state = manager.load_state()
+        manager.save_state(state)
+        writes = []
+        original = state_module.dump_json_file
+        monkeypatch.setattr(
+            state_module, "dump_json_file", lambda *args, **kwargs: (writes.append(args), original(*args, **kwargs))
+        )
+
+        reloaded_manager = StateManager(tmp_path)
+        reloaded = reloaded_manager.load_state()
+        last_sync = reloaded.last_sync
+        reloaded_manager.save_state(reloaded)
+
+        assert writes == []
+        assert reloaded.last_sync == last_sync
+
+        reloaded.record_deletion("tool/a.txt", "sha256:a")
+        reloaded_manager.save_state(reloaded)
+
+        assert len(writes) == 1
+        assert "tool/a.txt" in reloaded_manager.load_state().deletions
+
     def test_save_creates_directory(self, tmp_path):
         """Test that save creates state directory."""
         manager = StateManager(tmp_path)
@@ -318,6 +478,36 @@ class TestStateManager:
         assert "machine1-12345678" in all_states
         assert "machine2-87654321" in all_states
 
+    def test_load_all_states_skips_invalid_files(self, tmp_path):
+        """Test unparseable or incomplete state files are skipped."""
+        state_dir = tmp_path / ".sync-state"
+        state_dir.mkdir()
+        (state_dir / "corrupt.json").write_text("{not json")
+        (state_dir / "partial.json").write_text('{"hostname": "partial"}')
+        manager = StateManager(tmp_path)
+        manager.save_state(manager.load_state())
+
+        all_states = manager.load_all_states()
+
+        assert list(all_states) == [manager.machine_id]
+
+    def test_load_all_states_many_files(self, tmp_path):
+        """Test many state files load together and are all cached."""
+        state_dir = tmp_path / ".sync-state"
+        state_dir.mkdir()
+        for i in range(10):
+            (state_dir / f"m{i}.json").write_text(
+                json.dumps({"machine_id": f"m{i}-1234", "hostname": f"m{i}", "last_sync": "2025-01-01T12:00:00"})
+            )
+        (state_dir / "bad.json").write_text("{not json")
+        for path in state_dir.iterdir():
+            os.utime(path, ns=(0, 1_000_000_000))
+
+        states = StateManager(tmp_path).load_all_states()
+
+        assert set(states) == {f"m{i}-1234" for i in range(10)}
+        assert all(state_module._STATE_CACHE[state_dir / f"m{i}.json"][2] is states[f"m{i}-1234"] for i in range(10))
+
     def test_get_most_recent_state_for_file(self, tmp_path):
         """Test getting most recent state for a file."""
         state_dir = tmp_path / ".sync-state"
@@ -395,3 +585,136 @@ class TestStateManager:
 
         assert most_recent is not None
         assert most_recent.checksum == "sha256:other"
+
+    def test_load_all_states_reuses_unchanged_files(self, tmp_path, monkeypatch):
+        """Test unchanged state files aren't parsed again, and changed ones are."""
+        manager = StateManager(tmp_path)
+        state = manager.load_state()
+        manager.save_state(state)
+        os.utime(manager._get_state_file_path(), ns=(0, 1_000_000_000))
+        loads = []
+        original = state_module.load_json_file
+
+        def counting_load(path):
+            loads.append(path)
+            return original(path)
+
+        monkeypatch.setattr(state_module, "load_json_file", counting_load)
+
+        first = manager.load_all_states()
+        second = manager.load_all_states()
+
+        assert len(loads) == 1
+        assert second[manager.machine_id] is first[manager.machine_id]
+
+        state.files["test/file.txt"] = FileState(checksum="sha256:new", last_synced="2025-01-01T15:00:00")
+        manager.save_state(state)
+        os.utime(manager._get_state_file_path(), ns=(0, 2_000_000_000))
+
+        third = manager.load_all_states()
+
+        assert len(loads) == 2
+        assert third[manager.machine_id].files["test/file.txt"].checksum == "sha256:new"
+
+    def test_recently_written_state_not_cached(self, tmp_path):
+        """Test a same-size rewrite within timestamp granularity isn't served from the cache."""
+        manager = StateManager(tmp_path)
+        state = manager.load_state()
+        state.files["test/file.txt"] = FileState(checksum="sha256:aaa", last_synced="2025-01-01T15:00:00")
+        manager.save_state(state)
+        manager.load_all_states()
+        stat = manager._get_state_file_path().stat()
+
+        state.files["test/file.txt"].checksum = "sha256:bbb"
+        manager.save_state(state)
+        os.utime(manager._get_state_file_path(), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert manager._get_state_file_path().stat().st_size == stat.st_size
+        loaded = manager.load_all_states()[manager.machine_id]
+        assert loaded.files["test/file.txt"].checksum == "sha256:bbb"
+
+    def test_get_most_recent_state_reads_only_requested_entry(self, tmp_path, monkeypatch):
+        """Test an uncached single lookup doesn't build full states, but uses cached ones."""
+        manager = StateManager(tmp_path)
+        state = manager.load_state()
+        state.files["test/file.txt"] = FileState(checksum="sha256:current", last_synced="2025-01-01T15:00:00")
+        manager.save_state(state)
+        (manager.state_dir / "broken.json").write_text("{not json")
+
+        def fail_from_dict(data):
+            raise AssertionError("full state built")
+
+        monkeypatch.setattr(SyncState, "from_dict", fail_from_dict)
+
+        most_recent = manager.get_most_recent_state_for_file("test/file.txt")
+
+        assert most_recent.checksum == "sha256:current"
+        assert manager.get_most_recent_state_for_file("missing") is None
+
+        monkeypatch.undo()
+        (manager.state_dir / "broken.json").unlink()
+        os.utime(manager._get_state_file_path(), ns=(0, 1_000_000_000))
+        cached = manager.load_all_states()[manager.machine_id]
+        monkeypatch.setattr(state_module, "load_json_file", fail_from_dict)
+
+        assert manager.get_most_recent_state_for_file("test/file.txt") is cached.files["test/file.txt"]
+
+    def test_get_most_recent_state_with_preloaded_states(self, tmp_path):
+        """Test lookups can reuse states that were already loaded."""
+        manager = StateManager(tmp_path)
+        other = SyncState(
+            machine_id="other-machine-87654321",
+            hostname="other-machine",
+            last_sync="2025-01-01T14:00:00",
+            files={"test/file.txt": FileState(checksum="sha256:other", last_synced="2025-01-01T14:00:00")},
+        )
+
+        most_recent = manager.get_most_recent_state_for_file(
+            "test/file.txt", all_states={other.machine_id: other}
+        )
+
+        assert most_recent is other.files["test/file.txt"]
+
+    def test_get_most_recent_states_batch(self, tmp_path):
+        """Test a batch lookup picks the newest state per file across machines."""
+        manager = StateManager(tmp_path)
+
+        def make_state(name, files):
+            return SyncState(
+                machine_id=f"{name}-12345678",
+                hostname=name,
+                last_sync="2025-01-01T00:00:00",
+                files={
+                    path: FileState(checksum=f"sha256:{name}", last_synced=synced)
+                    for path, synced in files.items()
+                },
+            )
+
+        states = {
+            state.machine_id: state
+            for state in (
+                make_state("a", {"t/one": "2025-01-01T10:00:00", "t/two": "2025-01-01T12:00:00"}),
+                make_state("b", {"t/one": "2025-01-01T11:00:00", "t/other": "2025-01-01T09:00:00"}),
+            )
+        }
+
+        result = manager.get_most_recent_states(["t/one", "t/two", "t/missing"], all_states=states)
+
+        assert {path: fs.checksum for path, fs in result.items()} == {
+            "t/one": "sha256:b",
+            "t/two": "sha256:a",
+        }
+
+    def test_to_dict_matches_asdict(self):
+        """Test the explicit serialisation covers every field."""
+        from dataclasses import asdict
+
+        state = SyncState(
+            machine_id="test-12345678",
+            hostname="test",
+            last_sync="2025-01-01T12:00:00",
+            files={"a": FileState(checksum="sha256:a", last_synced="2025-01-01T12:00:00")},
+            deletions={"b": DeletionRecord(deleted_at="2025-01-01T11:00:00", checksum="sha256:b", decision="pending")},
+        )
+
+        assert state.to_dict() == asdict(state)
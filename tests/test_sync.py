@@ -1,8 +1,12 @@
 """Tests for sync module."""
 
+from datetime import datetime
+
+import pytest
+
 from sync_agentic_tools.backup import BackupManager
 from sync_agentic_tools.config import Config, Settings, ToolConfig
-from sync_agentic_tools.sync import SyncDirection, SyncEngine
+from sync_agentic_tools.sync import SyncDirection, SyncEngine, _format_mtime, _relpath
 
 
 class TestSyncDirection:
@@ -15,6 +19,32 @@ class TestSyncDirection:
         assert SyncDirection.SYNC.value == "sync"
 
 
+class TestFormatMtime:
+    """Test modification time display."""
+
+    def test_formats_local_time_to_seconds(self):
+        """Test mtimes are shown as local date and time without fractions."""
+        mtime = datetime(2025, 3, 4, 5, 6, 7, 890000).timestamp()
+
+        assert _format_mtime(mtime) == "modified 2025-03-04 05:06:07"
+
+
+class TestRelpath:
+    """Test relative paths of planned files."""
+
+    def test_matches_relative_to(self, tmp_path):
+        """Test stripping the root prefix agrees with Path.relative_to."""
+        for root in (tmp_path, tmp_path / "sub"):
+            path = root / "a" / "b.md"
+            assert _relpath(path, root) == str(path.relative_to(root))
+
+    def test_sibling_with_shared_prefix_not_stripped(self, tmp_path):
+        """Test a root that is only a string prefix of the path's directory isn't stripped."""
+        path = tmp_path / "rootx" / "f.md"
+
+        assert _relpath(path, tmp_path / "root") == str(path)
+
+
 class TestSyncEngine:
     """Test SyncEngine class."""
 
@@ -319,3 +349,253 @@ class TestSyncEngine:
         assert result is True
         assert (target / "keep.txt").exists()
         assert not (target / "ignore.log").exists()
+
+    def test_plan_push_reuses_stats(self, tmp_path):
+        """Test a newer target is suggested for reverse sync, with each file statted once."""
+        import os
+
+        from sync_agentic_tools.state import SyncState
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "test.txt").write_text("old content")
+        (target / "test.txt").write_text("new content")
+        os.utime(source / "test.txt", (1000, 1000))
+        os.utime(target / "test.txt", (2000, 2000))
+
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["*.txt"])
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+
+        plan = engine._create_sync_plan(
+            tool, SyncDirection.PUSH, SyncState(machine_id="m", hostname="m", last_sync="2025-01-01T12:00:00")
+        )
+
+        assert plan.reverse_suggestions == [(source / "test.txt", target / "test.txt")]
+        cached = plan.stat_cache[target / "test.txt"]
+        assert cached.st_mtime == 2000
+        assert plan.stat(target / "test.txt") is cached
+
+    def test_plan_skips_comparing_files_unchanged_since_sync(self, tmp_path, monkeypatch):
+        """Test files untouched since the last sync aren't read, and touched ones are."""
+        import os
+
+        from sync_agentic_tools.state import StateManager
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "test.txt").write_text("content")
+        os.utime(source / "test.txt", ns=(0, 1_000_000_000))
+
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["*.txt"])
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+        engine.backup_manager = BackupManager(backup_root=tmp_path / "backups")
+        assert engine.sync_tool("test_tool", SyncDirection.PUSH)
+
+        compared = []
+        monkeypatch.setattr(
+            engine,
+            "_files_are_identical_with_special_handling",
+            lambda tool, source_path, target_path: compared.append(source_path) or False,
+        )
+        state = StateManager(tmp_path).load_state()
+
+        plan = engine._create_sync_plan(tool, SyncDirection.PUSH, state)
+
+        assert compared == []
+        assert plan.files_to_copy == []
+
+        (source / "test.txt").write_text("changed")
+        os.utime(target / "test.txt", (1000, 1000))
+
+        plan = engine._create_sync_plan(tool, SyncDirection.PUSH, state)
+
+        assert compared == [source / "test.txt"]
+        assert plan.files_to_copy == [(source / "test.txt", target / "test.txt")]
+
+    def test_plan_compares_target_rewritten_right_after_merge(self, tmp_path, monkeypatch):
+        """Test a same-size edit in the same mtime tick as a merge isn't taken as unchanged."""
+        import os
+
+        from sync_agentic_tools.config import SpecialHandling
+        from sync_agentic_tools.state import StateManager
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "settings.json").write_text('{"model": "opus"}')
+        os.utime(source / "settings.json", ns=(0, 1_000_000_000))
+        (target / "settings.json").write_text('{"model": "haiku"}')
+
+        tool = ToolConfig(
+            name="test_tool",
+            enabled=True,
+            source=source,
+            target=target,
+            include=["*.json"],
+            special_handling={"settings.json": SpecialHandling(mode="extract_keys", include_keys=["model"])},
+        )
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+        engine.backup_manager = BackupManager(backup_root=tmp_path / "backups")
+        assert engine.sync_tool("test_tool", SyncDirection.PUSH)
+
+        # Rewrite the merged target with the same size, keeping its mtime
+        merged = (target / "settings.json").read_text()
+        synced_stat = (target / "settings.json").stat()
+        (target / "settings.json").write_text(merged.replace("opus", "haik"))
+        os.utime(target / "settings.json", ns=(synced_stat.st_atime_ns, synced_stat.st_mtime_ns))
+
+        compared = []
+        monkeypatch.setattr(
+            engine,
+            "_files_are_identical_with_special_handling",
+            lambda tool, source_path, target_path: compared.append(source_path) or False,
+        )
+        engine._create_sync_plan(tool, SyncDirection.PUSH, StateManager(tmp_path).load_state())
+
+        assert compared == [source / "settings.json"]
+
+    def test_special_handling_compares_only_included_keys(self, tmp_path):
+        """Test special-handled files differing only outside included keys count as identical."""
+        from sync_agentic_tools.config import SpecialHandling
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "settings.json").write_text('{"model": "opus", "theme": "dark"}')
+        (target / "settings.json").write_text('{"theme": "light", "model": "opus"}')
+
+        tool = ToolConfig(
+            name="test_tool",
+            enabled=True,
+            source=source,
+            target=target,
+            special_handling={"settings.json": SpecialHandling(mode="extract_keys", include_keys=["model"])},
+        )
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+
+        assert engine._files_are_identical_with_special_handling(
+            tool, source / "settings.json", target / "settings.json"
+        )
+        (target / "settings.json").write_text('{"model": "sonnet"}')
+        assert not engine._files_are_identical_with_special_handling(
+            tool, source / "settings.json", target / "settings.json"
+        )
+
+    def test_plan_is_sorted_and_compares_in_parallel(self, tmp_path):
+        """Test many overlapping files are compared correctly and planned in path order."""
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        for i in range(20):
+            (source / f"f{i:02}.txt").write_text(f"content {i}")
+            (target / f"f{i:02}.txt").write_text(f"content {i}" if i % 3 else "changed")
+        (source / "new.txt").write_text("new")
+
+        from sync_agentic_tools.state import SyncState
+
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["*.txt"])
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+
+        plan = engine._create_sync_plan(
+            tool, SyncDirection.PULL, SyncState(machine_id="m", hostname="m", last_sync="2025-01-01T12:00:00")
+        )
+
+        assert plan.files_to_copy == [
+            (target / f"f{i:02}.txt", source / f"f{i:02}.txt") for i in range(0, 20, 3)
+        ]
+
+    def test_summary_diff_stats_computed_on_demand(self, tmp_path, monkeypatch):
+        """Test modified files are diffed only when their stats are read, and only once."""
+        from sync_agentic_tools import sync as sync_module
+        from sync_agentic_tools.state import SyncState
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "a.txt").write_text("one\ntwo\n")
+        (target / "a.txt").write_text("one\n")
+        diffed = []
+        real_diff = sync_module.generate_unified_diff
+        monkeypatch.setattr(
+            sync_module, "generate_unified_diff", lambda *args: diffed.append(args) or real_diff(*args)
+        )
+
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["*.txt"])
+        engine = SyncEngine(Config(settings=Settings(respect_gitignore=False), tools={"test_tool": tool}))
+        plan = engine._create_sync_plan(
+            tool, SyncDirection.PULL, SyncState(machine_id="m", hostname="m", last_sync="2025-01-01T12:00:00")
+        )
+
+        changes = engine._plan_to_changes(plan)
+        assert diffed == []
+
+        assert changes[0].diff_stats.change_summary == "+0 -1"
+        engine._show_auto_diffs(plan, changes)
+        assert diffed == [(source / "a.txt", target / "a.txt")]
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_copies_recorded_in_plan_order(self, tmp_path, parallel):
+        """Test copies, parallel or not, are all made and recorded in state."""
+        from sync_agentic_tools.state import StateManager
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        (source / "sub").mkdir(parents=True)
+        target.mkdir()
+        names = [f"f{i}.txt" for i in range(5)] + ["sub/g.txt"]
+        for name in names:
+            (source / name).write_text(name)
+
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["**/*.txt"])
+        config = Config(
+            settings=Settings(respect_gitignore=False, parallel_sync=parallel),
+            tools={"test_tool": tool},
+        )
+        engine = SyncEngine(config)
+        engine.backup_manager = BackupManager(backup_root=tmp_path / "backups")
+
+        assert engine.sync_tool("test_tool", SyncDirection.PUSH) is True
+
+        for name in names:
+            assert (target / name).read_text() == name
+        state = StateManager(tmp_path).load_state()
+        assert sorted(state.files) == sorted(f"test_tool/{name}" for name in names)
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_failed_copy_stops_sync(self, tmp_path, monkeypatch, parallel):
+        """Test a failed copy fails the sync without saving state."""
+        from sync_agentic_tools import sync as sync_module
+        from sync_agentic_tools.state import StateManager
+
+        source = tmp_path / "source"
+        target = tmp_path / "target"
+        source.mkdir()
+        target.mkdir()
+        for i in range(4):
+            (source / f"f{i}.txt").write_text("x")
+        real_copy = sync_module.safe_copy_file
+
+        def failing_copy(src, dest, **kwargs):
+            if src.name == "f1.txt":
+                raise OSError("disk full")
+            real_copy(src, dest, **kwargs)
+
+        monkeypatch.setattr(sync_module, "safe_copy_file", failing_copy)
+        tool = ToolConfig(name="test_tool", enabled=True, source=source, target=target, include=["*.txt"])
+        config = Config(
+            settings=Settings(respect_gitignore=False, parallel_sync=parallel),
+            tools={"test_tool": tool},
+        )
+        engine = SyncEngine(config)
+        engine.backup_manager = BackupManager(backup_root=tmp_path / "backups")
+
+        assert engine.sync_tool("test_tool", SyncDirection.PUSH) is False
+        assert StateManager(tmp_path).load_state().files == {}
@@ -1,11 +1,17 @@
 """Tests for utils module."""
 
+import json
 
+import pytest
 
 from sync_agentic_tools.utils import (
+    PatternMatcher,
+    dump_json_file,
     find_files,
+    find_files_with_stats,
     format_size,
     get_machine_id,
+    load_json_file,
     matches_pattern,
     matches_patterns,
 )
@@ -73,6 +79,59 @@ class TestMatchesPatterns:
         assert not matches_patterns("image.png", include, exclude)
 
 
+    def test_recursive_patterns_also_match_whole_path(self):
+        """Test ** patterns also match as a plain glob over the whole path."""
+        assert matches_patterns("a/x/b", ["a**b"], [])
+        assert not matches_patterns("a/x/b", [], ["a**b"])
+        assert matches_patterns("a/b/x.md", ["a/**.md"], [])
+
+
+class TestPatternMatcher:
+    """Test compiled pattern matching."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "path"),
+        [
+            ("*.txt", "test.txt"),
+            ("*.txt", "dir/test.txt"),
+            ("**/*.py", "dir1/dir2/test.py"),
+            ("**/*.py", "test.py"),
+            ("**/dir2/*.py", "dir1/dir2/test.py"),
+            ("src/*.py", "src/main.py"),
+            ("**/.git/**", ".git"),
+            ("sub/**/[!a]*.log", "sub/x/b.log"),
+            ("sub/**/[!a]*.log", "sub/x/a.log"),
+            ("**/*.py", "dir/file.pyc"),
+            ("lib/*.py", "src/main.py"),
+            ("**/[ab]", "dir/c"),
+        ],
+    )
+    def test_matches_like_matches_pattern(self, tmp_path, pattern, path):
+        """Test compiled matching agrees with matches_pattern."""
+        expected = matches_pattern(tmp_path / path, pattern, tmp_path)
+
+        assert PatternMatcher([pattern]).matches(path) == expected
+
+    def test_matches_any_pattern(self):
+        """Test a path matching any one of several patterns matches."""
+        matcher = PatternMatcher(["*.log", "**/build/**", "/abs"])
+
+        assert matcher.matches("debug.log")
+        assert matcher.matches("a/build/out.o")
+        assert not matcher.matches("src/main.py")
+
+    def test_empty_patterns_match_nothing(self):
+        """Test no patterns never match."""
+        assert not PatternMatcher([]).matches("anything")
+
+    def test_star_in_recursive_pattern_stays_in_segment(self):
+        """Test * within a ** pattern doesn't cross directory separators."""
+        matcher = PatternMatcher(["**/a*b"])
+
+        assert matcher.matches("x/aXb")
+        assert not matcher.matches("a/b")
+
+
 class TestFindFiles:
     """Test file finding functionality."""
 
@@ -157,6 +216,55 @@ class TestFindFiles:
         files = find_files(tmp_path, [], [], follow_symlinks=True, respect_gitignore=False)
         assert tmp_path / "real.txt" in files
 
+    def test_symlinked_include_dir_followed_but_not_nested_links(self, tmp_path):
+        """Test "dir/**" searches a symlinked dir, but not symlinked dirs below it."""
+        outside = tmp_path / "outside"
+        (outside / "nested").mkdir(parents=True)
+        (outside / "skill.md").touch()
+        (outside / "nested" / "deep.md").touch()
+        base = tmp_path / "base"
+        base.mkdir()
+        (base / "skills").symlink_to(outside)
+        (base / "agents").mkdir()
+        (base / "agents" / "linked").symlink_to(outside)
+
+        files = find_files(base, ["skills/**", "agents/**"], [], respect_gitignore=False)
+
+        assert files == {base / "skills" / "skill.md", base / "skills" / "nested" / "deep.md"}
+
+    def test_excluded_directories_pruned(self, tmp_path):
+        """Test files below an excluded directory are skipped, at any depth."""
+        (tmp_path / "a" / ".git" / "objects").mkdir(parents=True)
+        (tmp_path / "a" / ".git" / "objects" / "x.md").touch()
+        (tmp_path / "a" / "keep.md").touch()
+
+        files = find_files(tmp_path, ["**/*.md"], ["**/.git"], respect_gitignore=False)
+
+        assert files == {tmp_path / "a" / "keep.md"}
+
+    def test_multi_segment_recursive_pattern(self, tmp_path):
+        """Test recursive patterns with directories after ** still match."""
+        (tmp_path / "x" / "logs" / "old").mkdir(parents=True)
+        (tmp_path / "x" / "logs" / "old" / "a.log").touch()
+        (tmp_path / "logs").touch()
+
+        files = find_files(tmp_path, ["**/logs/**"], [], respect_gitignore=False)
+
+        assert files == {tmp_path / "x" / "logs" / "old" / "a.log"}
+
+    def test_find_files_with_stats(self, tmp_path):
+        """Test each found file comes with its stat result."""
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "dir" / "a.md").write_text("abc")
+        (tmp_path / "CLAUDE.md").write_text("hello")
+
+        stats = find_files_with_stats(tmp_path, ["CLAUDE.md", "dir/**"], [], respect_gitignore=False)
+
+        assert {path: st.st_size for path, st in stats.items()} == {
+            tmp_path / "CLAUDE.md": 5,
+            tmp_path / "dir" / "a.md": 3,
+        }
+
 
 class TestFormatSize:
     """Test file size formatting."""
@@ -203,3 +311,47 @@ class TestGetMachineId:
         id1 = get_machine_id()
         id2 = get_machine_id()
         assert id1 == id2
+
+
+class TestJsonFileHelpers:
+    """Test JSON file read/write helpers."""
+
+    def test_round_trip(self, tmp_path):
+        """Test data survives a dump/load round trip."""
+        json_file = tmp_path / "data.json"
+        data = {"name": "test", "direction": "source→target", "items": [1, 2, 3]}
+
+        dump_json_file(json_file, data)
+
+        assert load_json_file(json_file) == data
+
+    def test_output_is_indented(self, tmp_path):
+        """Test written JSON is human-readable."""
+        json_file = tmp_path / "data.json"
+
+        dump_json_file(json_file, {"a": {"b": 1}})
+
+        assert '\n  "a"' in json_file.read_text()
+
+    def test_overwrite_truncates_and_fsyncs(self, tmp_path, monkeypatch):
+        """Test rewriting a file replaces longer old content and fsyncs on request."""
+        import os
+
+        json_file = tmp_path / "data.json"
+        dump_json_file(json_file, {"items": list(range(100))})
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd)))
+
+        dump_json_file(json_file, {"a": 1}, fsync=True)
+
+        assert load_json_file(json_file) == {"a": 1}
+        assert len(synced) == 1
+
+    def test_invalid_json_raises(self, tmp_path):
+        """Test invalid JSON raises a JSONDecodeError."""
+        json_file = tmp_path / "bad.json"
+        json_file.write_text("{not json")
+
+        with pytest.raises(json.JSONDecodeError):
+            load_json_file(json_file)